@@ -0,0 +1,70 @@
+"""
+Compare the memory used by a cached resources listing as dictionaries and as
+`transifex.models` objects, and the speed of attribute access.
+
+    python benchmarks/bench_models.py
+"""
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from transifex.models import parse_resources
+
+
+CONTENT = json.dumps([
+    {'slug': 'resource-%d' % i, 'name': 'Resource %d' % i,
+     'i18n_type': 'PO', 'source_language_code': 'en', 'categories': None,
+     'priority': '1'}
+    for i in range(5000)
+])
+
+
+def deep_size(value, seen=None):
+    """
+    Approximate the memory used by an object and the objects it refers to
+    """
+    if seen is None:
+        seen = set()
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(
+            deep_size(k, seen) + deep_size(v, seen) for k, v in value.items()
+        )
+    elif isinstance(value, (list, tuple)):
+        size += sum(deep_size(item, seen) for item in value)
+    elif hasattr(value, '__slots__'):
+        size += sum(
+            deep_size(getattr(value, name), seen) for name in value.__slots__
+        )
+    return size
+
+
+def main():
+    dicts = json.loads(CONTENT)
+    models = parse_resources(CONTENT)
+    dict_size = deep_size(dicts)
+    model_size = deep_size(models)
+    print('%d resources' % len(dicts))
+    print('dicts   %8d bytes  %5d per resource' % (
+        dict_size, dict_size / len(dicts)))
+    print('models  %8d bytes  %5d per resource  %.1fx smaller' % (
+        model_size, model_size / len(models), float(dict_size) / model_size))
+
+    resource_dict = dicts[0]
+    resource_model = models[0]
+    dict_access = min(timeit.repeat(
+        lambda: resource_dict['source_language_code'], number=1000000))
+    model_access = min(timeit.repeat(
+        lambda: resource_model.source_language_code, number=1000000))
+    print('dict access   %.3fs per million' % dict_access)
+    print('model access  %.3fs per million' % model_access)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Measure the cost of progress reporting on the download copy loop of
+`get_translation`.
+
+    python benchmarks/bench_progress.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from transifex.api import DOWNLOAD_CHUNK_SIZE
+from transifex.progress import ProgressTracker, iter_progress
+
+
+CHUNKS = [b'x' * DOWNLOAD_CHUNK_SIZE] * 4096
+
+
+class NullFile(object):
+
+    def write(self, data):
+        pass
+
+
+def run_plain():
+    handle = NullFile()
+    for chunk in iter(CHUNKS):
+        handle.write(chunk)
+
+
+def run_progress():
+    handle = NullFile()
+    tracker = ProgressTracker(callback=lambda tracker: None)
+    progress = tracker.transfer('abc/def/pt', DOWNLOAD_CHUNK_SIZE * 4096)
+    for chunk in iter_progress(iter(CHUNKS), progress):
+        handle.write(chunk)
+
+
+def main():
+    results = []
+    for name in ('run_plain', 'run_progress'):
+        seconds = min(timeit.repeat(
+            '%s()' % name, setup='from __main__ import %s' % name,
+            repeat=5, number=10
+        ))
+        results.append((name, seconds))
+
+    print('%d MB copied %d times' % (
+        len(CHUNKS) * DOWNLOAD_CHUNK_SIZE // (1024 * 1024), 10
+    ))
+    for name, seconds in results:
+        print('%-14s %8.4fs  %8.2fus per chunk' % (
+            name, seconds, seconds * 1e6 / (len(CHUNKS) * 10)
+        ))
+
+
+if __name__ == '__main__':
+    main()
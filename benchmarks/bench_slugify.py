@@ -0,0 +1,61 @@
+"""
+Compare the speed of `transifex.util.slugify` and `slugify_many` against the
+original uncached implementation.
+
+    python benchmarks/bench_slugify.py
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from transifex.util import force_unicode, slugify, slugify_many
+
+
+def reference_slugify(value):
+    import unicodedata
+    value = force_unicode(value)
+    value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore')
+    value = unicode(re.sub('[^\w\s-]', '', value).strip().lower())
+    return re.sub('[-\s]+', '-', value)
+
+
+# a bulk import sees the same few filenames in many directories
+FILENAMES = [
+    'module %d/django.po' % (i % 500) for i in range(20000)
+] + [u'm\xf3dulo %d.po' % (i % 100) for i in range(5000)]
+
+
+def run_reference():
+    for filename in FILENAMES:
+        reference_slugify(filename) == filename
+
+
+def run_slugify():
+    for filename in FILENAMES:
+        slugify(filename) == filename
+
+
+def run_slugify_many():
+    slugify_many(FILENAMES)
+
+
+def main():
+    results = []
+    for name in ('run_reference', 'run_slugify', 'run_slugify_many'):
+        seconds = min(timeit.repeat(
+            '%s()' % name, setup='from __main__ import %s' % name,
+            repeat=3, number=1
+        ))
+        results.append((name, seconds))
+
+    reference = results[0][1]
+    print('%d values' % len(FILENAMES))
+    for name, seconds in results:
+        print('%-18s %8.4fs  %6.1fx' % (name, seconds, reference / seconds))
+
+
+if __name__ == '__main__':
+    main()
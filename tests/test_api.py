@@ -1,5 +1,6 @@
 from unittest import TestCase
-from transifex.api import TransifexAPI
+from transifex.api import TransifexAPI, RESOURCE_CREATED, RESOURCE_UPDATED, \
+    RESOURCE_SKIPPED, RESOURCE_FAILED
 from mock import patch, Mock, MagicMock
 import json
 from transifex.exceptions import InvalidSlugException, TransifexAPIException
@@ -412,7 +413,7 @@ class TransifexAPITest(TestCase):
         def side_effect(*args, **kwargs):
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.iter_content = lambda: 'abc\ndef\n'
+            mock_response.iter_content = lambda chunk_size: 'abc\ndef\n'
             return mock_response
 
         mock_requests.side_effect = side_effect
@@ -438,7 +439,7 @@ class TransifexAPITest(TestCase):
         def requests_side_effect(*args, **kwargs):
             mock_response = Mock()
             mock_response.status_code = 200
-            mock_response.iter_content = lambda: 'abc\ndef\n'
+            mock_response.iter_content = lambda chunk_size: 'abc\ndef\n'
             return mock_response
 
         mock_requests.side_effect = requests_side_effect
@@ -469,6 +470,82 @@ class TransifexAPITest(TestCase):
         
         
         
+    @patch('__builtin__.open', create=True)
+    @patch('requests.put')
+    @patch('requests.post')
+    @patch('requests.get')
+    def test_ensure_resources(self, mock_get, mock_post, mock_put, mock_open):
+        """
+        Test the `ensure_resources` api call lists the resources once, creates
+        the missing ones and updates the existing ones
+        """
+        mock_open.return_value = MagicMock(spec=file)
+        mock_open.return_value.read = lambda: 'aaaaaa\nggggg'
+
+        def get_side_effect(*args, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            response.content = json.dumps([{'slug': 'existingpo'}])
+            return response
+
+        def post_side_effect(*args, **kwargs):
+            response = Mock()
+            data = json.loads(kwargs['data'])
+            response.status_code = 400 if data['slug'] == 'brokenpo' else 201
+            return response
+
+        def put_side_effect(*args, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            response.content = json.dumps({'strings_added': 1})
+            return response
+
+        mock_get.side_effect = get_side_effect
+        mock_post.side_effect = post_side_effect
+        mock_put.side_effect = put_side_effect
+
+        reports = self.api.ensure_resources('abc', [
+            '/abc/new.po', '/abc/existing.po', '/abc/broken.po'
+        ])
+        self.assertEqual(mock_get.call_count, 1)
+        self.assertEqual(mock_post.call_count, 2)
+        self.assertEqual(mock_put.call_count, 1)
+        self.assertEqual(
+            [(r.slug, r.path, r.action) for r in reports],
+            [('newpo', '/abc/new.po', RESOURCE_CREATED),
+             ('existingpo', '/abc/existing.po', RESOURCE_UPDATED),
+             ('brokenpo', '/abc/broken.po', RESOURCE_FAILED)]
+        )
+        self.assertEqual(reports[1].result, {'strings_added': 1})
+        self.assertTrue(isinstance(reports[2].result, TransifexAPIException))
+
+    @patch('requests.put')
+    @patch('requests.post')
+    @patch('requests.get')
+    def test_ensure_resources_without_update(self, mock_get, mock_post,
+                                             mock_put):
+        """
+        Test the `ensure_resources` api call skips existing resources when
+        not updating, and reports invalid slugs without making requests
+        """
+        def side_effect(*args, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            response.content = json.dumps([{'slug': 'abc'}])
+            return response
+
+        mock_get.side_effect = side_effect
+        reports = self.api.ensure_resources(
+            'abc', {'abc': '/abc/abc.po', '%@$': '/abc/bad.po'}, update=False
+        )
+        self.assertEqual(
+            [(r.slug, r.action) for r in reports],
+            [('%@$', RESOURCE_FAILED), ('abc', RESOURCE_SKIPPED)]
+        )
+        self.assertTrue(isinstance(reports[0].result, InvalidSlugException))
+        self.assertFalse(mock_post.called)
+        self.assertFalse(mock_put.called)
+
     @patch('requests.delete')
     def test_delete_resource(self, mock_requests):
         """
@@ -0,0 +1,243 @@
+from unittest import TestCase
+from mock import patch
+import os
+import random
+import shutil
+import tempfile
+import tarfile
+import threading
+import zipfile
+from io import BytesIO
+from transifex.api import TransifexAPI
+from transifex.archive import open_archive
+from transifex.exceptions import TransifexAPIException
+from transifex.fake import FakeTransifex
+from transifex.transports import InProcessTransport, Response, Transport
+
+
+class ArchiveWriterTest(TestCase):
+
+    def test_zip(self):
+        """
+        Test files are written into a zip archive
+        """
+        output = BytesIO()
+        writer = open_archive(output, 'zip')
+        writer.add('a/it.po', ['abc', 'def'])
+        writer.add('a/pt.po', iter(['ghi']), size=3)
+        writer.close()
+        archive = zipfile.ZipFile(BytesIO(output.getvalue()))
+        self.assertEqual(archive.namelist(), ['a/it.po', 'a/pt.po'])
+        self.assertEqual(archive.testzip(), None)
+        self.assertEqual(archive.read('a/it.po'), 'abcdef')
+        self.assertEqual(archive.getinfo('a/it.po').file_size, 6)
+
+    def test_zip_streams_each_file(self):
+        """
+        Test each chunk of a file is written into the zip archive before the
+        next one is read
+        """
+        # random data, so that the compressor has output for each chunk
+        generator = random.Random(0)
+        data = [
+            ''.join(chr(generator.randint(0, 255)) for j in range(65536))
+            for i in range(3)
+        ]
+        output = BytesIO()
+        writer = open_archive(output, 'zip')
+        written = []
+
+        def chunks():
+            for chunk in data:
+                written.append(len(output.getvalue()))
+                yield chunk
+
+        writer.add('a/it.po', chunks())
+        writer.close()
+        self.assertTrue(written[0] < written[1] < written[2])
+        archive = zipfile.ZipFile(BytesIO(output.getvalue()))
+        self.assertEqual(archive.read('a/it.po'), ''.join(data))
+
+    def test_zip_without_seeking(self):
+        """
+        Test zip archives are written to file like objects which can't seek
+        """
+        class Output(object):
+            def __init__(self):
+                self.data = []
+
+            def write(self, data):
+                self.data.append(data)
+
+            def flush(self):
+                pass
+
+        output = Output()
+        writer = open_archive(output, 'zip')
+        writer.add(u'a/it\xe0.po', ['abc'])
+        writer.close()
+        archive = zipfile.ZipFile(BytesIO(''.join(output.data)))
+        self.assertEqual(archive.testzip(), None)
+        self.assertEqual(archive.read(u'a/it\xe0.po'), 'abc')
+
+    @patch('zipfile.ZIP64_LIMIT', 150)
+    def test_zip_too_big(self):
+        """
+        Test a file too big for a zip archive is rejected before the data
+        which doesn't fit is written, leaving the archive readable
+        """
+        output = BytesIO()
+        writer = open_archive(output, 'zip')
+        writer.add('a/it.po', ['abc'])
+        generator = random.Random(0)
+        chunks = [
+            ''.join(chr(generator.randint(0, 255)) for j in range(100))
+            for i in range(3)
+        ]
+        self.assertRaises(
+            zipfile.LargeZipFile, writer.add, 'a/pt.po', chunks
+        )
+        self.assertTrue(len(output.getvalue()) <= 150)
+        writer.close()
+        archive = zipfile.ZipFile(BytesIO(output.getvalue()))
+        self.assertEqual(archive.namelist(), ['a/it.po'])
+        self.assertEqual(archive.read('a/it.po'), 'abc')
+
+    def test_tar(self):
+        """
+        Test files of known and unknown size are streamed into a compressed
+        tar archive
+        """
+        output = BytesIO()
+        writer = open_archive(output, 'tar.gz')
+        writer.add('a/it.po', ['abc', 'def'])
+        writer.add('a/pt.po', iter(['gh', 'i']), size=3)
+        writer.close()
+        archive = tarfile.open(fileobj=BytesIO(output.getvalue()))
+        self.assertEqual(archive.getnames(), ['a/it.po', 'a/pt.po'])
+        self.assertEqual(archive.extractfile('a/pt.po').read(), 'ghi')
+
+    def test_unknown_format(self):
+        """
+        Test unknown archive formats are rejected
+        """
+        self.assertRaises(ValueError, open_archive, BytesIO(), 'rar')
+
+
+class _BarrierBody(object):
+    """
+    Response body whose first read waits until the bodies of every
+    download are being read, or a second has passed
+    """
+    def __init__(self, barrier, content):
+        self.barrier = barrier
+        self.content = content
+
+    def read(self, size=-1):
+        content, self.content = self.content, ''
+        if content:
+            self.barrier.wait()
+        return content
+
+
+class _Barrier(object):
+
+    def __init__(self, parties):
+        self.parties = parties
+        self.waiting = 0
+        self.timed_out = False
+        self.condition = threading.Condition()
+
+    def wait(self):
+        with self.condition:
+            self.waiting += 1
+            self.condition.notify_all()
+            if self.waiting < self.parties:
+                self.condition.wait(1)
+                if self.waiting < self.parties:
+                    self.timed_out = True
+
+
+class _BarrierTransport(Transport):
+
+    def __init__(self, barrier):
+        self.barrier = barrier
+
+    def request(self, method, url, **kwargs):
+        language = url.rstrip('/').split('/')[-1]
+        return Response(200, raw=_BarrierBody(self.barrier, language))
+
+
+class ExportTranslationsTest(TestCase):
+
+    def setUp(self):
+        self.server = FakeTransifex()
+        self.server.add_project('abc')
+        self.server.add_resource('abc', 'def', content='source', translations={
+            'it': 'italian', 'pt': 'portuguese', 'de': 'german'
+        })
+        self.api = TransifexAPI(
+            'aaa', 'aaa', 'http://www.mydomain.com',
+            transport=InProcessTransport(self.server)
+        )
+
+    def test_export_all_languages(self):
+        """
+        Test the `export_translations` api call writes every language into
+        the archive
+        """
+        output = BytesIO()
+        languages = self.api.export_translations(
+            'abc', 'def', output, workers=2
+        )
+        self.assertEqual(sorted(languages), ['de', 'en', 'it', 'pt'])
+        archive = zipfile.ZipFile(BytesIO(output.getvalue()))
+        self.assertEqual(
+            sorted(archive.namelist()),
+            ['def/de.po', 'def/en.po', 'def/it.po', 'def/pt.po']
+        )
+        self.assertEqual(archive.read('def/pt.po'), 'portuguese')
+
+    def test_export_missing_language(self):
+        """
+        Test the `export_translations` api call raises when a language can't
+        be downloaded
+        """
+        self.assertRaises(
+            TransifexAPIException, self.api.export_translations, 'abc', 'def',
+            BytesIO(), archive_format='tar', languages=['it', 'fr']
+        )
+
+    def test_export_unknown_format(self):
+        """
+        Test the `export_translations` api call rejects unknown archive
+        formats before creating the archive
+        """
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'def.rar')
+            self.assertRaises(
+                ValueError, self.api.export_translations, 'abc', 'def', path,
+                archive_format='rar'
+            )
+            self.assertFalse(os.path.exists(path))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_downloads_are_concurrent(self):
+        """
+        Test the translations are downloaded at the same time, while only one
+        of them is written to the archive at a time
+        """
+        barrier = _Barrier(3)
+        api = TransifexAPI(
+            'aaa', 'aaa', 'http://www.mydomain.com',
+            transport=_BarrierTransport(barrier)
+        )
+        output = BytesIO()
+        api.export_translations(
+            'abc', 'def', output, languages=['de', 'it', 'pt'], workers=3
+        )
+        self.assertFalse(barrier.timed_out)
+        archive = zipfile.ZipFile(BytesIO(output.getvalue()))
+        self.assertEqual(archive.read('def/it.po'), 'it')
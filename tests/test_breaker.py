@@ -0,0 +1,189 @@
+from unittest import TestCase
+from transifex.api import TransifexAPI
+from transifex.breaker import CircuitBreaker
+from mock import patch, Mock
+import requests
+from transifex.exceptions import CircuitOpenException, \
+    CredentialsUnavailableException
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CircuitBreakerTest(TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            failure_rate=0.5, minimum_calls=4, window_size=4,
+            reset_timeout=10, clock=self.clock
+        )
+
+    def _open_breaker(self):
+        for i in range(4):
+            self.assertTrue(self.breaker.allow_request())
+            self.breaker.record_failure()
+
+    def test_stays_closed_below_minimum_calls(self):
+        """
+        Test the breaker ignores the failure rate until enough calls are made
+        """
+        for i in range(3):
+            self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_stays_closed_below_failure_rate(self):
+        """
+        Test the breaker stays closed when the failure rate is low enough
+        """
+        self.breaker.record_failure()
+        for i in range(3):
+            self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_opens_at_failure_rate(self):
+        """
+        Test the breaker opens and refuses requests at the failure rate
+        """
+        self._open_breaker()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+        self.assertEqual(self.breaker.retry_after, 10)
+
+    def test_half_open_probe_success_closes(self):
+        """
+        Test a successful probe after the reset timeout closes the breaker
+        """
+        self._open_breaker()
+        self.clock.now += 10
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+        # only one probe is allowed at a time
+        self.assertFalse(self.breaker.allow_request())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow_request())
+
+    def test_half_open_probe_failure_reopens(self):
+        """
+        Test a failed probe after the reset timeout re-opens the breaker
+        """
+        self._open_breaker()
+        self.clock.now += 10
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(self.breaker.allow_request())
+
+    def test_cancelled_probe_frees_its_slot(self):
+        """
+        Test a probe which is cancelled lets another probe through
+        """
+        self._open_breaker()
+        self.clock.now += 10
+        self.assertTrue(self.breaker.allow_request())
+        self.breaker.cancel()
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertTrue(self.breaker.allow_request())
+
+
+class TransifexAPICircuitBreakerTest(TestCase):
+
+    def setUp(self):
+        self.breaker = CircuitBreaker(
+            failure_rate=1, minimum_calls=2, window_size=2
+        )
+        self.api = TransifexAPI(
+            'aaa', 'aaa', 'http://www.mydomain.com',
+            circuit_breaker=self.breaker
+        )
+
+    @patch('requests.get')
+    def test_fails_fast_when_open(self, mock_requests):
+        """
+        Test api calls raise `CircuitOpenException` without making a request
+        once the server has failed enough times
+        """
+        def side_effect(*args, **kwargs):
+            response = Mock()
+            response.status_code = 503
+            return response
+
+        mock_requests.side_effect = side_effect
+        self.assertFalse(self.api.ping())
+        self.assertFalse(self.api.ping())
+        self.assertEqual(self.api.circuit_state, CircuitBreaker.OPEN)
+
+        mock_requests.reset_mock()
+        self.assertRaises(
+            CircuitOpenException, self.api.project_exists, project_slug='abc'
+        )
+        self.assertFalse(mock_requests.called)
+
+    @patch('requests.get')
+    def test_connection_errors_count_as_failures(self, mock_requests):
+        """
+        Test network errors are recorded as failures by the breaker
+        """
+        mock_requests.side_effect = requests.exceptions.ConnectionError()
+        for i in range(2):
+            self.assertRaises(
+                requests.exceptions.ConnectionError, self.api.ping
+            )
+        self.assertEqual(self.api.circuit_state, CircuitBreaker.OPEN)
+
+    @patch('requests.get')
+    def test_client_errors_are_not_failures(self, mock_requests):
+        """
+        Test 4xx responses do not open the breaker
+        """
+        def side_effect(*args, **kwargs):
+            response = Mock()
+            response.status_code = 404
+            return response
+
+        mock_requests.side_effect = side_effect
+        for i in range(3):
+            self.assertFalse(self.api.project_exists(project_slug='abc'))
+        self.assertEqual(self.api.circuit_state, CircuitBreaker.CLOSED)
+
+    def test_disabled_breaker(self):
+        """
+        Test the breaker can be disabled
+        """
+        api = TransifexAPI(
+            'aaa', 'aaa', 'http://www.mydomain.com', circuit_breaker=False
+        )
+        self.assertTrue(api.circuit_breaker is None)
+        self.assertEqual(api.circuit_state, CircuitBreaker.CLOSED)
+
+    def test_probe_released_on_other_errors(self):
+        """
+        Test a half-open probe which fails with an error other than a
+        transport error doesn't keep the breaker half-open
+        """
+        clock = FakeClock()
+        breaker = CircuitBreaker(
+            failure_rate=1, minimum_calls=1, window_size=1, reset_timeout=10,
+            clock=clock
+        )
+        api = TransifexAPI(
+            'aaa', 'aaa', 'http://www.mydomain.com', circuit_breaker=breaker
+        )
+        breaker.record_failure()
+        clock.now += 10
+        api._send = Mock(side_effect=CredentialsUnavailableException(5))
+        self.assertRaises(CredentialsUnavailableException, api.ping)
+        self.assertEqual(api.circuit_state, CircuitBreaker.HALF_OPEN)
+
+        response = Mock()
+        response.status_code = 200
+        api._send = Mock(return_value=response)
+        self.assertTrue(api.ping())
+        self.assertEqual(api.circuit_state, CircuitBreaker.CLOSED)
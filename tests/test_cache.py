@@ -0,0 +1,225 @@
+from unittest import TestCase
+import os
+import shutil
+import stat
+import tempfile
+import time
+from mock import patch, Mock
+from transifex.api import TransifexAPI
+from transifex.cache import TranslationCache
+from transifex.exceptions import TransifexAPIException
+
+
+KEY = ('http://www.mydomain.com', 'abc', 'def', 'pt')
+
+
+class TranslationCacheTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = TranslationCache(os.path.join(self.directory, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _read(self, path):
+        handle = open(path, 'rb')
+        try:
+            return handle.read()
+        finally:
+            handle.close()
+
+    def test_store_and_retrieve(self):
+        """
+        Test a stored download can be looked up and placed at a path
+        """
+        self.assertTrue(self.cache.lookup(KEY) is None)
+        self.cache.store(KEY, ['abc\n', 'def\n'], etag='"123"')
+
+        entry = self.cache.lookup(KEY)
+        self.assertEqual(entry.size, 8)
+        self.assertEqual(
+            entry.conditional_headers(), {'If-None-Match': '"123"'}
+        )
+        path = os.path.join(self.directory, 'out.po')
+        self.cache.retrieve(entry, path)
+        self.assertEqual(self._read(path), 'abc\ndef\n')
+
+        # retrieving again replaces the existing file
+        self.cache.retrieve(entry, path)
+        self.assertEqual(self._read(path), 'abc\ndef\n')
+
+    def test_identical_content_stored_once(self):
+        """
+        Test downloads with the same content share one stored file
+        """
+        self.cache.store(KEY, ['abc'])
+        self.cache.store(KEY[:3] + ('it',), ['abc'])
+        objects = []
+        for __, __, filenames in os.walk(self.cache._objects_dir):
+            objects.extend(filenames)
+        self.assertEqual(len(objects), 1)
+
+    def test_copy_by_default(self):
+        """
+        Test files are copied into place unless linking is enabled
+        """
+        entry = self.cache.store(KEY, ['abc'])
+        path = os.path.join(self.directory, 'out.po')
+        self.cache.retrieve(entry, path)
+        self.assertEqual(os.stat(path).st_nlink, 1)
+        self.assertEqual(self._read(path), 'abc')
+
+        # writing to the file doesn't change the cache
+        handle = open(path, 'w')
+        handle.write('def')
+        handle.close()
+        self.assertFalse(self.cache.lookup(KEY) is None)
+        self.cache.retrieve(entry, path)
+        self.assertEqual(self._read(path), 'abc')
+
+    def test_changed_link_is_not_used(self):
+        """
+        Test a cached file which was changed through a link to it is
+        discarded
+        """
+        cache = TranslationCache(self.cache.directory, link=True)
+        entry = cache.store(KEY, ['abc'])
+        path = os.path.join(self.directory, 'out.po')
+        cache.retrieve(entry, path)
+        self.assertEqual(os.stat(path).st_nlink, 2)
+
+        os.chmod(path, stat.S_IRUSR | stat.S_IWUSR)
+        handle = open(path, 'w')
+        handle.write('def')
+        handle.close()
+        self.assertTrue(cache.lookup(KEY) is None)
+        self.assertTrue(cache.lookup(KEY[:3] + ('it',)) is None)
+
+    def test_prune_by_size(self):
+        """
+        Test the least recently used files are evicted beyond `max_size`
+        """
+        self.cache.store(KEY, ['a' * 10])
+        old = self.cache.lookup(KEY)
+        past = time.time() - 100
+        os.utime(self.cache._object_path(old.digest), (past, past))
+        self.cache.store(KEY[:3] + ('it',), ['b' * 10])
+
+        self.cache.max_size = 15
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertTrue(self.cache.lookup(KEY) is None)
+        self.assertFalse(self.cache.lookup(KEY[:3] + ('it',)) is None)
+
+    def test_prune_by_age(self):
+        """
+        Test files unused for longer than `max_age` are evicted
+        """
+        entry = self.cache.store(KEY, ['abc'])
+        past = time.time() - 100
+        os.utime(self.cache._object_path(entry.digest), (past, past))
+        self.cache.max_age = 50
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertTrue(self.cache.lookup(KEY) is None)
+
+    def test_store_keeps_the_stored_file(self):
+        """
+        Test storing content which is already cached doesn't evict it, even
+        if it was last used longer than `max_age` ago or is bigger than
+        `max_size`
+        """
+        entry = self.cache.store(KEY, ['abc'])
+        past = time.time() - 7200
+        os.utime(self.cache._object_path(entry.digest), (past, past))
+        self.cache.max_age = 3600
+        entry = self.cache.store(KEY[:3] + ('fr',), ['abc'])
+        path = os.path.join(self.directory, 'out.po')
+        self.cache.retrieve(entry, path)
+        self.assertEqual(self._read(path), 'abc')
+
+        self.cache.max_size = 1
+        entry = self.cache.store(KEY[:3] + ('it',), ['defg'])
+        self.cache.retrieve(entry, path)
+        self.assertEqual(self._read(path), 'defg')
+
+    def test_is_fresh(self):
+        """
+        Test entries are only fresh within the `ttl`
+        """
+        entry = self.cache.store(KEY, ['abc'])
+        self.assertFalse(self.cache.is_fresh(entry))
+        self.cache.ttl = 60
+        self.assertTrue(self.cache.is_fresh(entry))
+        entry.stored_at -= 120
+        self.assertFalse(self.cache.is_fresh(entry))
+
+
+class TransifexAPICacheTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = TranslationCache(os.path.join(self.directory, 'cache'))
+        self.api = TransifexAPI(
+            'aaa', 'aaa', 'http://www.mydomain.com',
+            translation_cache=self.cache
+        )
+        self.path = os.path.join(self.directory, 'pofile.po')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _get_translation(self):
+        self.api.get_translation(
+            project_slug='abc', resource_slug='def', language_code='pt',
+            path_to_pofile=self.path
+        )
+
+    @patch('requests.get')
+    def test_get_translation_revalidates(self, mock_requests):
+        """
+        Test `get_translation` sends the cached ETag and reuses the cached
+        file when the server says it has not changed
+        """
+        def side_effect(*args, **kwargs):
+            response = Mock()
+            if kwargs['headers'].get('If-None-Match') == '"v1"':
+                response.status_code = 304
+            else:
+                response.status_code = 200
+                response.headers = {'etag': '"v1"'}
+                response.iter_content = lambda chunk_size: ['abc\n', 'def\n']
+            return response
+
+        mock_requests.side_effect = side_effect
+        self._get_translation()
+        os.remove(self.path)
+        self._get_translation()
+        self.assertEqual(mock_requests.call_count, 2)
+        self.assertEqual(open(self.path).read(), 'abc\ndef\n')
+
+    @patch('requests.get')
+    def test_get_translation_fresh_entry(self, mock_requests):
+        """
+        Test `get_translation` makes no request for an entry within the ttl
+        """
+        self.cache.ttl = 60
+        self.cache.store(
+            ('http://www.mydomain.com', 'abc', 'def', 'pt'), ['abc']
+        )
+        self._get_translation()
+        self.assertFalse(mock_requests.called)
+        self.assertEqual(open(self.path).read(), 'abc')
+
+    @patch('requests.get')
+    def test_get_translation_server_error(self, mock_requests):
+        """
+        Test server errors are raised and nothing is cached
+        """
+        response = Mock()
+        response.status_code = 500
+        mock_requests.return_value = response
+        self.assertRaises(TransifexAPIException, self._get_translation)
+        self.assertTrue(
+            self.cache.lookup(('http://www.mydomain.com', 'abc', 'def', 'pt'))
+            is None
+        )
@@ -0,0 +1,169 @@
+from unittest import TestCase
+from transifex.api import TransifexAPI
+from transifex.credentials import Credential, CredentialPool
+from transifex.exceptions import TransifexAPIException, \
+    CredentialsUnavailableException
+from transifex.fake import FakeTransifex
+from transifex.transports import InProcessTransport
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class CredentialPoolTest(TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+
+    def test_rate_budget(self):
+        """
+        Test each credential is limited to its own rate and the pool's
+        throughput is the sum of them
+        """
+        pool = CredentialPool([
+            Credential('a', 'a', rate=2), Credential('b', 'b', rate=2)
+        ], clock=self.clock)
+        used = [pool.acquire(block=False).username for i in range(4)]
+        self.assertEqual(sorted(used), ['a', 'a', 'b', 'b'])
+        for credential in pool:
+            pool.release(credential)
+            pool.release(credential)
+
+        try:
+            pool.acquire(block=False)
+            self.fail('CredentialsUnavailableException not raised')
+        except CredentialsUnavailableException as e:
+            self.assertAlmostEqual(e.retry_after, 0.5)
+
+        self.clock.now += 0.5
+        self.assertEqual(
+            sorted([pool.acquire(block=False).username for i in range(2)]),
+            ['a', 'b']
+        )
+
+    def test_least_loaded(self):
+        """
+        Test the credential with the fewest requests in flight is used
+        """
+        pool = CredentialPool([('a', 'a'), ('b', 'b')], clock=self.clock)
+        first = pool.acquire()
+        second = pool.acquire()
+        self.assertNotEqual(first, second)
+        pool.release(second)
+        self.assertEqual(pool.acquire(), second)
+
+    def test_round_robin(self):
+        """
+        Test credentials are used in turn
+        """
+        pool = CredentialPool(
+            [('a', 'a'), ('b', 'b'), ('c', 'c')], strategy='round-robin',
+            clock=self.clock
+        )
+        used = []
+        for i in range(4):
+            credential = pool.acquire()
+            pool.release(credential)
+            used.append(credential.username)
+        self.assertEqual(used, ['a', 'b', 'c', 'a'])
+
+    def test_refused_credentials_leave_pool(self):
+        """
+        Test a credential answered with 401 or 429 is left out until it
+        recovers
+        """
+        pool = CredentialPool(
+            [('a', 'a'), ('b', 'b')], strategy='round-robin', cooldown=60,
+            clock=self.clock
+        )
+        a = pool.acquire()
+        pool.release(a, 429, '5')
+        b = pool.acquire()
+        pool.release(b, 401)
+        try:
+            pool.acquire()
+            self.fail('CredentialsUnavailableException not raised')
+        except CredentialsUnavailableException as e:
+            self.assertEqual(e.retry_after, 5)
+
+        self.clock.now += 5
+        self.assertEqual(pool.acquire(), a)
+        self.assertRaises(
+            CredentialsUnavailableException, pool.acquire, exclude=[a]
+        )
+
+    def test_invalid_arguments(self):
+        """
+        Test a pool needs credentials and a known strategy
+        """
+        self.assertRaises(ValueError, CredentialPool, [])
+        self.assertRaises(
+            ValueError, CredentialPool, [('a', 'a')], strategy='random'
+        )
+
+
+class CredentialPoolAPITest(TestCase):
+
+    def setUp(self):
+        self.server = FakeTransifex(credentials=[('a', 'a'), ('b', 'b')])
+        self.server.add_project('abc')
+
+    def _api(self, credentials):
+        return TransifexAPI(
+            host='http://www.mydomain.com',
+            transport=InProcessTransport(self.server),
+            credentials=CredentialPool(credentials, strategy='round-robin')
+        )
+
+    def test_refused_request_is_retried(self):
+        """
+        Test a request refused for one credential is retried with another
+        """
+        api = self._api([('a', 'a'), ('b', 'b')])
+        self.server.fail(429, retry_after=30)
+        self.assertEqual(api.list_resources('abc'), [])
+        self.assertEqual(api.list_resources('abc'), [])
+        a, b = api.credentials
+        self.assertNotEqual(a.disabled_until, None)
+        self.assertEqual((a.requests, b.requests), (1, 2))
+
+    def test_every_credential_refused(self):
+        """
+        Test the last refusal is raised once every credential was refused
+        """
+        api = self._api([('a', 'a'), ('x', 'x')])
+        self.server.fail(429)
+        self.assertRaises(TransifexAPIException, api.list_resources, 'abc')
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertRaises(
+            CredentialsUnavailableException, api.list_resources, 'abc'
+        )
+
+    def test_host_is_required(self):
+        """
+        Test the host can't be left out
+        """
+        self.assertRaises(ValueError, TransifexAPI, 'a', 'a')
+
+    def test_credentials_are_required(self):
+        """
+        Test the username and password can only be left out with a
+        credential pool
+        """
+        self.assertRaises(
+            ValueError, TransifexAPI, host='http://www.mydomain.com'
+        )
+        self.assertRaises(
+            ValueError, TransifexAPI, 'a', host='http://www.mydomain.com'
+        )
+        api = TransifexAPI(
+            host='http://www.mydomain.com',
+            credentials=CredentialPool([('a', 'a')])
+        )
+        self.assertEqual(api._username, None)
@@ -0,0 +1,142 @@
+from unittest import TestCase
+from io import BytesIO
+from mock import Mock
+from transifex.api import TransifexAPI
+from transifex.exceptions import TransifexAPIException
+from transifex.fake import FakeTransifex
+from transifex.transports import InProcessTransport, Response
+
+
+class TransifexAPIExceptionTest(TestCase):
+
+    def test_summary(self):
+        """
+        Test the exception keeps the status, body, endpoint and slugs
+        """
+        response = Mock(status_code=400, content='Invalid content')
+        e = TransifexAPIException(
+            response, 'new_translation',
+            {'project': 'abc', 'resource': 'def', 'language': 'pt'}
+        )
+        self.assertEqual(e.status_code, 400)
+        self.assertEqual(e.body, 'Invalid content')
+        self.assertEqual(e.body_size, 15)
+        self.assertFalse(e.truncated)
+        self.assertEqual(
+            str(e), 'new_translation(language=pt, project=abc, resource=def) '
+                    '400: Invalid content'
+        )
+        self.assertEqual(
+            str(TransifexAPIException(response)), '400: Invalid content'
+        )
+
+    def test_large_body_is_truncated(self):
+        """
+        Test only the start of a large body is kept
+        """
+        content = 'x' * (1024 * 1024)
+        e = TransifexAPIException(
+            Mock(status_code=500, content=content), max_body=10
+        )
+        self.assertEqual(e.body, 'x' * 10)
+        self.assertTrue(e.truncated)
+        self.assertEqual(str(e), '500: xxxxxxxxxx... (1048576 characters)')
+        self.assertEqual(e.response, None)
+        self.assertEqual(e.full_body, None)
+        self.assertEqual(e.args, ())
+
+    def test_keep_response(self):
+        """
+        Test the whole body is kept until the response is discarded when
+        asked for
+        """
+        content = 'x' * (1024 * 1024)
+        e = TransifexAPIException(
+            Mock(status_code=500, content=content), max_body=10,
+            keep_response=True
+        )
+        self.assertEqual(e.body, 'x' * 10)
+        self.assertEqual(e.full_body, content)
+
+        e.discard_response()
+        self.assertEqual(e.response, None)
+        self.assertEqual(e.full_body, None)
+        self.assertEqual(e.body_size, 1048576)
+
+    def test_streamed_body_is_not_read(self):
+        """
+        Test only the start of a streamed body is read, and its size is
+        taken from the Content-Length header
+        """
+        raw = BytesIO('x' * (1024 * 1024))
+        response = Response(
+            500, {'content-length': '1048576'}, raw=raw
+        )
+        e = TransifexAPIException(response, max_body=10, streamed=True)
+        self.assertEqual(e.body, 'x' * 10)
+        self.assertEqual(e.body_size, 1048576)
+        self.assertTrue(e.truncated)
+        self.assertEqual(raw.tell(), 11)
+
+        e = TransifexAPIException(
+            Response(500, raw=BytesIO('x' * 100)), max_body=10,
+            streamed=True
+        )
+        self.assertEqual(e.body_size, None)
+        self.assertEqual(str(e), '500: xxxxxxxxxx...')
+
+        e = TransifexAPIException(
+            Response(500, raw=BytesIO('error')), streamed=True
+        )
+        self.assertEqual((e.body, e.body_size), ('error', 5))
+        self.assertFalse(e.truncated)
+
+    def test_without_response(self):
+        """
+        Test the exception can be raised without a response
+        """
+        e = TransifexAPIException()
+        self.assertEqual((e.status_code, e.body, e.full_body), (None,) * 3)
+        self.assertEqual(str(e), '')
+
+
+class BulkErrorReportTest(TestCase):
+
+    def test_ensure_resources_discards_responses(self):
+        """
+        Test failed resources are reported without their responses
+        """
+        server = FakeTransifex()
+        api = TransifexAPI(
+            'aaa', 'aaa', 'http://www.mydomain.com',
+            transport=InProcessTransport(server)
+        )
+        api.list_resources = Mock(return_value=[])
+        reports = api.ensure_resources('missing', {'abc': __file__})
+        error = reports[0].result
+        self.assertTrue(isinstance(error, TransifexAPIException))
+        self.assertEqual(error.response, None)
+        self.assertEqual(error.status_code, 404)
+        self.assertEqual(error.endpoint, 'new_resource')
+        self.assertEqual(
+            error.slugs, {'project': 'missing', 'resource': 'abc'}
+        )
+
+    def test_keep_error_responses(self):
+        """
+        Test the api keeps the responses of failures only when asked to
+        """
+        server = FakeTransifex()
+        for keep in (False, True):
+            api = TransifexAPI(
+                'aaa', 'aaa', 'http://www.mydomain.com',
+                transport=InProcessTransport(server),
+                keep_error_responses=keep
+            )
+            try:
+                api.list_resources('missing')
+            except TransifexAPIException as e:
+                self.assertEqual(e.status_code, 404)
+                self.assertEqual(e.response is not None, keep)
+            else:
+                self.fail('TransifexAPIException not raised')
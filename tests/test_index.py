@@ -0,0 +1,109 @@
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+from transifex.index import LocaleIndex, map_locale_path
+
+
+class MapLocalePathTest(TestCase):
+
+    def test_gettext_layout(self):
+        """
+        Test paths in the `<language>/LC_MESSAGES/<domain>.po` layout
+        """
+        self.assertEqual(
+            map_locale_path(os.path.join('pt_BR', 'LC_MESSAGES', 'django.po')),
+            ('djangopo', 'pt_BR')
+        )
+
+    def test_language_directory_layout(self):
+        """
+        Test paths in the `<language>/<file>.po` layout
+        """
+        self.assertEqual(
+            map_locale_path(os.path.join('it', 'Main File.po')),
+            ('main-filepo', 'it')
+        )
+        self.assertEqual(map_locale_path('messages.po'), ('messagespo', None))
+
+
+class LocaleIndexTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.root = os.path.join(self.directory, 'locale')
+        self.index_path = os.path.join(self.directory, 'index.json')
+        for language in ('it', 'pt'):
+            self._write(language, 'first')
+        self._write('README.txt', 'not indexed')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, content):
+        if name.endswith('.txt'):
+            path = os.path.join(self.root, name)
+        else:
+            path = os.path.join(self.root, name, 'LC_MESSAGES', 'django.po')
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        handle = open(path, 'w')
+        handle.write(content)
+        handle.close()
+        return path
+
+    def test_first_scan(self):
+        """
+        Test the first scan adds every translation file
+        """
+        index = LocaleIndex(self.root)
+        result = index.scan()
+        it_path = os.path.join('it', 'LC_MESSAGES', 'django.po')
+        pt_path = os.path.join('pt', 'LC_MESSAGES', 'django.po')
+        self.assertEqual(result.added, [it_path, pt_path])
+        self.assertEqual(result.modified, [])
+        self.assertEqual(result.removed, [])
+        self.assertEqual(len(index), 2)
+        entry = index.get(it_path)
+        self.assertEqual(entry.resource, 'djangopo')
+        self.assertEqual(entry.language, 'it')
+        self.assertEqual(entry.size, 5)
+
+    def test_rescan_detects_changes(self):
+        """
+        Test a rescan reports modified and removed files, and only rehashes
+        files whose stat data changed
+        """
+        index = LocaleIndex(self.root)
+        index.scan()
+        path = self._write('it', 'second')
+        shutil.rmtree(os.path.join(self.root, 'pt'))
+
+        hashed = []
+        original_hash = index._hash
+        def _hash(path):
+            hashed.append(path)
+            return original_hash(path)
+        index._hash = _hash
+
+        result = index.scan()
+        it_path = os.path.join('it', 'LC_MESSAGES', 'django.po')
+        self.assertEqual(result.added, [])
+        self.assertEqual(result.modified, [it_path])
+        self.assertEqual(
+            result.removed, [os.path.join('pt', 'LC_MESSAGES', 'django.po')]
+        )
+        self.assertEqual(hashed, [it_path])
+
+    def test_persisted_index(self):
+        """
+        Test the index is saved and reloaded between runs
+        """
+        LocaleIndex(self.root, index_path=self.index_path).scan()
+        self.assertTrue(os.path.exists(self.index_path))
+
+        index = LocaleIndex(self.root, index_path=self.index_path)
+        self.assertEqual(len(index), 2)
+        index._hash = lambda path: self.fail('%s was rehashed' % path)
+        result = index.scan()
+        self.assertEqual(result, ([], [], []))
@@ -0,0 +1,104 @@
+from unittest import TestCase
+import json
+from mock import patch, Mock
+from transifex.api import TransifexAPI
+from transifex.models import Language, Resource, ProjectStats, \
+    parse_resources, parse_resource_details
+
+
+RESOURCES = [
+    {'slug': 'r1', 'name': 'R1', 'i18n_type': 'PO',
+     'source_language_code': 'en', 'categories': None, 'priority': '1'},
+    {'slug': 'r2', 'name': 'R2', 'i18n_type': 'PO',
+     'source_language_code': 'en', 'categories': ['a'], 'priority': '0'},
+]
+
+def _details(slug, wordcount):
+    return {
+        'slug': slug, 'mimetype': 'text/x-po', 'source_language_code': 'en',
+        'wordcount': wordcount, 'total_entities': 10,
+        'last_update': '2011-12-05 19:59:55',
+        'available_languages': [
+            {'code_aliases': ' ', 'code': 'it', 'name': 'Italian'},
+            {'code_aliases': 'en-gb', 'code': 'en_GB',
+             'name': 'English (Great Britain)'},
+        ],
+    }
+
+
+class ParserTest(TestCase):
+
+    def test_parse_resources(self):
+        """
+        Test the resources listing is parsed into `Resource` objects
+        """
+        resources = parse_resources(json.dumps(RESOURCES))
+        self.assertEqual(len(resources), 2)
+        self.assertEqual(resources[0], Resource(
+            slug='r1', name='R1', i18n_type='PO', source_language_code='en',
+            priority='1'
+        ))
+        self.assertEqual(resources[1].categories, ['a'])
+        self.assertFalse(hasattr(resources[0], '__dict__'))
+
+    def test_parse_resource_details(self):
+        """
+        Test the details of a resource are parsed with shared `Language`
+        objects and interned codes
+        """
+        first = parse_resource_details(json.dumps(_details('r1', 100)))
+        second = parse_resource_details(json.dumps(_details('r2', 50)))
+        self.assertEqual(first.wordcount, 100)
+        self.assertEqual(first.language_codes, ['it', 'en_GB'])
+        self.assertEqual(
+            first.languages[0],
+            Language(code='it', name='Italian', code_aliases=' ')
+        )
+        self.assertTrue(first.languages[0] is second.languages[0])
+        self.assertTrue(first.source_language_code is intern('en'))
+
+
+class ProjectStatsTest(TestCase):
+
+    def setUp(self):
+        self.api = TransifexAPI('aaa', 'aaa', 'http://www.mydomain.com')
+
+    @patch('requests.get')
+    def test_project_stats(self, mock_requests):
+        """
+        Test the `project_stats` api call combines the resources listing
+        with the details of each resource
+        """
+        def side_effect(url, *args, **kwargs):
+            response = Mock()
+            response.status_code = 200
+            if url.endswith('/resources/'):
+                response.content = json.dumps(RESOURCES)
+            else:
+                slug = url.rstrip('/').split('/')[-1]
+                response.content = json.dumps(
+                    _details(slug, 100 if slug == 'r1' else 50)
+                )
+            return response
+
+        mock_requests.side_effect = side_effect
+        stats = self.api.project_stats('abc')
+        self.assertTrue(isinstance(stats, ProjectStats))
+        self.assertEqual(stats.slug, 'abc')
+        self.assertEqual([r.slug for r in stats.resources], ['r1', 'r2'])
+        self.assertEqual(stats.get('r2').name, 'R2')
+        self.assertEqual(stats.wordcount, 150)
+        self.assertEqual(stats.total_entities, 20)
+        self.assertEqual(stats.language_codes, ['en_GB', 'it'])
+
+    @patch('requests.get')
+    def test_list_languages_models(self, mock_requests):
+        """
+        Test the `list_languages` api call can return `Language` objects
+        """
+        response = Mock()
+        response.status_code = 200
+        response.content = json.dumps(_details('r1', 100))
+        mock_requests.return_value = response
+        languages = self.api.list_languages('abc', 'r1', models=True)
+        self.assertEqual([l.code for l in languages], ['it', 'en_GB'])
@@ -0,0 +1,119 @@
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+from mock import Mock
+from transifex.index import LocaleIndex
+from transifex.models import Language, ProjectStats, Resource
+from transifex.planner import SyncPlanner
+
+
+class SyncPlannerTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.api = Mock()
+        self.api.project_stats.return_value = ProjectStats(
+            slug='project', resources=[Resource(
+                slug='djangopo', source_language_code='en',
+                total_entities=3, last_update='2010-01-01 00:00:00',
+                languages=[
+                    Language(code=code) for code in ('en', 'de', 'it', 'pt')
+                ]
+            )]
+        )
+        self.planner = SyncPlanner(self.api)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, language, name, content, mtime=None):
+        path = os.path.join(self.directory, language, 'LC_MESSAGES', name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        handle = open(path, 'w')
+        handle.write(content)
+        handle.close()
+        if mtime is not None:
+            os.utime(path, (mtime, mtime))
+        return os.path.join(language, 'LC_MESSAGES', name)
+
+    def _scan(self):
+        index = LocaleIndex(self.directory)
+        index.scan()
+        return index
+
+    def test_plan_push_and_pull(self):
+        """
+        Test planning creates missing resources, updates sources, uploads
+        translations and downloads the remaining languages
+        """
+        en = self._write('en', 'django.po', 'source')
+        new_en = self._write('en', 'new.po', 'new')
+        it = self._write('it', 'django.po', 'italian')
+        new_it = self._write('it', 'new.po', 'nuovo')
+        fr = self._write('fr', 'old.po', 'ancien')
+
+        plan = self.planner.plan(
+            'project', self._scan(), path_template='%(language)s/%(resource)s'
+        )
+        self.assertEqual(
+            [(a.action, a.resource, a.language, a.path) for a in plan], [
+                ('update', 'djangopo', 'en', en),
+                ('create', 'newpo', 'en', new_en),
+                ('skip', 'oldpo', 'fr', fr),
+                ('upload', 'djangopo', 'it', it),
+                ('upload', 'newpo', 'it', new_it),
+                ('download', 'djangopo', 'de', 'de/djangopo'),
+                ('skip', 'djangopo', 'it', it),
+                ('download', 'djangopo', 'pt', 'pt/djangopo'),
+            ]
+        )
+        self.assertEqual(plan.by_action('skip')[0].reason,
+                         'resource missing on server')
+        self.assertEqual(plan.requests, 6)
+        self.assertEqual(plan.bytes, 6 + 3 + 7 + 5 + 300 + 300)
+        self.assertEqual(plan.listing_requests, 2)
+        self.assertEqual(plan.summary(), {
+            'create': 1, 'update': 1, 'upload': 2, 'download': 2, 'skip': 2,
+            'requests': 6, 'bytes': 621,
+        })
+        self.api.project_stats.assert_called_once_with('project')
+        self.assertEqual(len(self.api.method_calls), 1)
+
+    def test_plan_unchanged(self):
+        """
+        Test unchanged files aren't pushed and translations newer than the
+        resource aren't downloaded
+        """
+        self._write('en', 'django.po', 'source')
+        it = self._write('it', 'django.po', 'italian', mtime=1000)
+        pt = self._write('pt', 'django.po', 'portuguese')
+
+        plan = self.planner.plan('project', self._scan(), changed=[])
+        self.assertEqual(
+            [(a.action, a.language, a.reason) for a in plan], [
+                ('skip', 'en', 'unchanged'),
+                ('skip', 'it', 'unchanged'),
+                ('skip', 'pt', 'unchanged'),
+                ('download', 'de', None),
+                ('download', 'it', None),
+                ('skip', 'pt', 'up to date'),
+            ]
+        )
+        self.assertEqual(plan.by_action('download')[0].path, None)
+        self.assertEqual(plan.by_action('download')[1].path, it)
+        self.assertEqual(plan.by_action('download')[1].bytes, 7)
+        self.assertEqual(plan.by_action('skip')[-1].path, pt)
+        self.assertEqual(plan.requests, 2)
+
+    def test_plan_pull_only(self):
+        """
+        Test planning only a pull leaves local changes out of the plan
+        """
+        self._write('it', 'django.po', 'italian', mtime=1000)
+        plan = self.planner.plan('project', self._scan(), push=False)
+        self.assertEqual(
+            [(a.action, a.language) for a in plan],
+            [('download', 'de'), ('download', 'it'), ('download', 'pt')]
+        )
@@ -0,0 +1,174 @@
+from unittest import TestCase
+import itertools
+import json
+import os
+import shutil
+import tempfile
+import transifex.api
+import transifex.util
+from transifex.api import TransifexAPI
+from transifex.fake import FakeTransifex
+from mock import Mock, patch
+from transifex.profiling import Profiler, compare_reports, format_report, \
+    load_report
+from transifex.transports import InProcessTransport
+
+
+class ProfilerTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.server = FakeTransifex()
+        self.server.add_project('abc')
+        self.api = TransifexAPI(
+            'aaa', 'aaa', 'http://www.mydomain.com',
+            transport=InProcessTransport(self.server)
+        )
+        self.path = os.path.join(self.directory, 'messages.po')
+        handle = open(self.path, 'w')
+        handle.write('msgid "a"\nmsgstr ""\n')
+        handle.close()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_profile_run(self):
+        """
+        Test endpoints, requests, JSON, file I/O and util helpers are timed
+        and the original functions are restored afterwards
+        """
+        new_resource = TransifexAPI.__dict__['new_resource']
+        with Profiler() as profiler:
+            self.api.ensure_resources('abc', [self.path])
+            self.api.get_translation(
+                'abc', 'messagespo', 'en',
+                os.path.join(self.directory, 'en.po')
+            )
+
+        report = profiler.report()
+        functions = report['functions']
+        self.assertEqual(
+            functions['TransifexAPI.ensure_resources']['calls'], 1
+        )
+        self.assertEqual(functions['TransifexAPI.new_resource']['calls'], 1)
+        self.assertEqual(functions['TransifexAPI._send']['calls'], 3)
+        self.assertTrue(functions['util.slugify']['calls'] >= 1)
+        self.assertEqual(functions['json.dumps']['calls'], 1)
+        self.assertEqual(functions['file.read']['calls'], 1)
+        self.assertEqual(functions['file.write']['category'], 'file')
+        self.assertAlmostEqual(report['categories']['endpoint'], sum(
+            stats['self'] for stats in functions.values()
+            if stats['category'] == 'endpoint'
+        ))
+
+        self.assertTrue(TransifexAPI.__dict__['new_resource'] is new_resource)
+        self.assertTrue(transifex.api.json is json)
+        self.assertFalse('open' in vars(transifex.api))
+        self.assertTrue(transifex.api.slugify is transifex.util.slugify)
+
+    def test_self_time(self):
+        """
+        Test the self time of a function excludes the functions it calls
+        """
+        ticks = itertools.count()
+        profiler = Profiler(trace_memory=False, clock=lambda: next(ticks))
+        inner = profiler._timed('util', 'inner', lambda: None)
+        outer = profiler._timed('endpoint', 'outer', inner)
+        outer()
+        functions = profiler.report()['functions']
+        self.assertEqual(functions['outer']['total'], 3)
+        self.assertEqual(functions['outer']['self'], 2)
+        self.assertEqual(functions['inner']['self'], 1)
+
+    def test_memory(self):
+        """
+        Test the memory used is recorded, with the peak resident set size
+        where `tracemalloc` isn't available
+        """
+        with patch('transifex.profiling.tracemalloc', None):
+            with Profiler() as profiler:
+                data = ['x' * 1024 for i in range(1024)]
+        memory = profiler.report()['memory']
+        self.assertEqual(memory['source'], 'maxrss')
+        self.assertTrue(memory['peak'] > 1024 * 1024)
+        self.assertTrue(memory['growth'] >= 0)
+        self.assertTrue('memory peak' in format_report(profiler.report()))
+
+        with patch('transifex.profiling.tracemalloc', None):
+            with Profiler(trace_memory=False) as profiler:
+                pass
+        self.assertEqual(profiler.report()['memory'], None)
+
+    def test_memory_with_tracemalloc(self):
+        """
+        Test the peak and top allocations are recorded with `tracemalloc`
+        """
+        tracemalloc = Mock()
+        tracemalloc.is_tracing.return_value = False
+        tracemalloc.get_traced_memory.return_value = (100, 200)
+        frame = Mock(filename='abc.py', lineno=12)
+        tracemalloc.take_snapshot.return_value.statistics.return_value = [
+            Mock(traceback=[frame], size=150, count=3)
+        ]
+        with patch('transifex.profiling.tracemalloc', tracemalloc):
+            with Profiler() as profiler:
+                pass
+        self.assertTrue(tracemalloc.start.called)
+        self.assertTrue(tracemalloc.stop.called)
+        self.assertEqual(profiler.report()['memory'], {
+            'source': 'tracemalloc', 'current': 100, 'peak': 200,
+            'top': [{'location': 'abc.py:12', 'size': 150, 'count': 3}],
+        })
+
+    def test_one_profiler_at_a_time(self):
+        """
+        Test a second profiler can't run while one is running
+        """
+        with Profiler():
+            self.assertRaises(RuntimeError, Profiler().start)
+
+    def test_stop_without_start(self):
+        """
+        Test stopping a profiler which isn't running doesn't let a second
+        profiler run alongside the running one
+        """
+        with Profiler():
+            Profiler().stop()
+            self.assertRaises(RuntimeError, Profiler().start)
+
+    def test_failed_start(self):
+        """
+        Test a profiler which fails to start lets the next one run
+        """
+        profiler = Profiler()
+        with patch.object(
+            profiler, '_install', Mock(side_effect=KeyError('a'))
+        ):
+            self.assertRaises(KeyError, profiler.start)
+        with Profiler() as profiler:
+            self.api.list_resources('abc')
+        self.assertEqual(
+            profiler.report()['functions']['TransifexAPI._send']['calls'], 1
+        )
+
+    def test_save_and_compare(self):
+        """
+        Test reports can be saved, loaded and compared
+        """
+        with Profiler() as before:
+            self.api.list_resources('abc')
+        with Profiler() as after:
+            self.api.list_resources('abc')
+            self.api.list_resources('abc')
+        path = os.path.join(self.directory, 'profile.json')
+        before.save(path)
+
+        diff = compare_reports(load_report(path), after.report())
+        self.assertEqual(diff['functions']['TransifexAPI._send']['calls'], 1)
+        self.assertEqual(
+            sorted(diff['categories']),
+            ['endpoint', 'file', 'json', 'network', 'util']
+        )
+        self.assertTrue('TransifexAPI.list_resources' in format_report(
+            after.report()
+        ))
@@ -0,0 +1,186 @@
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+from transifex.api import TransifexAPI
+from transifex.breaker import CircuitBreaker
+from transifex.exceptions import CircuitOpenException
+from transifex.fake import FakeTransifex
+from transifex.progress import ProgressReader, ProgressTracker, \
+    TransferProgress, iter_progress
+from transifex.transports import InProcessTransport
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TransferProgressTest(TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        self.reports = []
+
+    def test_rate_and_eta(self):
+        """
+        Test the rate and time left are derived from the bytes transferred
+        """
+        progress = TransferProgress(
+            'abc/def/pt', total=1000, callback=self.reports.append,
+            interval=1, clock=self.clock
+        )
+        self.assertEqual(progress.eta, None)
+        self.clock.now += 2
+        progress.update(500)
+        self.assertEqual(progress.rate, 250)
+        self.assertEqual(progress.eta, 2)
+        self.clock.now += 1
+        progress.update(500)
+        progress.finish()
+        self.assertTrue(progress.finished)
+        self.assertEqual(progress.eta, 0)
+        self.assertEqual(progress.elapsed, 3)
+
+    def test_callbacks_are_throttled(self):
+        """
+        Test the callback is called at most once per interval, and when the
+        transfer finishes
+        """
+        progress = TransferProgress(
+            'abc', callback=self.reports.append, interval=1, clock=self.clock
+        )
+        for i in range(10):
+            self.clock.now += 0.25
+            progress.update(10)
+        self.assertEqual(len(self.reports), 2)
+        list(iter_progress([], progress))
+        progress.finish()
+        self.assertEqual(len(self.reports), 3)
+        self.assertEqual(progress.transferred, 100)
+
+
+class ProgressTrackerTest(TestCase):
+
+    def test_aggregate(self):
+        """
+        Test the tracker adds up its transfers and finds stalled ones
+        """
+        clock = Clock()
+        reports = []
+        tracker = ProgressTracker(
+            callback=reports.append, interval=60, clock=clock
+        )
+        first = tracker.transfer('first', 100)
+        second = tracker.transfer('second')
+        clock.now += 10
+        first.update(100)
+        first.finish()
+        second.update(50)
+        self.assertEqual(tracker.active, [second])
+        self.assertEqual(tracker.stalled(5), [])
+        clock.now += 10
+        self.assertEqual(tracker.stalled(5), [second])
+
+        self.assertEqual((tracker.started, tracker.completed), (2, 1))
+        self.assertEqual((tracker.transferred, tracker.total), (150, 100))
+        self.assertEqual(tracker.rate, 7.5)
+        second.finish()
+        self.assertEqual(tracker.total, 150)
+        self.assertEqual(tracker.active, [])
+        self.assertEqual(reports, [tracker, tracker])
+
+
+class ProgressReaderTest(TestCase):
+
+    def test_read(self):
+        """
+        Test reading reports progress and rereading doesn't count twice
+        """
+        progress = TransferProgress('abc', total=10)
+        reader = ProgressReader(b'0123456789', progress)
+        self.assertEqual(len(reader), 10)
+        self.assertEqual(reader.read(4), b'0123')
+        reader.seek(0)
+        self.assertEqual(reader.read(6), b'012345')
+        self.assertEqual(progress.transferred, 6)
+        self.assertEqual(reader.read(), b'6789')
+        self.assertEqual(reader.read(), b'')
+        self.assertEqual(progress.transferred, 10)
+        self.assertTrue(progress.finished)
+        reader.seek(0, 2)
+        self.assertEqual(reader.tell(), 10)
+
+
+class APIProgressTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.server = FakeTransifex()
+        self.server.add_project('abc')
+        self.server.add_resource(
+            'abc', 'def', 'msgid "a"\nmsgstr ""\n',
+            translations={'pt': 'msgid "a"\nmsgstr "b"\n'}
+        )
+        self.api = TransifexAPI(
+            'aaa', 'aaa', 'http://www.mydomain.com',
+            transport=InProcessTransport(self.server)
+        )
+        self.path = os.path.join(self.directory, 'pt.po')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_download_progress(self):
+        """
+        Test downloads report their progress to a tracker
+        """
+        tracker = ProgressTracker()
+        self.api.get_translation('abc', 'def', 'pt', self.path, tracker)
+        size = os.path.getsize(self.path)
+        self.assertEqual((tracker.transferred, tracker.total), (size, size))
+        self.assertEqual(tracker.completed, 1)
+
+    def test_upload_progress(self):
+        """
+        Test uploads report their progress to a callback
+        """
+        handle = open(self.path, 'w')
+        handle.write('msgid "a"\nmsgstr "c"\n')
+        handle.close()
+        reports = []
+        self.api.new_translation(
+            'abc', 'def', 'pt', self.path, progress=reports.append
+        )
+        progress = reports[-1]
+        self.assertEqual(progress.name, 'abc/def/pt')
+        self.assertTrue(progress.finished)
+        self.assertEqual(progress.transferred, progress.total)
+        self.assertEqual(
+            self.server.projects['abc']['resources']['def']['translations'],
+            {'pt': 'msgid "a"\nmsgstr "c"\n'}
+        )
+
+    def test_failed_upload_finishes(self):
+        """
+        Test uploads which fail before their body is sent aren't left active
+        """
+        handle = open(self.path, 'w')
+        handle.write('msgid "a"\nmsgstr "c"\n')
+        handle.close()
+        self.api.circuit_breaker = CircuitBreaker(
+            minimum_calls=1, window_size=1
+        )
+        self.api.circuit_breaker.record_failure()
+        tracker = ProgressTracker()
+        for i in range(3):
+            self.assertRaises(
+                CircuitOpenException, self.api.new_translation, 'abc', 'def',
+                'pt', self.path, progress=tracker
+            )
+        self.assertEqual((tracker.started, tracker.completed), (3, 3))
+        self.assertEqual(tracker.active, [])
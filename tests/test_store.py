@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+from mock import Mock
+from transifex.po import parse_po
+from transifex.store import TranslationStore
+
+
+POFILE = r'''# Translation of the app
+msgid ""
+msgstr ""
+"Content-Type: text/plain; charset=UTF-8\n"
+
+#: app.py:1
+msgid "Hello"
+msgstr "Olá"
+
+msgctxt "menu"
+msgid "Open"
+msgstr "Abrir"
+
+#, fuzzy
+msgid "Close"
+msgstr "Fechar"
+
+msgid "one file"
+msgid_plural "%d files"
+msgstr[0] "um arquivo"
+msgstr[1] "%d "
+"arquivos"
+
+msgid "Untranslated"
+msgstr ""
+
+#~ msgid "Old"
+#~ msgstr "Velho"
+'''
+
+
+class ParsePoTest(TestCase):
+
+    def test_parse_po(self):
+        """
+        Test the entries of a pofile are read, skipping the header and
+        obsolete entries
+        """
+        entries = list(parse_po(POFILE.splitlines()))
+        self.assertEqual([e.msgid for e in entries], [
+            'Hello', 'Open', 'Close', 'one file', 'Untranslated'
+        ])
+        self.assertEqual(entries[0].msgstr, u'Olá')
+        self.assertEqual(entries[1].context, 'menu')
+        self.assertTrue(entries[2].fuzzy)
+        self.assertFalse(entries[3].fuzzy)
+        self.assertEqual(entries[3].msgid_plural, '%d files')
+        self.assertEqual(entries[3].plurals, ('um arquivo', '%d arquivos'))
+
+
+class TranslationStoreTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'pt.po')
+        self._write(POFILE)
+        self.store = TranslationStore(os.path.join(self.directory, 'db'))
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def _write(self, content):
+        handle = open(self.path, 'wb')
+        handle.write(content)
+        handle.close()
+
+    def test_lookup(self):
+        """
+        Test ingested strings can be looked up
+        """
+        self.assertTrue(self.store.ingest('abc', 'def', 'pt', self.path))
+        lookup = self.store.lookup
+        self.assertEqual(lookup('abc', 'def', 'pt', 'Hello'), u'Olá')
+        self.assertEqual(
+            lookup('abc', 'def', 'pt', 'Open', context='menu'), 'Abrir'
+        )
+        self.assertEqual(lookup('abc', 'def', 'pt', 'Open'), None)
+        self.assertEqual(lookup('abc', 'def', 'pt', 'Close'), None)
+        self.assertEqual(
+            lookup('abc', 'def', 'pt', 'Close', include_fuzzy=True), 'Fechar'
+        )
+        self.assertEqual(lookup('abc', 'def', 'pt', 'Untranslated'), None)
+        self.assertEqual(lookup('abc', 'def', 'it', 'Hello'), None)
+        self.assertEqual(
+            self.store.lookup_plural('abc', 'def', 'pt', 'one file'),
+            ['um arquivo', '%d arquivos']
+        )
+        self.assertEqual(self.store.languages('abc', 'def'), ['pt'])
+
+    def test_incremental_ingest(self):
+        """
+        Test unchanged files are skipped and changed files replace the
+        stored strings
+        """
+        self.assertTrue(self.store.ingest('abc', 'def', 'pt', self.path))
+        self.assertFalse(self.store.ingest('abc', 'def', 'pt', self.path))
+
+        self._write('msgid "Hello"\nmsgstr "Oi"\n')
+        self.assertTrue(self.store.ingest('abc', 'def', 'pt', self.path))
+        self.assertEqual(self.store.lookup('abc', 'def', 'pt', 'Hello'), 'Oi')
+        self.assertEqual(
+            self.store.lookup('abc', 'def', 'pt', 'Open', context='menu'),
+            None
+        )
+
+    def test_refresh(self):
+        """
+        Test `refresh` downloads a translation and ingests it
+        """
+        api = Mock()
+        self.assertTrue(
+            self.store.refresh(api, 'abc', 'def', 'pt', self.path)
+        )
+        api.get_translation.assert_called_with('abc', 'def', 'pt', self.path)
+        self.assertEqual(self.store.lookup('abc', 'def', 'pt', 'Open',
+                                           context='menu'), 'Abrir')
@@ -0,0 +1,126 @@
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+import threading
+from mock import Mock
+from transifex.exceptions import TransifexAPIException
+from transifex.sync import SyncScheduler, _FairQueue, _Project
+
+
+class FairQueueTest(TestCase):
+
+    def test_priority_and_turns(self):
+        """
+        Test higher priority projects go first and projects of the same
+        priority take turns
+        """
+        big = _Project('big', 0, None, None)
+        small = _Project('small', 0, None, None)
+        urgent = _Project('urgent', 5, None, None)
+        queue = _FairQueue()
+        for i in range(3):
+            queue.put(big, i)
+        queue.put(small, 0)
+        queue.put(urgent, 0)
+
+        order = [(project.slug, task) for project, task in
+                 [queue.get() for i in range(5)]]
+        self.assertEqual(order, [
+            ('urgent', 0), ('big', 0), ('small', 0), ('big', 1), ('big', 2)
+        ])
+
+    def test_close_wakes_workers(self):
+        """
+        Test closing the queue releases the workers waiting on it
+        """
+        queue = _FairQueue()
+        results = []
+        thread = threading.Thread(target=lambda: results.append(queue.get()))
+        thread.start()
+        queue.close()
+        thread.join(5)
+        self.assertEqual(results, [None])
+
+
+class SyncSchedulerTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.api = Mock()
+        self.api.list_resources.side_effect = lambda project: [
+            {'slug': 'r1'}, {'slug': 'r2'}
+        ]
+        self.api.list_languages.side_effect = lambda project, resource: [
+            'it', 'pt'
+        ]
+
+        def get_translation(project, resource, language, path):
+            handle = open(path, 'w')
+            handle.write('%s %s %s' % (project, resource, language))
+            handle.close()
+        self.api.get_translation.side_effect = get_translation
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_sync_projects(self):
+        """
+        Test every translation of every project is downloaded and progress
+        is reported
+        """
+        scheduler = SyncScheduler(self.api, self.directory, workers=3)
+        scheduler.add_project('p1')
+        scheduler.add_project('p2', languages=['it'])
+        events = list(scheduler.run())
+
+        downloads = sorted(
+            (e.project, e.resource, e.language) for e in events
+            if e.kind == SyncScheduler.TRANSLATION
+        )
+        self.assertEqual(downloads, [
+            ('p1', 'r1', 'it'), ('p1', 'r1', 'pt'), ('p1', 'r2', 'it'),
+            ('p1', 'r2', 'pt'), ('p2', 'r1', 'it'), ('p2', 'r2', 'it'),
+        ])
+        path = os.path.join(self.directory, 'p1', 'r2', 'pt.po')
+        self.assertEqual(open(path).read(), 'p1 r2 pt')
+
+        finished = [e for e in events if e.kind == SyncScheduler.PROJECT]
+        self.assertEqual(
+            sorted((e.project, e.done, e.total) for e in finished),
+            [('p1', 7, 7), ('p2', 5, 5)]
+        )
+        self.assertTrue(all(e.error is None for e in events))
+
+    def test_failures_are_reported(self):
+        """
+        Test a failing project is reported without stopping the others
+        """
+        def list_resources(project):
+            if project == 'broken':
+                raise TransifexAPIException()
+            return [{'slug': 'r1'}]
+        self.api.list_resources.side_effect = list_resources
+
+        scheduler = SyncScheduler(self.api, self.directory, workers=2)
+        scheduler.add_project('broken')
+        scheduler.add_project('p1', priority=1)
+        events = list(scheduler.run())
+
+        errors = [e for e in events if e.error is not None]
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0].project, 'broken')
+        self.assertEqual(errors[0].kind, SyncScheduler.RESOURCES)
+        self.assertEqual(self.api.get_translation.call_count, 2)
+
+    def test_ingest_into_store(self):
+        """
+        Test downloaded translations are ingested into the store
+        """
+        store = Mock()
+        scheduler = SyncScheduler(self.api, self.directory, store=store)
+        scheduler.add_project('p1', resources=['r1'], languages=['pt'])
+        list(scheduler.run())
+        store.ingest.assert_called_once_with(
+            'p1', 'r1', 'pt', os.path.join(self.directory, 'p1', 'r1', 'pt.po')
+        )
@@ -0,0 +1,258 @@
+from unittest import TestCase
+import BaseHTTPServer
+import os
+import requests
+import shutil
+import SocketServer
+import sys
+import tempfile
+import threading
+from mock import Mock, patch
+from transifex.api import TransifexAPI, RESOURCE_CREATED, RESOURCE_UPDATED
+from transifex.breaker import CircuitBreaker
+from transifex.exceptions import TransifexAPIException, CircuitOpenException
+from transifex.fake import FakeTransifex
+from transifex.transports import InProcessTransport, RequestsTransport, \
+    Urllib3Transport, Response
+
+
+POFILE = '''msgid ""
+msgstr ""
+
+msgid "Hello"
+msgstr ""
+
+msgid "World"
+msgstr ""
+'''
+
+
+class InProcessTransportTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.server = FakeTransifex(credentials=[('aaa', 'aaa')])
+        self.api = TransifexAPI(
+            'aaa', 'aaa', 'http://www.mydomain.com',
+            transport=InProcessTransport(self.server)
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory, name)
+        handle = open(path, 'w')
+        handle.write(content)
+        handle.close()
+        return path
+
+    def test_round_trip(self):
+        """
+        Test every api call against the fake server
+        """
+        api = self.api
+        self.assertTrue(api.ping())
+        self.assertFalse(api.project_exists('abc'))
+        self.assertRaises(TransifexAPIException, api.new_project, slug='abc')
+        api.new_project('abc', repository_url='http://abc.com')
+        self.assertTrue(api.project_exists('abc'))
+
+        path = self._write('pofile.po', POFILE)
+        api.new_resource('abc', path)
+        self.assertEqual(
+            [r['slug'] for r in api.list_resources('abc')], ['pofilepo']
+        )
+        self.assertEqual(
+            api.update_source_translation('abc', 'pofilepo', path),
+            {'strings_added': 0, 'strings_updated': 2, 'strings_delete': 0}
+        )
+        api.new_translation('abc', 'pofilepo', 'pt', path)
+        self.assertEqual(
+            api.list_languages('abc', 'pofilepo'), ['en-gb', 'pt']
+        )
+
+        output = os.path.join(self.directory, 'pt.po')
+        api.get_translation('abc', 'pofilepo', 'pt', output)
+        self.assertEqual(open(output).read(), POFILE)
+
+        reports = api.ensure_resources('abc', [
+            path, self._write('other.po', POFILE)
+        ])
+        self.assertEqual(
+            [r.action for r in reports], [RESOURCE_UPDATED, RESOURCE_CREATED]
+        )
+
+        api.delete_resource('abc', 'pofilepo')
+        self.assertRaises(
+            TransifexAPIException, api.list_languages, 'abc', 'pofilepo'
+        )
+
+    def test_bad_credentials(self):
+        """
+        Test the fake server rejects unknown credentials
+        """
+        api = TransifexAPI(
+            'bbb', 'bbb', 'http://www.mydomain.com',
+            transport=InProcessTransport(self.server)
+        )
+        self.assertFalse(api.ping())
+        self.assertRaises(TransifexAPIException, api.list_resources, 'abc')
+
+    def test_server_failures_open_breaker(self):
+        """
+        Test injected server failures open the circuit breaker
+        """
+        api = TransifexAPI(
+            'aaa', 'aaa', 'http://www.mydomain.com',
+            circuit_breaker=CircuitBreaker(minimum_calls=2, window_size=2),
+            transport=InProcessTransport(self.server)
+        )
+        self.server.fail(503, times=2)
+        self.assertFalse(api.ping())
+        self.assertFalse(api.ping())
+        self.assertRaises(CircuitOpenException, api.ping)
+        self.assertEqual(len(self.server.requests), 2)
+
+
+class RequestsTransportTest(TestCase):
+
+    def test_session(self):
+        """
+        Test requests are made with the session when one is given
+        """
+        session = Mock()
+        transport = RequestsTransport(session)
+        transport.request(
+            'get', 'http://www.mydomain.com/', auth=('a', 'b'), stream=False
+        )
+        session.get.assert_called_with(
+            'http://www.mydomain.com/', auth=('a', 'b')
+        )
+
+    def test_stream_on_older_requests(self):
+        """
+        Test streamed requests use the argument this version of requests
+        knows, if any
+        """
+        session = Mock()
+        transport = RequestsTransport(session)
+        for kwargs in ({'stream': True}, {'prefetch': False}, {}):
+            with patch('transifex.transports._stream_kwargs', kwargs):
+                transport.request(
+                    'get', 'http://www.mydomain.com/', stream=True
+                )
+            session.get.assert_called_with(
+                'http://www.mydomain.com/', **kwargs
+            )
+
+
+class _ThreadingServer(SocketServer.ThreadingMixIn,
+                       BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class _TranslationHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    Answers with a large server error for the translations of project
+    'broken', and with a small translation otherwise. Connections are kept
+    alive
+    """
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        if '/project/broken/' in self.path:
+            status_code, body = 500, 'x' * 5000
+        else:
+            status_code, body = 200, 'msgid ""\n'
+        # in one write, so that the client reads all of it at once
+        self.wfile.write('HTTP/1.1 %d %s\r\nContent-Length: %d\r\n\r\n%s' % (
+            status_code, self.responses[status_code][0], len(body), body
+        ))
+
+    def log_message(self, *args):
+        pass
+
+
+class PooledSessionTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.server = _ThreadingServer(('127.0.0.1', 0), _TranslationHandler)
+        thread = threading.Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.transport = RequestsTransport(requests.Session())
+        self.api = TransifexAPI(
+            'aaa', 'aaa', 'http://127.0.0.1:%d' % self.server.server_port,
+            transport=self.transport
+        )
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def test_partly_read_error_is_not_reused(self):
+        """
+        Test the connection of a streamed error whose body was only partly
+        read isn't used for the next request
+        """
+        path = os.path.join(self.directory, 'pt.po')
+        try:
+            self.api.get_translation(
+                'broken', 'def', 'pt', path, progress=lambda progress: None
+            )
+        except TransifexAPIException:
+            # the traceback keeps the failed response alive, as it would in
+            # a caller which logs the error after the next request
+            exc_info = sys.exc_info()
+        else:
+            self.fail('TransifexAPIException not raised')
+        self.api.get_translation('abc', 'def', 'pt', path)
+        handle = open(path)
+        try:
+            self.assertEqual(handle.read(), 'msgid ""\n')
+        finally:
+            handle.close()
+        self.assertEqual(self.api.circuit_state, CircuitBreaker.CLOSED)
+
+
+class Urllib3TransportTest(TestCase):
+
+    def test_request(self):
+        """
+        Test requests are made with the pool manager and wrapped in a
+        `Response`
+        """
+        raw = Mock()
+        raw.status = 200
+        raw.headers = {'ETag': '"1"'}
+        raw.data = 'abc'
+        pool_manager = Mock()
+        pool_manager.urlopen.return_value = raw
+
+        transport = Urllib3Transport(pool_manager)
+        response = transport.request(
+            'get', 'http://www.mydomain.com/a/', auth=('a', 'b'),
+            params={'file': ''}
+        )
+        args, kwargs = pool_manager.urlopen.call_args
+        self.assertEqual(args, ('GET', 'http://www.mydomain.com/a/?file='))
+        self.assertEqual(kwargs['headers'], {'authorization': 'Basic YTpi'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers, {'etag': '"1"'})
+        self.assertEqual(list(response.iter_content(2)), ['ab', 'c'])
+
+
+class ResponseTest(TestCase):
+
+    def test_streamed_content(self):
+        """
+        Test the body of a streamed response is read in chunks
+        """
+        raw = Mock()
+        raw.read.side_effect = ['ab', 'c', '']
+        response = Response(200, raw=raw)
+        self.assertEqual(list(response.iter_content(2)), ['ab', 'c'])
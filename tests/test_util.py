@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+from unittest import TestCase
+import os
+import shutil
+import tempfile
+from transifex.util import slugify, slugify_many, is_valid_slug, lru_cache, \
+    map_concurrently, replace_file
+
+
+class SlugifyTest(TestCase):
+
+    def test_slugify(self):
+        """
+        Test values are normalised into slugs
+        """
+        self.assertEqual(slugify('Hello World'), 'hello-world')
+        self.assertEqual(slugify('django.po'), 'djangopo')
+        self.assertEqual(slugify(u'M\xf3dulo  --  Um'), 'modulo-um')
+        self.assertEqual(slugify(12), '12')
+
+    def test_is_valid_slug(self):
+        """
+        Test only values which are already slugs are valid
+        """
+        self.assertTrue(is_valid_slug('abc-def'))
+        self.assertFalse(is_valid_slug('abc def'))
+        self.assertFalse(is_valid_slug('%@$'))
+
+    def test_slugify_many(self):
+        """
+        Test a batch of values is slugified in order with validation results
+        """
+        results = slugify_many(['abc', 'A B', 'abc', '.'])
+        self.assertEqual(
+            [(r.value, r.slug, r.valid) for r in results],
+            [('abc', 'abc', True), ('A B', 'a-b', False),
+             ('abc', 'abc', True), ('.', '', False)]
+        )
+
+
+class LRUCacheTest(TestCase):
+
+    def test_least_recently_used_evicted(self):
+        """
+        Test results are memoised and the least recently used are evicted
+        """
+        calls = []
+
+        @lru_cache(maxsize=2)
+        def double(value):
+            calls.append(value)
+            return value * 2
+
+        self.assertEqual(double(1), 2)
+        self.assertEqual(double(2), 4)
+        self.assertEqual(double(1), 2)
+        self.assertEqual(double(3), 6)
+        self.assertEqual(double(1), 2)
+        self.assertEqual(double(2), 4)
+        self.assertEqual(calls, [1, 2, 3, 2])
+
+
+class MapConcurrentlyTest(TestCase):
+
+    def test_results_in_order(self):
+        """
+        Test results and exceptions are returned in the order of the items
+        """
+        def invert(value):
+            return 1.0 / value
+
+        results = map_concurrently(invert, [1, 0, 4], workers=2)
+        self.assertEqual(results[0], (1.0, None))
+        self.assertEqual(results[1][0], None)
+        self.assertTrue(isinstance(results[1][1], ZeroDivisionError))
+        self.assertEqual(results[2], (0.25, None))
+
+
+class ReplaceFileTest(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _write(self, name, content):
+        path = os.path.join(self.directory, name)
+        handle = open(path, 'w')
+        try:
+            handle.write(content)
+        finally:
+            handle.close()
+        return path
+
+    def test_replace_file(self):
+        """
+        Test a file is renamed over an existing file
+        """
+        src = self._write('new', 'new')
+        dst = self._write('old', 'old')
+        replace_file(src, dst)
+        self.assertFalse(os.path.exists(src))
+        handle = open(dst)
+        try:
+            self.assertEqual(handle.read(), 'new')
+        finally:
+            handle.close()
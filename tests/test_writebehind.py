@@ -0,0 +1,105 @@
+from unittest import TestCase
+import threading
+import time
+from mock import Mock
+from transifex.exceptions import TransifexAPIException
+from transifex.writebehind import UploadQueue
+
+
+class UploadQueueTest(TestCase):
+
+    def setUp(self):
+        self.api = Mock()
+
+    def _wait_for(self, condition, timeout=5):
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertTrue(condition())
+
+    def test_writes_are_merged(self):
+        """
+        Test repeated writes to the same target are uploaded once, with the
+        last file
+        """
+        queue = UploadQueue(self.api, window=60)
+        for path in ('/tmp/1.po', '/tmp/2.po', '/tmp/3.po'):
+            queue.new_translation('abc', 'def', 'pt', path)
+        queue.new_translation('abc', 'def', 'it', '/tmp/it.po')
+        queue.update_source_translation('abc', 'def', '/tmp/en.po')
+        self.assertEqual(len(queue), 3)
+        self.assertEqual(self.api.new_translation.call_count, 0)
+
+        queue.flush()
+        self.assertEqual(len(queue), 0)
+        self.assertEqual(
+            sorted(c[0] for c in self.api.new_translation.call_args_list), [
+                ('abc', 'def', 'it', '/tmp/it.po'),
+                ('abc', 'def', 'pt', '/tmp/3.po'),
+            ]
+        )
+        self.api.update_source_translation.assert_called_once_with(
+            'abc', 'def', '/tmp/en.po'
+        )
+        self.assertEqual((queue.writes, queue.uploads), (5, 3))
+        queue.close()
+
+    def test_window_expires(self):
+        """
+        Test queued writes are uploaded in the background once the window
+        has passed
+        """
+        queue = UploadQueue(self.api, window=0.05)
+        queue.new_translation('abc', 'def', 'pt', '/tmp/1.po')
+        self._wait_for(lambda: queue.uploads == 1)
+        self.api.new_translation.assert_called_once_with(
+            'abc', 'def', 'pt', '/tmp/1.po'
+        )
+        queue.close()
+
+    def test_no_concurrent_uploads_of_a_target(self):
+        """
+        Test a write made while its target is being uploaded waits for that
+        upload to finish
+        """
+        started = []
+        release = threading.Event()
+
+        def new_translation(*args):
+            started.append(args)
+            release.wait(5)
+        self.api.new_translation.side_effect = new_translation
+
+        queue = UploadQueue(self.api, window=0, workers=4)
+        queue.new_translation('abc', 'def', 'pt', '/tmp/1.po')
+        self._wait_for(lambda: len(started) == 1)
+        queue.new_translation('abc', 'def', 'pt', '/tmp/2.po')
+        time.sleep(0.1)
+        self.assertEqual(len(started), 1)
+
+        release.set()
+        queue.flush()
+        self.assertEqual(
+            [args[3] for args in started], ['/tmp/1.po', '/tmp/2.po']
+        )
+        queue.close()
+
+    def test_context_manager_collects_errors(self):
+        """
+        Test leaving the context uploads everything and failed uploads are
+        collected
+        """
+        error = TransifexAPIException(Mock(status_code=400, content='no'))
+        self.api.update_source_translation.side_effect = error
+        with UploadQueue(self.api, window=60) as queue:
+            queue.update_source_translation('abc', 'def', '/tmp/1.po')
+            queue.update_source_translation('abc', 'def', '/tmp/2.po')
+
+        self.assertEqual(len(queue.errors), 1)
+        self.assertEqual(queue.errors[0].key, ('source', 'abc', 'def'))
+        self.assertEqual(queue.errors[0].path, '/tmp/2.po')
+        self.assertEqual(queue.errors[0].writes, 2)
+        self.assertEqual(queue.errors[0].exception, error)
+        self.assertRaises(
+            RuntimeError, queue.new_translation, 'abc', 'def', 'pt', '/tmp/p'
+        )
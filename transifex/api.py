@@ -2,20 +2,109 @@
 Transifex API
 """
 import codecs
+import itertools
 import requests
 import json
 import os
-from transifex.exceptions import TransifexAPIException, InvalidSlugException
-from transifex.util import slugify
+import threading
+from collections import namedtuple
+from transifex.archive import check_archive_format, open_archive
+from transifex.breaker import CircuitBreaker
+from transifex.credentials import REFUSED_STATUS_CODES
+from transifex.exceptions import TransifexAPIException, InvalidSlugException, \
+    CircuitOpenException, CredentialsUnavailableException
+from transifex.models import ProjectStats, parse_resources, \
+    parse_resource_details
+from transifex.progress import ProgressReader, iter_progress, start_transfer
+from transifex.transports import RequestsTransport
+from transifex.util import slugify, is_valid_slug, map_concurrently, \
+    content_length
+
+ARCHIVE_CHUNK_SIZE = 64 * 1024
+# the number of bytes of each translation `export_translations` downloads
+# while waiting to write to the archive
+ARCHIVE_SPOOL_SIZE = 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+RESOURCE_CREATED = 'created'
+RESOURCE_UPDATED = 'updated'
+RESOURCE_SKIPPED = 'skipped'
+RESOURCE_FAILED = 'failed'
+
+# One line of the report returned by `TransifexAPI.ensure_resources`. `result`
+# is the server's reply for updates, or the exception for failures. The
+# responses of failed requests are discarded, their exceptions only keep a
+# summary
+ResourceReport = namedtuple('ResourceReport', 'slug path action result')
+
+
+def _close(response, consumed=True):
+    """
+    Release the connection of a streamed response. If the body wasn't read
+    to the end the connection is closed instead, so that the rest of the
+    body isn't read as the response to the next request. The responses of
+    older versions of requests can't be closed
+    """
+    if not consumed:
+        raw = getattr(response, 'raw', None)
+        if raw is not None:
+            raw.close()
+            # older versions of urllib3 only close the file of the response
+            # and would return the connection to the pool
+            connection = getattr(raw, '_connection', None)
+            if connection is not None:
+                connection.close()
+    close = getattr(response, 'close', None)
+    if close is not None:
+        close()
+
+
+def _upload_body(data, progress, name):
+    """
+    Encode the data of an upload, reporting its progress if asked to
+    """
+    body = json.dumps(data)
+    if progress is None:
+        return body
+    return ProgressReader(body, start_transfer(progress, name, len(body)))
+
 
 class TransifexAPI(object):
-    def __init__(self, username, password, host):
+    def __init__(self, username=None, password=None, host=None,
+                 circuit_breaker=None, translation_cache=None, transport=None,
+                 credentials=None, keep_error_responses=False):
         """
-        @param username the username to use when connecting
-        @param password the password to use when connecting
+        @param username (optional)
+            the username to use when connecting, required with `password`
+            unless `credentials` is given
+        @param password (optional)
+            the password to use when connecting
         @param host the host string
+        @param circuit_breaker (optional)
+            the `CircuitBreaker` guarding requests to the host, defaults to
+            a breaker with the default settings. Pass `False` to disable it
+        @param translation_cache (optional)
+            a `TranslationCache` which `get_translation` downloads through
+        @param transport (optional)
+            the `transifex.transports.Transport` which makes the requests,
+            defaults to a `RequestsTransport`
+        @param credentials (optional)
+            a `transifex.credentials.CredentialPool` to spread requests
+            across, instead of `username` and `password`
+        @param keep_error_responses (optional)
+            keep the whole response of failed requests in the
+            `TransifexAPIException`s raised, instead of only the start of
+            the body, defaults to `False`
+
+        @raises `ValueError`
+            if the host, or both the username and password and the
+            credential pool, are left out
         """
-        #TODO: make host optional
+        if host is None:
+            raise ValueError('host is required')
+        if credentials is None and (username is None or password is None):
+            raise ValueError('username and password, or credentials, are '
+                             'required')
         self._username = username
         self._password = password
         self._host = host
@@ -26,6 +115,122 @@ class TransifexAPI(object):
         self._auth = (self._username, self._password)
         self._base_api_url = '%s/api/2' % (self._host)
 
+        if circuit_breaker is None:
+            circuit_breaker = CircuitBreaker()
+        self.circuit_breaker = circuit_breaker or None
+        self.translation_cache = translation_cache
+        if transport is None:
+            transport = RequestsTransport()
+        self.transport = transport
+        self.credentials = credentials
+        self.keep_error_responses = keep_error_responses
+
+    @property
+    def circuit_state(self):
+        """
+        The state of the circuit breaker: 'closed', 'open' or 'half-open'.
+        Always 'closed' if the circuit breaker is disabled
+        """
+        if self.circuit_breaker is None:
+            return CircuitBreaker.CLOSED
+        return self.circuit_breaker.state
+
+    def _request(self, method, url, **kwargs):
+        """
+        Make a request to the transifex server through the circuit breaker
+
+        @param method
+            the lowercase HTTP method, eg 'get' or 'post'
+        @param url
+            the url to request
+
+        @returns the response
+
+        @raises `CircuitOpenException`
+            if the circuit breaker is open
+        @raises `CredentialsUnavailableException`
+            if no credential of the credential pool can be used
+        """
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return self._send(method, url, **kwargs)
+
+        if not breaker.allow_request():
+            raise CircuitOpenException(breaker.retry_after)
+        try:
+            response = self._send(method, url, **kwargs)
+        except self.transport.errors:
+            breaker.record_failure()
+            raise
+        except:
+            # the request didn't reach the server, so there is no outcome
+            breaker.cancel()
+            raise
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    def _error(self, response, endpoint, slugs, streamed=False):
+        """
+        The `TransifexAPIException` for a response with an unexpected status
+        code
+        """
+        return TransifexAPIException(
+            response, endpoint, slugs,
+            keep_response=self.keep_error_responses, streamed=streamed
+        )
+
+    def _upload(self, method, url, body, headers):
+        """
+        Make a request which uploads a body. If the progress of the upload
+        is reported it is finished even if the request fails before the
+        body is sent
+        """
+        try:
+            return self._request(method, url, data=body, headers=headers)
+        finally:
+            if isinstance(body, ProgressReader):
+                body.progress.finish()
+
+    def _send(self, method, url, **kwargs):
+        """
+        Make a request with the credentials. With a credential pool, a
+        request refused with 401 or 429 is retried with each of the other
+        credentials until one is accepted, after which the last refusal is
+        returned
+        """
+        transport = self.transport
+        pool = self.credentials
+        if pool is None:
+            return transport.request(method, url, auth=self._auth, **kwargs)
+
+        refused = []
+        while True:
+            try:
+                credential = pool.acquire(exclude=refused)
+            except CredentialsUnavailableException:
+                if not refused:
+                    raise
+                return response
+            try:
+                response = transport.request(
+                    method, url, auth=credential.auth, **kwargs
+                )
+            except:
+                pool.release(credential)
+                raise
+            pool.release(
+                credential, response.status_code,
+                response.headers.get('retry-after')
+            )
+            if response.status_code not in REFUSED_STATUS_CODES:
+                return response
+            refused.append(credential)
+            if hasattr(kwargs.get('data'), 'seek'):
+                kwargs['data'].seek(0)
+
     def new_project(self, slug, name=None, source_language_code=None,
                     outsource_project_name=None, private=False,
                     repository_url=None):
@@ -52,7 +257,7 @@ class TransifexAPI(object):
         @raises `TransifexAPIException`
            if project was not created properly
         """
-        if slug != slugify(slug):
+        if not is_valid_slug(slug):
             raise InvalidSlugException('%r is not a valid slug' % (slug))
         if name is None:
             name = slug
@@ -69,19 +274,24 @@ class TransifexAPI(object):
         if outsource_project_name is not None:
             data['outsource'] = outsource_project_name
 
-        response = requests.post(
-             url, data=json.dumps(data), auth=self._auth, headers=headers,
+        response = self._request(
+             'post', url, data=json.dumps(data), headers=headers,
         )
         
         if response.status_code != requests.codes['CREATED']:
-            raise TransifexAPIException(response)
+            raise self._error(response, 'new_project', {
+                'project': slug,
+            })
 
-    def list_resources(self, project_slug):
+    def list_resources(self, project_slug, models=False):
         """
         List all resources in a project
         
         @param project_slug
             the project slug
+        @param models (optional)
+            return `transifex.models.Resource` objects instead of
+            dictionaries, defaults to `False`
             
         @returns list of dictionaries with resources info
             each dictionary may contain
@@ -94,15 +304,19 @@ class TransifexAPI(object):
         @raises `TransifexAPIException`
         """
         url = '%s/project/%s/resources/' % (self._base_api_url, project_slug)
-        response = requests.get(url, auth=self._auth)
+        response = self._request('get', url)
         
         if response.status_code != requests.codes['OK']:
-            raise TransifexAPIException(response)
+            raise self._error(response, 'list_resources', {
+                'project': project_slug,
+            })
         
+        if models:
+            return parse_resources(response.content)
         return json.loads(response.content)
         
     def new_resource(self, project_slug, path_to_pofile, resource_slug=None,
-                     resource_name=None):
+                     resource_name=None, progress=None):
         """
         Creates a new resource with the specified slug from the given file.
         
@@ -114,7 +328,10 @@ class TransifexAPI(object):
             the resource slug, defaults to a sluggified version of the filename
         @param resource_name (optional)
             the resource name, defaults to the resource name
-            
+        @param progress (optional)
+            a `transifex.progress.ProgressTracker`, or a callback called
+            with the `TransferProgress` of the upload
+
         @return None
         
         @raises `TransifexAPIException`
@@ -127,7 +344,7 @@ class TransifexAPI(object):
         if resource_slug is None:
             resource_slug = slugify(filename)
         else:
-            if resource_slug != slugify(resource_slug):
+            if not is_valid_slug(resource_slug):
                 raise InvalidSlugException(
                     '%r is not a valid slug' % (resource_slug)
                 )
@@ -141,14 +358,17 @@ class TransifexAPI(object):
             'i18n_type': 'PO'
         }
 
-        response = requests.post(
-             url, data=json.dumps(data), auth=self._auth, headers=headers,
+        body = _upload_body(
+            data, progress, '%s/%s' % (project_slug, resource_slug)
         )
+        response = self._upload('post', url, body, headers)
         if response.status_code != requests.codes['CREATED']:
-            raise TransifexAPIException(response)
+            raise self._error(response, 'new_resource', {
+                'project': project_slug, 'resource': resource_slug,
+            })
         
     def update_source_translation(self, project_slug, resource_slug,
-                                  path_to_pofile):
+                                  path_to_pofile, progress=None):
         """
         Update the source translation for a give resource
         
@@ -158,6 +378,9 @@ class TransifexAPI(object):
             the resource slug
         @param path_to_pofile
             the path to the pofile which will be uploaded
+        @param progress (optional)
+            a `transifex.progress.ProgressTracker`, or a callback called
+            with the `TransferProgress` of the upload
 
         @return dictionary with info
             Info may include keys
@@ -174,15 +397,118 @@ class TransifexAPI(object):
         content = open(path_to_pofile, 'r').read()
         headers = {'content-type': 'application/json'}
         data = {'content': content}
-        response = requests.put(
-             url, data=json.dumps(data), auth=self._auth, headers=headers,
+        body = _upload_body(
+            data, progress, '%s/%s' % (project_slug, resource_slug)
         )
-        
+        response = self._upload('put', url, body, headers)
+
         if response.status_code != requests.codes['OK']:
-            raise TransifexAPIException(response)
+            raise self._error(
+                response, 'update_source_translation',
+                {'project': project_slug, 'resource': resource_slug}
+            )
         else:
             return json.loads(response.content)
+
+    def ensure_resources(self, project_slug, pofiles, update=True,
+                         workers=4, progress=None):
+        """
+        Make sure the project has a resource for each of the given pofiles.
+        The existing resources are listed once, missing resources are
+        created and existing ones have their source translation updated.
         
+        @param project_slug
+            the project slug
+        @param pofiles
+            either a dictionary mapping resource slugs to the paths of the
+            pofiles, or a list of paths. Resource slugs are derived from the
+            filenames for a list, the same way `new_resource` does
+        @param update (optional)
+            update the source translation of existing resources, defaults to
+            `True`. Existing resources are skipped otherwise
+        @param workers (optional)
+            the maximum number of requests made at the same time, defaults
+            to 4
+        @param progress (optional)
+            a `transifex.progress.ProgressTracker` for the uploads, or a
+            callback called with the `TransferProgress` of each upload
+
+        @returns list of `ResourceReport` tuples of
+            (slug, path, action, result) in the order of `pofiles`, sorted by
+            slug for a dictionary. `action` is one of `RESOURCE_CREATED`,
+            `RESOURCE_UPDATED`, `RESOURCE_SKIPPED` or `RESOURCE_FAILED`
+        
+        @raises `TransifexAPIException`
+            if the existing resources can't be listed
+        """
+        if isinstance(pofiles, dict):
+            pofiles = sorted(pofiles.items())
+        else:
+            pofiles = [
+                (slugify(os.path.split(path)[1]), path) for path in pofiles
+            ]
+
+        existing = set(
+            resource['slug'] for resource in self.list_resources(project_slug)
+        )
+        reports = []
+        tasks = []
+        seen = set()
+        for resource_slug, path in pofiles:
+            if not is_valid_slug(resource_slug):
+                error = InvalidSlugException(
+                    '%r is not a valid slug' % (resource_slug)
+                )
+            elif resource_slug in seen:
+                error = InvalidSlugException(
+                    '%r is used by more than one pofile' % (resource_slug)
+                )
+            else:
+                error = None
+            seen.add(resource_slug)
+
+            if error is not None:
+                reports.append(
+                    ResourceReport(resource_slug, path, RESOURCE_FAILED, error)
+                )
+            elif resource_slug not in existing:
+                reports.append(
+                    ResourceReport(resource_slug, path, RESOURCE_CREATED, None)
+                )
+                tasks.append(len(reports) - 1)
+            elif update:
+                reports.append(
+                    ResourceReport(resource_slug, path, RESOURCE_UPDATED, None)
+                )
+                tasks.append(len(reports) - 1)
+            else:
+                reports.append(
+                    ResourceReport(resource_slug, path, RESOURCE_SKIPPED, None)
+                )
+
+        def run(position):
+            report = reports[position]
+            if report.action == RESOURCE_CREATED:
+                return self.new_resource(
+                    project_slug, report.path, resource_slug=report.slug,
+                    progress=progress
+                )
+            return self.update_source_translation(
+                project_slug, report.slug, report.path, progress=progress
+            )
+
+        outcomes = map_concurrently(run, tasks, workers)
+        for position, (result, error) in zip(tasks, outcomes):
+            if isinstance(error, TransifexAPIException):
+                error.discard_response()
+            if error is not None:
+                reports[position] = reports[position]._replace(
+                    action=RESOURCE_FAILED, result=error
+                )
+            else:
+                reports[position] = reports[position]._replace(result=result)
+        return reports
+
     def delete_resource(self, project_slug, resource_slug):
         """
         Deletes the given resource
@@ -199,12 +525,14 @@ class TransifexAPI(object):
         url = '%s/project/%s/resource/%s/' % (
             self._base_api_url, project_slug, resource_slug
         )
-        response = requests.delete(url, auth=self._auth)
+        response = self._request('delete', url)
         if response.status_code != requests.codes['NO_CONTENT']:
-            raise TransifexAPIException(response)        
+            raise self._error(response, 'delete_resource', {
+                'project': project_slug, 'resource': resource_slug,
+            })
             
     def new_translation(self, project_slug, resource_slug, language_code,
-                        path_to_pofile):
+                        path_to_pofile, progress=None):
         """
         Creates or updates the translation for the specified language
         
@@ -216,7 +544,10 @@ class TransifexAPI(object):
             the language_code of the file
         @param path_to_pofile
             the path to the pofile which will be uploaded
-            
+        @param progress (optional)
+            a `transifex.progress.ProgressTracker`, or a callback called
+            with the `TransferProgress` of the upload
+
         @return dictionary with info
             Info may include keys
                 strings_added
@@ -232,17 +563,21 @@ class TransifexAPI(object):
         content = open(path_to_pofile, 'r').read()
         headers = {'content-type': 'application/json'}
         data = {'content': content}
-        response = requests.put(
-             url, data=json.dumps(data), auth=self._auth, headers=headers,
-        )
-        
+        body = _upload_body(data, progress, '%s/%s/%s' % (
+            project_slug, resource_slug, language_code
+        ))
+        response = self._upload('put', url, body, headers)
+
         if response.status_code != requests.codes['OK']:
-            raise TransifexAPIException(response)
+            raise self._error(response, 'new_translation', {
+                'project': project_slug, 'resource': resource_slug,
+                'language': language_code,
+            })
         else:
             return json.loads(response.content)
-            
+
     def get_translation(self, project_slug, resource_slug, language_code,
-                        path_to_pofile):
+                        path_to_pofile, progress=None):
         """
         Returns the requested translation, if it exists. The translation is
         returned as a serialized string, unless the GET parameter file is
@@ -257,7 +592,10 @@ class TransifexAPI(object):
             This should be the *Transifex* language code
         @param path_to_pofile
             The path to the pofile which will be saved
-            
+        @param progress (optional)
+            A `transifex.progress.ProgressTracker`, or a callback called
+            with the `TransferProgress` of the download
+
         @return None
             
         @raises `TransifexAPIException`
@@ -270,16 +608,202 @@ class TransifexAPI(object):
         query = {
             'file': ''         
         }
-        response = requests.get(url, auth=self._auth, params=query)
-        if response.status_code != requests.codes['OK']:
-            raise TransifexAPIException(response)
+        name = '%s/%s/%s' % (project_slug, resource_slug, language_code)
+        cache = self.translation_cache
+        if cache is not None:
+            return self._get_cached_translation(
+                cache, url, query, output_path,
+                (self._host, project_slug, resource_slug, language_code),
+                progress, name
+            )
+        if progress is None:
+            response = self._request('get', url, params=query)
         else:
+            response = self._request('get', url, params=query, stream=True)
+        consumed = False
+        try:
+            if response.status_code != requests.codes['OK']:
+                raise self._error(response, 'get_translation', {
+                    'project': project_slug, 'resource': resource_slug,
+                    'language': language_code,
+                }, streamed=progress is not None)
+            chunks = response.iter_content(DOWNLOAD_CHUNK_SIZE)
+            if progress is not None:
+                chunks = iter_progress(chunks, start_transfer(
+                    progress, name, content_length(response)
+                ))
             handle = open(output_path, 'w')
-            for line in response.iter_content():
-                handle.write(line)
+            for chunk in chunks:
+                handle.write(chunk)
             handle.close()
+            consumed = True
+        finally:
+            if progress is not None:
+                _close(response, consumed)
+
+    def _get_cached_translation(self, cache, url, query, output_path, key,
+                                progress=None, name=None):
+        """
+        Download a translation through the translation cache, only asking
+        the server for the file if it is missing or may have changed
+        """
+        entry = cache.lookup(key)
+        headers = {}
+        if entry is not None:
+            if cache.is_fresh(entry):
+                cache.retrieve(entry, output_path)
+                if progress is not None:
+                    start_transfer(progress, name, 0).finish()
+                return
+            headers = entry.conditional_headers()
+
+        kwargs = {}
+        if progress is not None:
+            kwargs['stream'] = True
+        response = self._request(
+            'get', url, params=query, headers=headers, **kwargs
+        )
+        consumed = False
+        try:
+            if entry is not None and \
+                    response.status_code == requests.codes['NOT_MODIFIED']:
+                cache.refresh(key, entry)
+                consumed = True
+                if progress is not None:
+                    start_transfer(progress, name, 0).finish()
+            elif response.status_code != requests.codes['OK']:
+                raise self._error(
+                    response, 'get_translation',
+                    dict(zip(('project', 'resource', 'language'), key[1:])),
+                    streamed=progress is not None
+                )
+            else:
+                chunks = response.iter_content(cache.CHUNK_SIZE)
+                if progress is not None:
+                    chunks = iter_progress(chunks, start_transfer(
+                        progress, name, content_length(response)
+                    ))
+                entry = cache.store(
+                    key, chunks, etag=response.headers.get('etag'),
+                    last_modified=response.headers.get('last-modified'),
+                )
+                consumed = True
+        finally:
+            if progress is not None:
+                _close(response, consumed)
+        cache.retrieve(entry, output_path)
+
+    def export_translations(self, project_slug, resource_slug, archive,
+                            archive_format='zip', languages=None, workers=4,
+                            name_template='%(resource)s/%(language)s.po',
+                            progress=None):
+        """
+        Download the translations of a resource into a single archive,
+        without temporary files. The translations are downloaded
+        concurrently, holding up to `ARCHIVE_SPOOL_SIZE` bytes of each in
+        memory until it can be written to the archive. The rest of bigger
+        translations is downloaded while they are written, one at a time.
+        
+        @param project_slug
+            The project slug
+        @param resource_slug
+            The resource slug
+        @param archive
+            The path or the file like object to write the archive to
+        @param archive_format (optional)
+            One of 'zip', 'tar', 'tar.gz' or 'tar.bz2', defaults to 'zip'
+        @param languages (optional)
+            The language codes to export, defaults to all the languages
+            returned by `list_languages`
+        @param workers (optional)
+            The maximum number of downloads at the same time, defaults to 4
+        @param name_template (optional)
+            The name of each translation within the archive. Formatted with
+            `project`, `resource` and `language`
+        @param progress (optional)
+            A `transifex.progress.ProgressTracker` for the downloads, or a
+            callback called with the `TransferProgress` of each download
+
+        @return list
+            The exported language codes
             
-    def list_languages(self, project_slug, resource_slug):
+        @raises `TransifexAPIException`
+            if any of the translations can't be downloaded, once the archive
+            has been written
+        @raises `IOError`
+        @raises `ValueError`
+            if the archive format is unknown, before anything is downloaded
+            or written
+        """
+        check_archive_format(archive_format)
+        if languages is None:
+            languages = self.list_languages(project_slug, resource_slug)
+
+        if isinstance(archive, basestring):
+            handle = open(archive, 'wb')
+        else:
+            handle = None
+        writer = open_archive(
+            handle if handle is not None else archive, archive_format
+        )
+        # only one download at a time writes to the archive
+        lock = threading.Lock()
+
+        def export(language_code):
+            url = '%s/project/%s/resource/%s/translation/%s/' % (
+                self._base_api_url, project_slug, resource_slug,
+                language_code
+            )
+            response = self._request(
+                'get', url, params={'file': ''}, stream=True
+            )
+            consumed = False
+            try:
+                if response.status_code != requests.codes['OK']:
+                    raise self._error(
+                        response, 'export_translations', {
+                            'project': project_slug,
+                            'resource': resource_slug,
+                            'language': language_code,
+                        }, streamed=True
+                    )
+                size = content_length(response)
+                name = name_template % {
+                    'project': project_slug, 'resource': resource_slug,
+                    'language': language_code,
+                }
+                chunks = response.iter_content(ARCHIVE_CHUNK_SIZE)
+                if progress is not None:
+                    chunks = iter_progress(chunks, start_transfer(
+                        progress, '%s/%s/%s' % (
+                            project_slug, resource_slug, language_code
+                        ), size
+                    ))
+                spooled = []
+                spooled_size = 0
+                for chunk in chunks:
+                    spooled.append(chunk)
+                    spooled_size += len(chunk)
+                    if spooled_size >= ARCHIVE_SPOOL_SIZE:
+                        break
+                with lock:
+                    writer.add(name, itertools.chain(spooled, chunks), size)
+                consumed = True
+            finally:
+                _close(response, consumed)
+
+        try:
+            outcomes = map_concurrently(export, languages, workers)
+        finally:
+            writer.close()
+            if handle is not None:
+                handle.close()
+        for __, error in outcomes:
+            if error is not None:
+                raise error
+        return list(languages)
+
+    def list_languages(self, project_slug, resource_slug, models=False):
         """
         List all the languages available for a given resource in a project
         
@@ -287,25 +811,75 @@ class TransifexAPI(object):
             The project slug
         @param resource_slug
             The resource slug
+        @param models (optional)
+            return `transifex.models.Language` objects instead of language
+            codes, defaults to `False`
             
         @returns list
             The language codes which this resource has translations 
            
+        @raises `TransifexAPIException`
+        """
+        content = self._get_resource_details(project_slug, resource_slug)
+        if models:
+            return list(parse_resource_details(content).languages or ())
+
+        content = json.loads(content)
+        languages = [
+            language['code'] for language in content['available_languages']
+        ]
+        return languages
+
+    def _get_resource_details(self, project_slug, resource_slug):
+        """
+        @returns the content of the details of a resource
+        
         @raises `TransifexAPIException`
         """
         url = '%s/project/%s/resource/%s/' % (
             self._base_api_url, project_slug, resource_slug
         )
-        response = requests.get(url, auth=self._auth, params={'details':''})
+        response = self._request('get', url, params={'details':''})
         
         if response.status_code != requests.codes['OK']:
-            raise TransifexAPIException(response)
+            raise self._error(response, 'list_languages', {
+                'project': project_slug, 'resource': resource_slug,
+            })
+        return response.content
+
+    def project_stats(self, project_slug, workers=4):
+        """
+        Get the resources of a project together with their details and
+        languages, eg to cache the metadata of a project
         
-        content = json.loads(response.content)
-        languages = [
-            language['code'] for language in content['available_languages']
-        ]
-        return languages
+        @param project_slug
+            The project slug
+        @param workers (optional)
+            the maximum number of requests made at the same time, defaults
+            to 4
+            
+        @returns `transifex.models.ProjectStats`
+           
+        @raises `TransifexAPIException`
+        """
+        resources = self.list_resources(project_slug, models=True)
+
+        def fetch(resource):
+            return parse_resource_details(
+                self._get_resource_details(project_slug, resource.slug)
+            )
+
+        for resource, (details, error) in zip(
+                resources, map_concurrently(fetch, resources, workers)):
+            if error is not None:
+                raise error
+            resource.wordcount = details.wordcount
+            resource.total_entities = details.total_entities
+            resource.last_update = details.last_update
+            resource.languages = details.languages
+            if resource.source_language_code is None:
+                resource.source_language_code = details.source_language_code
+        return ProjectStats(slug=project_slug, resources=tuple(resources))
 
     def project_exists(self, project_slug):
         """
@@ -322,19 +896,24 @@ class TransifexAPI(object):
         url = '%s/project/%s/' % (
             self._base_api_url, project_slug
         )
-        response = requests.get(url, auth=self._auth)
+        response = self._request('get', url)
         if response.status_code == requests.codes['OK']:
             return True
         elif response.status_code == requests.codes['NOT_FOUND']:
             return False
         else:
-            raise TransifexAPIException(response)
+            raise self._error(response, 'project_exists', {
+                'project': project_slug,
+            })
 
     def ping(self):
         """
         Check the connection to the server and the auth credentials
+
+        @raises `CircuitOpenException`
+            if the circuit breaker is open
         """
         url = '%s/projects/' % (self._base_api_url)
-        response = requests.get(url, auth=self._auth)
+        response = self._request('get', url)
         return response.status_code == requests.codes['OK']
         
\ No newline at end of file
@@ -0,0 +1,253 @@
+"""
+Writers which stream downloaded files into zip and tar archives
+"""
+import itertools
+import struct
+import tarfile
+import time
+import zipfile
+import zlib
+from io import BytesIO
+
+
+ARCHIVE_FORMATS = ('zip', 'tar', 'tar.gz', 'tar.bz2')
+
+# the zip structures written by `ZipArchiveWriter`, see the APPNOTE.TXT zip
+# file format specification
+_ZIP_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_ZIP_LOCAL_HEADER_SIGNATURE = 'PK\x03\x04'
+_ZIP_DATA_DESCRIPTOR = struct.Struct('<4sLLL')
+_ZIP_DATA_DESCRIPTOR_SIGNATURE = 'PK\x07\x08'
+_ZIP_CENTRAL_DIRECTORY = struct.Struct('<4s4B4HL2L5H2L')
+_ZIP_CENTRAL_DIRECTORY_SIGNATURE = 'PK\x01\x02'
+_ZIP_END_RECORD = struct.Struct('<4s4H2LH')
+_ZIP_END_RECORD_SIGNATURE = 'PK\x05\x06'
+# version 2.0, the first with deflate
+_ZIP_VERSION = 20
+_ZIP_SYSTEM_UNIX = 3
+# the general purpose flags of entries whose CRC and sizes follow their data
+# in a data descriptor, and of utf-8 names
+_ZIP_FLAG_DATA_DESCRIPTOR = 0x08
+_ZIP_FLAG_UTF8 = 0x800
+_ZIP_DEFLATED = 8
+_ZIP_MAX_ENTRIES = 0xffff
+
+
+class _ChunkReader(object):
+    """
+    File like object which reads from an iterable of byte strings
+    """
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._buffer = b''
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+        if size < 0:
+            size = len(self._buffer)
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+
+class _ZipEntry(object):
+    """
+    The central directory record of a file written into a zip archive
+    """
+    def __init__(self, name, flags, dos_time, dos_date, offset):
+        self.name = name
+        self.flags = flags
+        self.dos_time = dos_time
+        self.dos_date = dos_date
+        self.offset = offset
+        self.crc = 0
+        self.compress_size = 0
+        self.file_size = 0
+
+
+class ZipArchiveWriter(object):
+    """
+    Writes files into a zip archive. Each file is compressed and written as
+    its chunks arrive, with its CRC and sizes written after its data, so
+    only one chunk is held in memory at a time. The archive is written
+    sequentially, the file like object doesn't need to be seekable.
+
+    Archives are limited to `zipfile.ZIP64_LIMIT` bytes, without ZIP64
+    extensions. A file which doesn't fit is left out of the archive, which
+    is still readable.
+    """
+    def __init__(self, fileobj):
+        self._fileobj = fileobj
+        self._offset = 0
+        self._entries = []
+
+    def _write(self, data):
+        self._fileobj.write(data)
+        self._offset += len(data)
+
+    def _check_size(self, name, *sizes):
+        if max(sizes) > zipfile.ZIP64_LIMIT:
+            raise zipfile.LargeZipFile('%s is too big for a zip archive' % (
+                name
+            ))
+
+    def add(self, name, chunks, size=None):
+        """
+        Add a file to the archive
+
+        @param name
+            the name of the file within the archive
+        @param chunks
+            iterable of the byte strings of the file
+        @param size (optional)
+            the size of the file, if known
+
+        @raises `zipfile.LargeZipFile`
+            if the file doesn't fit in a zip archive without ZIP64
+            extensions, before any more of the archive is written
+        """
+        flags = _ZIP_FLAG_DATA_DESCRIPTOR
+        if isinstance(name, unicode):
+            name = name.encode('utf-8')
+            flags |= _ZIP_FLAG_UTF8
+        if len(self._entries) >= _ZIP_MAX_ENTRIES:
+            raise zipfile.LargeZipFile(
+                'too many files for a zip archive, adding %s' % (name)
+            )
+        year, month, day, hour, minute, second = time.localtime()[:6]
+        entry = _ZipEntry(
+            name, flags, hour << 11 | minute << 5 | second // 2,
+            (year - 1980) << 9 | month << 5 | day, self._offset
+        )
+        header = _ZIP_LOCAL_HEADER.pack(
+            _ZIP_LOCAL_HEADER_SIGNATURE, _ZIP_VERSION, 0, entry.flags,
+            _ZIP_DEFLATED, entry.dos_time, entry.dos_date, 0, 0, 0,
+            len(name), 0
+        )
+        # the space the entry takes up in the archive, once its data is
+        # written
+        overhead = len(header) + len(name) + _ZIP_DATA_DESCRIPTOR.size
+        self._check_size(name, self._offset + overhead)
+        self._write(header)
+        self._write(name)
+
+        compressor = zlib.compressobj(
+            zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, -15
+        )
+        crc = 0
+        for chunk in itertools.chain(chunks, [None]):
+            if chunk is None:
+                data = compressor.flush()
+            else:
+                crc = zlib.crc32(chunk, crc)
+                entry.file_size += len(chunk)
+                data = compressor.compress(chunk)
+            entry.compress_size += len(data)
+            self._check_size(
+                name, entry.file_size,
+                entry.offset + overhead + entry.compress_size
+            )
+            self._write(data)
+        entry.crc = crc & 0xffffffff
+        self._write(_ZIP_DATA_DESCRIPTOR.pack(
+            _ZIP_DATA_DESCRIPTOR_SIGNATURE, entry.crc, entry.compress_size,
+            entry.file_size
+        ))
+        self._entries.append(entry)
+
+    def close(self):
+        """
+        Write the central directory listing the files of the archive
+        """
+        start = self._offset
+        for entry in self._entries:
+            self._write(_ZIP_CENTRAL_DIRECTORY.pack(
+                _ZIP_CENTRAL_DIRECTORY_SIGNATURE, _ZIP_VERSION,
+                _ZIP_SYSTEM_UNIX, _ZIP_VERSION, 0, entry.flags,
+                _ZIP_DEFLATED, entry.dos_time, entry.dos_date, entry.crc,
+                entry.compress_size, entry.file_size, len(entry.name), 0, 0,
+                0, 0, 0o644 << 16, entry.offset
+            ))
+            self._write(entry.name)
+        self._write(_ZIP_END_RECORD.pack(
+            _ZIP_END_RECORD_SIGNATURE, 0, 0, len(self._entries),
+            len(self._entries), self._offset - start, start, 0
+        ))
+        self._fileobj.flush()
+
+
+class TarArchiveWriter(object):
+    """
+    Writes files into a tar archive. Files of a known size are streamed into
+    the archive, others are held in memory one at a time as the size of each
+    file is written before its content.
+    """
+    def __init__(self, fileobj, compression=''):
+        """
+        @param fileobj
+            the file like object to write the archive to, it doesn't need to
+            be seekable
+        @param compression (optional)
+            '', 'gz' or 'bz2'
+        """
+        self._tar = tarfile.open(fileobj=fileobj, mode='w|%s' % compression)
+
+    def add(self, name, chunks, size=None):
+        """
+        Add a file to the archive
+
+        @param name
+            the name of the file within the archive
+        @param chunks
+            iterable of the byte strings of the file
+        @param size (optional)
+            the size of the file, if known
+        """
+        info = tarfile.TarInfo(name)
+        info.mtime = time.time()
+        info.mode = 0o644
+        if size is None:
+            data = b''.join(chunks)
+            info.size = len(data)
+            self._tar.addfile(info, BytesIO(data))
+        else:
+            info.size = size
+            self._tar.addfile(info, _ChunkReader(chunks))
+
+    def close(self):
+        self._tar.close()
+
+
+def check_archive_format(archive_format):
+    """
+    @param archive_format
+        the archive format to check
+
+    @raises `ValueError`
+        unless the archive format is one of `ARCHIVE_FORMATS`
+    """
+    if archive_format not in ARCHIVE_FORMATS:
+        raise ValueError('Unknown archive format %r' % (archive_format))
+
+
+def open_archive(fileobj, archive_format='zip'):
+    """
+    @param fileobj
+        the file like object to write the archive to
+    @param archive_format (optional)
+        one of `ARCHIVE_FORMATS`, defaults to 'zip'
+
+    @returns an archive writer with `add` and `close` methods
+
+    @raises `ValueError`
+        if the archive format is unknown
+    """
+    check_archive_format(archive_format)
+    if archive_format == 'zip':
+        return ZipArchiveWriter(fileobj)
+    if archive_format == 'tar':
+        return TarArchiveWriter(fileobj)
+    return TarArchiveWriter(fileobj, archive_format[4:])
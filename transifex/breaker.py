@@ -0,0 +1,164 @@
+"""
+Circuit breaker used by `TransifexAPI` to fail fast when the Transifex host is
+degraded
+"""
+import threading
+import time
+from collections import deque
+
+
+class CircuitBreaker(object):
+    """
+    Tracks the outcome of recent requests and stops new requests from being
+    made while the failure rate is too high.
+
+    The breaker starts `closed`. Once at least `minimum_calls` outcomes have
+    been recorded and the share of failures in the last `window_size`
+    outcomes reaches `failure_rate`, the breaker `open`s and refuses every
+    request. After `reset_timeout` seconds it becomes `half-open` and lets up
+    to `half_open_calls` probe requests through. If all of the probes succeed
+    the breaker closes again, if any of them fails it re-opens.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_rate=0.5, minimum_calls=10, window_size=20,
+                 reset_timeout=30, half_open_calls=1, clock=time.time):
+        """
+        @param failure_rate (optional)
+            the share of failed requests (0 to 1) which opens the breaker,
+            defaults to 0.5
+        @param minimum_calls (optional)
+            the number of outcomes which must be recorded before the failure
+            rate is considered, defaults to 10
+        @param window_size (optional)
+            the number of most recent outcomes the failure rate is calculated
+            from, defaults to 20
+        @param reset_timeout (optional)
+            the number of seconds the breaker stays open before letting
+            probe requests through, defaults to 30
+        @param half_open_calls (optional)
+            the number of probe requests allowed while half-open, defaults
+            to 1
+        @param clock (optional)
+            callable returning the current time in seconds
+        """
+        if not 0 < failure_rate <= 1:
+            raise ValueError('failure_rate must be between 0 and 1')
+        if minimum_calls > window_size:
+            raise ValueError('minimum_calls must not exceed window_size')
+        self.failure_rate = failure_rate
+        self.minimum_calls = minimum_calls
+        self.reset_timeout = reset_timeout
+        self.half_open_calls = half_open_calls
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._outcomes = deque(maxlen=window_size)
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._probes_started = 0
+        self._probes_succeeded = 0
+
+    @property
+    def state(self):
+        """
+        The current state: `CLOSED`, `OPEN` or `HALF_OPEN`
+        """
+        with self._lock:
+            self._update_state()
+            return self._state
+
+    @property
+    def retry_after(self):
+        """
+        The number of seconds until the breaker lets probe requests through,
+        0 unless the breaker is open
+        """
+        with self._lock:
+            self._update_state()
+            if self._state != self.OPEN:
+                return 0
+            return max(0, self._opened_at + self.reset_timeout - self._clock())
+
+    def allow_request(self):
+        """
+        Check if a request may be made now. A request which is allowed must
+        be followed by a call to `record_success`, `record_failure` or, if
+        it was never completed, `cancel`.
+
+        @return Boolean
+        """
+        with self._lock:
+            self._update_state()
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and \
+                    self._probes_started < self.half_open_calls:
+                self._probes_started += 1
+                return True
+            return False
+
+    def record_success(self):
+        """
+        Record a request which completed successfully
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._probes_succeeded += 1
+                if self._probes_succeeded >= self.half_open_calls:
+                    self._close()
+            else:
+                self._outcomes.append(True)
+
+    def record_failure(self):
+        """
+        Record a request which failed because of the server or the network
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._open()
+                return
+            self._outcomes.append(False)
+            if self._state == self.CLOSED and self._failure_threshold_hit():
+                self._open()
+
+    def cancel(self):
+        """
+        Record an allowed request which ended without an outcome, eg because
+        it was interrupted before it was sent. While half-open this frees its
+        probe slot for another request
+        """
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes_started > 0:
+                self._probes_started -= 1
+
+    def reset(self):
+        """
+        Close the breaker and forget all recorded outcomes
+        """
+        with self._lock:
+            self._close()
+
+    def _failure_threshold_hit(self):
+        if len(self._outcomes) < self.minimum_calls:
+            return False
+        # deque.count is new in Python 2.7
+        failures = len([outcome for outcome in self._outcomes if not outcome])
+        return failures >= self.failure_rate * len(self._outcomes)
+
+    def _update_state(self):
+        if self._state == self.OPEN and \
+                self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._probes_started = 0
+            self._probes_succeeded = 0
+
+    def _open(self):
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+
+    def _close(self):
+        self._state = self.CLOSED
+        self._opened_at = None
+        self._outcomes.clear()
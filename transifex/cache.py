@@ -0,0 +1,294 @@
+"""
+On-disk cache of downloaded translations, shared between processes
+"""
+import hashlib
+import json
+import os
+import shutil
+import stat
+import time
+import uuid
+from transifex.util import makedirs, replace_file
+
+
+class CacheEntry(object):
+    """
+    A cached download: the digest of the stored file and the validators the
+    server sent with it
+    """
+    def __init__(self, digest, size, stored_at, etag=None,
+                 last_modified=None):
+        self.digest = digest
+        self.size = size
+        self.stored_at = stored_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def conditional_headers(self):
+        """
+        The headers which ask the server to only send the translation if it
+        has changed since this entry was stored
+
+        @returns dictionary of headers
+        """
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+    def to_dict(self):
+        return {
+            'digest': self.digest, 'size': self.size,
+            'stored_at': self.stored_at, 'etag': self.etag,
+            'last_modified': self.last_modified,
+        }
+
+
+class TranslationCache(object):
+    """
+    A content addressed store of downloaded translation files.
+
+    Files are stored once per content hash under `objects/`, and each
+    (host, project, resource, language) key points at the file last
+    downloaded for it, together with the server's ETag and Last-Modified
+    validators. All writes go through a rename so several processes on the
+    same host can share one cache directory.
+    """
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, directory, max_size=None, max_age=None, ttl=None,
+                 link=False):
+        """
+        @param directory
+            the directory to store the cache in, created if missing
+        @param max_size (optional)
+            the maximum total size of the stored files in bytes, the least
+            recently used files are evicted beyond it
+        @param max_age (optional)
+            the number of seconds after which an unused file is evicted
+        @param ttl (optional)
+            the number of seconds a download is used without asking the
+            server if it has changed. By default the server is always asked
+        @param link (optional)
+            hard link cached files into place instead of copying them,
+            defaults to `False`. Linked files are read-only and share their
+            content with the cache, so they must never be written to. The
+            content of a linked file is checked before it is used again
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.max_age = max_age
+        self.ttl = ttl
+        self.link = link
+        self._objects_dir = os.path.join(directory, 'objects')
+        self._entries_dir = os.path.join(directory, 'entries')
+        self._tmp_dir = os.path.join(directory, 'tmp')
+        for path in (self._objects_dir, self._entries_dir, self._tmp_dir):
+            makedirs(path)
+
+    def lookup(self, key):
+        """
+        Find the entry stored for a key
+
+        @param key
+            a tuple of strings identifying the download
+
+        @returns `CacheEntry` or None
+        """
+        try:
+            handle = open(self._entry_path(key), 'r')
+        except IOError:
+            return None
+        try:
+            data = json.load(handle)
+        except ValueError:
+            return None
+        finally:
+            handle.close()
+        entry = CacheEntry(**dict(
+            (str(name), value) for name, value in data.items()
+        ))
+        object_path = self._object_path(entry.digest)
+        try:
+            size = os.path.getsize(object_path)
+        except OSError:
+            return None
+        if size != entry.size or \
+                self.link and _digest(object_path) != entry.digest:
+            # the file was changed through a link to it
+            try:
+                os.remove(object_path)
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def is_fresh(self, entry):
+        """
+        Check if an entry can be used without asking the server
+
+        @returns Boolean
+        """
+        if self.ttl is None:
+            return False
+        return time.time() - entry.stored_at < self.ttl
+
+    def store(self, key, chunks, etag=None, last_modified=None):
+        """
+        Store a download
+
+        @param key
+            a tuple of strings identifying the download
+        @param chunks
+            iterable of the downloaded byte strings
+        @param etag (optional)
+            the ETag header sent by the server
+        @param last_modified (optional)
+            the Last-Modified header sent by the server
+
+        @returns `CacheEntry`
+        """
+        tmp_path = os.path.join(self._tmp_dir, uuid.uuid4().hex)
+        sha = hashlib.sha1()
+        size = 0
+        handle = open(tmp_path, 'wb')
+        try:
+            for chunk in chunks:
+                if not chunk:
+                    continue
+                sha.update(chunk)
+                size += len(chunk)
+                handle.write(chunk)
+        except:
+            handle.close()
+            os.remove(tmp_path)
+            raise
+        handle.close()
+
+        digest = sha.hexdigest()
+        object_path = self._object_path(digest)
+        if os.path.exists(object_path):
+            os.remove(tmp_path)
+            # the stored file was just used again, so it isn't evicted as old
+            try:
+                os.utime(object_path, None)
+            except OSError:
+                pass
+        else:
+            makedirs(os.path.dirname(object_path))
+            os.chmod(tmp_path, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+            replace_file(tmp_path, object_path)
+
+        entry = CacheEntry(digest, size, time.time(), etag, last_modified)
+        self._write_entry(key, entry)
+        if self.max_size is not None or self.max_age is not None:
+            self.prune(keep=(digest,))
+        return entry
+
+    def refresh(self, key, entry):
+        """
+        Mark an entry as confirmed unchanged by the server
+        """
+        entry.stored_at = time.time()
+        self._write_entry(key, entry)
+
+    def retrieve(self, entry, path):
+        """
+        Place the file of an entry at the given path, replacing any existing
+        file
+
+        @raises `IOError`
+        """
+        object_path = self._object_path(entry.digest)
+        try:
+            os.utime(object_path, None)
+        except OSError:
+            pass
+        tmp_path = '%s.%s.tmp' % (path, uuid.uuid4().hex)
+        linked = False
+        if self.link and hasattr(os, 'link'):
+            try:
+                os.link(object_path, tmp_path)
+                linked = True
+            except OSError:
+                pass
+        if not linked:
+            shutil.copyfile(object_path, tmp_path)
+        replace_file(tmp_path, path)
+
+    def prune(self, keep=()):
+        """
+        Evict the files which are older than `max_age` and the least
+        recently used files while the cache is bigger than `max_size`
+
+        @param keep (optional)
+            the digests of files which are never evicted, eg because they
+            are about to be retrieved
+
+        @returns the number of evicted files
+        """
+        kept = set(self._object_path(digest) for digest in keep)
+        objects = []
+        for dirpath, dirnames, filenames in os.walk(self._objects_dir):
+            for filename in filenames:
+                path = os.path.join(dirpath, filename)
+                if path in kept:
+                    continue
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                objects.append((max(st.st_mtime, st.st_atime), st.st_size,
+                                path))
+        objects.sort()
+
+        now = time.time()
+        total = sum(size for __, size, __ in objects)
+        evicted = 0
+        for used_at, size, path in objects:
+            expired = self.max_age is not None and \
+                now - used_at > self.max_age
+            oversized = self.max_size is not None and total > self.max_size
+            if not (expired or oversized):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            evicted += 1
+        return evicted
+
+    def _write_entry(self, key, entry):
+        tmp_path = os.path.join(self._tmp_dir, uuid.uuid4().hex)
+        handle = open(tmp_path, 'w')
+        try:
+            json.dump(entry.to_dict(), handle)
+        finally:
+            handle.close()
+        replace_file(tmp_path, self._entry_path(key))
+
+    def _entry_path(self, key):
+        name = hashlib.sha1(
+            u'\0'.join(key).encode('utf-8')
+        ).hexdigest()
+        return os.path.join(self._entries_dir, name)
+
+    def _object_path(self, digest):
+        return os.path.join(self._objects_dir, digest[:2], digest[2:])
+
+
+def _digest(path):
+    sha = hashlib.sha1()
+    handle = open(path, 'rb')
+    try:
+        while True:
+            chunk = handle.read(TranslationCache.CHUNK_SIZE)
+            if not chunk:
+                break
+            sha.update(chunk)
+    finally:
+        handle.close()
+    return sha.hexdigest()
@@ -0,0 +1,208 @@
+"""
+A pool of credentials used by `TransifexAPI` to spread requests across
+several accounts, each with its own rate budget
+"""
+import math
+import threading
+import time
+from transifex.exceptions import CredentialsUnavailableException
+
+
+LEAST_LOADED = 'least-loaded'
+ROUND_ROBIN = 'round-robin'
+
+# status codes which take a credential out of the pool
+REFUSED_STATUS_CODES = (401, 429)
+
+
+def _parse_retry_after(value):
+    try:
+        return max(float(value), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+class Credential(object):
+    """
+    A username and password, with a token bucket limiting the rate of the
+    requests made with them
+    """
+    def __init__(self, username, password, rate=None, burst=None):
+        """
+        @param username
+            the username
+        @param password
+            the password
+        @param rate (optional)
+            the number of requests per second the account may make, unlimited
+            by default
+        @param burst (optional)
+            the number of requests which may be made at once after the
+            account has been idle, defaults to one second's worth of `rate`
+        """
+        if burst is None:
+            burst = max(int(math.ceil(rate or 1)), 1)
+        self.username = username
+        self.password = password
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.in_flight = 0
+        self.requests = 0
+        self.disabled_until = None
+        self._updated_at = None
+
+    @property
+    def auth(self):
+        return (self.username, self.password)
+
+    def __repr__(self):
+        return '<Credential %s>' % (self.username)
+
+    def _refill(self, now):
+        if self.rate is not None and self._updated_at is not None:
+            self.tokens = min(
+                self.burst,
+                self.tokens + (now - self._updated_at) * self.rate
+            )
+        self._updated_at = now
+        if self.disabled_until is not None and now >= self.disabled_until:
+            self.disabled_until = None
+
+    def _wait_time(self):
+        if self.rate is None or self.tokens >= 1:
+            return 0
+        return (1 - self.tokens) / self.rate
+
+
+class CredentialPool(object):
+    """
+    Hands out the credentials of several accounts so that their combined
+    rate budget can be used.
+
+    Each request takes a credential with `acquire` and hands it back with
+    `release`. Credentials with budget left are picked either `least-loaded`
+    (fewest requests in flight, then most budget left) or `round-robin`. A
+    credential which is answered with 401 or 429 is taken out of the pool
+    for the number of seconds in the Retry-After header, or `cooldown`
+    seconds.
+    """
+    def __init__(self, credentials, strategy=LEAST_LOADED, cooldown=60,
+                 clock=time.time):
+        """
+        @param credentials
+            list of `Credential`s or (username, password) tuples
+        @param strategy (optional)
+            'least-loaded' or 'round-robin', defaults to 'least-loaded'
+        @param cooldown (optional)
+            the number of seconds a refused credential is left out of the
+            pool for when the server doesn't say, defaults to 60
+        @param clock (optional)
+            callable returning the current time in seconds
+        """
+        self.credentials = [
+            c if isinstance(c, Credential) else Credential(*c)
+            for c in credentials
+        ]
+        if not self.credentials:
+            raise ValueError('At least one credential is required')
+        if strategy not in (LEAST_LOADED, ROUND_ROBIN):
+            raise ValueError('Unknown strategy %r' % (strategy))
+        self.strategy = strategy
+        self.cooldown = cooldown
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._next = 0
+
+    def __len__(self):
+        return len(self.credentials)
+
+    def __iter__(self):
+        return iter(self.credentials)
+
+    def acquire(self, exclude=(), block=True):
+        """
+        Take a credential to make a request with
+
+        @param exclude (optional)
+            credentials not to use, eg the ones already refused for this
+            request
+        @param block (optional)
+            wait until a credential has budget left, defaults to `True`
+
+        @returns `Credential`, which must be handed back with `release`
+
+        @raises `CredentialsUnavailableException`
+            if every credential which isn't excluded is out of the pool, or
+            none has budget left and `block` is `False`
+        """
+        with self._condition:
+            while True:
+                now = self._clock()
+                ready = []
+                waits = []
+                recoveries = []
+                for credential in self.credentials:
+                    if credential in exclude:
+                        continue
+                    credential._refill(now)
+                    if credential.disabled_until is not None:
+                        recoveries.append(credential.disabled_until - now)
+                        continue
+                    wait = credential._wait_time()
+                    if wait:
+                        waits.append(wait)
+                    else:
+                        ready.append(credential)
+
+                if ready:
+                    credential = self._choose(ready)
+                    if credential.rate is not None:
+                        credential.tokens -= 1
+                    credential.in_flight += 1
+                    credential.requests += 1
+                    return credential
+                if not waits:
+                    raise CredentialsUnavailableException(
+                        min(recoveries) if recoveries else None
+                    )
+                if not block:
+                    raise CredentialsUnavailableException(min(waits))
+                self._condition.wait(min(waits))
+
+    def release(self, credential, status_code=None, retry_after=None):
+        """
+        Hand back a credential taken with `acquire`
+
+        @param credential
+            the `Credential`
+        @param status_code (optional)
+            the status code the server answered with, a 401 or 429 takes the
+            credential out of the pool
+        @param retry_after (optional)
+            the Retry-After header of the response
+        """
+        with self._condition:
+            credential.in_flight -= 1
+            if status_code in REFUSED_STATUS_CODES:
+                seconds = _parse_retry_after(retry_after)
+                if seconds is None:
+                    seconds = self.cooldown
+                credential.disabled_until = self._clock() + seconds
+            self._condition.notify_all()
+
+    def _choose(self, ready):
+        if self.strategy == ROUND_ROBIN:
+            count = len(self.credentials)
+            for offset in range(count):
+                index = (self._next + offset) % count
+                if self.credentials[index] in ready:
+                    self._next = index + 1
+                    return self.credentials[index]
+
+        def load(credential):
+            budget = 1.0
+            if credential.rate is not None:
+                budget = credential.tokens / credential.burst
+            return (credential.in_flight, -budget, credential.requests)
+        return min(ready, key=load)
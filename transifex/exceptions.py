@@ -1,17 +1,142 @@
+from transifex.util import content_length
+
+
 class TransifexException(Exception):
     pass
 
+def _read_start(response, size):
+    """
+    Read up to `size` characters of the body of a response, leaving the rest
+    of a streamed body unread
+    """
+    chunks = []
+    read = 0
+    for chunk in response.iter_content(size):
+        chunks.append(chunk)
+        read += len(chunk)
+        if read >= size:
+            break
+    return ''.join(chunks)
+
+# the number of characters of a response body kept by TransifexAPIException
+MAX_ERROR_BODY = 1024
+
 class TransifexAPIException(TransifexException):
-    def __init__(self, response=None):
-        super(TransifexAPIException, self).__init__(response)
-        self.response = response
+    """
+    Raised when the server answers with an unexpected status code.
 
-    def __str__(self):
+    The exception keeps a summary of the failure: the `status_code`, the
+    first `max_body` characters of the response `body` and its `body_size`,
+    the `endpoint` (the `TransifexAPI` method) and the `slugs` of the
+    request. The response, and so its `full_body`, is only kept if asked
+    for, until `discard_response` is called.
+    """
+    def __init__(self, response=None, endpoint=None, slugs=None,
+                 max_body=MAX_ERROR_BODY, keep_response=False,
+                 streamed=False):
+        """
+        @param response (optional)
+            the response of the failed request
+        @param endpoint (optional)
+            the name of the `TransifexAPI` method which made the request
+        @param slugs (optional)
+            dictionary of the slugs and codes of the request
+        @param max_body (optional)
+            the number of characters of the body kept in `body`
+        @param keep_response (optional)
+            keep the response, and so its whole body, defaults to `False`
+        @param streamed (optional)
+            the body of the response hasn't been read yet. Only its start
+            is read, and `body_size` is taken from the Content-Length
+            header, None if the server didn't send it
+        """
+        # the response isn't passed on, so that it isn't kept in `args`
+        super(TransifexAPIException, self).__init__()
+        self.response = response if keep_response else None
+        self.endpoint = endpoint
+        self.slugs = dict(slugs or {})
+        self.status_code = None
+        self.body = None
+        self.body_size = None
+        self.truncated = False
+        if response is None:
+            return
+        self.status_code = response.status_code
+        if streamed and not keep_response:
+            content = _read_start(response, max_body + 1)
+            size = len(content)
+            if size > max_body:
+                size = content_length(response)
+        else:
+            content = response.content
+            if content is None:
+                return
+            if not isinstance(content, basestring):
+                content = '%s' % (content,)
+            size = len(content)
+        self.body = content[:max_body]
+        self.body_size = size
+        self.truncated = len(content) > max_body
+
+    @property
+    def full_body(self):
+        """
+        The whole response body, or None once the response was discarded
+        """
         if self.response is None:
+            return None
+        return self.response.content
+
+    def discard_response(self):
+        """
+        Drop the response, keeping only the summary of the failure
+        """
+        self.response = None
+
+    def __str__(self):
+        if self.status_code is None:
             return super(TransifexAPIException, self).__str__()
-        return '%s: %s' % (
-            self.response.status_code, self.response.content
-            )
+        message = '%s: %s' % (self.status_code, self.body)
+        if self.truncated:
+            message = '%s...' % (message)
+            if self.body_size is not None:
+                message = '%s (%d characters)' % (message, self.body_size)
+        if self.endpoint is not None:
+            message = '%s(%s) %s' % (self.endpoint, ', '.join(
+                '%s=%s' % (name, self.slugs[name])
+                for name in sorted(self.slugs)
+            ), message)
+        return message
 
 class InvalidSlugException(TransifexException):
-    pass
\ No newline at end of file
+    pass
+
+class CircuitOpenException(TransifexException):
+    """
+    Raised instead of making a request while the circuit breaker is open
+    """
+    def __init__(self, retry_after=None):
+        super(CircuitOpenException, self).__init__(retry_after)
+        self.retry_after = retry_after
+
+    def __str__(self):
+        if self.retry_after is None:
+            return 'Circuit breaker is open'
+        return 'Circuit breaker is open, retry in %.1f seconds' % (
+            self.retry_after
+        )
+
+class CredentialsUnavailableException(TransifexException):
+    """
+    Raised when no credential of a `CredentialPool` can be used
+    """
+    def __init__(self, retry_after=None):
+        super(CredentialsUnavailableException, self).__init__(retry_after)
+        self.retry_after = retry_after
+
+    def __str__(self):
+        if self.retry_after is None:
+            return 'No credentials available'
+        return 'No credentials available, retry in %.1f seconds' % (
+            self.retry_after
+        )
@@ -0,0 +1,323 @@
+"""
+An in-memory fake of the parts of the Transifex API used by `TransifexAPI`,
+for tests and benchmarks which shouldn't touch the network
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+import urlparse
+
+
+_routes = [
+    ('projects', re.compile(r'^projects/$')),
+    ('project', re.compile(r'^project/(?P<project>[^/]+)/$')),
+    ('resources', re.compile(r'^project/(?P<project>[^/]+)/resources/$')),
+    ('resource', re.compile(
+        r'^project/(?P<project>[^/]+)/resource/(?P<resource>[^/]+)/$'
+    )),
+    ('content', re.compile(
+        r'^project/(?P<project>[^/]+)/resource/(?P<resource>[^/]+)/content/$'
+    )),
+    ('translation', re.compile(
+        r'^project/(?P<project>[^/]+)/resource/(?P<resource>[^/]+)/'
+        r'translation/(?P<language>[^/]+)/$'
+    )),
+]
+
+
+def _count_strings(content):
+    # the first msgid of a pofile is the header
+    strings = len(re.findall(r'^msgid ', content or '', re.MULTILINE))
+    return max(strings - 1, 0)
+
+
+def _etag(content):
+    return '"%s"' % hashlib.sha1(content).hexdigest()
+
+
+class FakeTransifex(object):
+    """
+    The state of a fake Transifex server: its projects, their resources and
+    the translations of each resource. `handle` answers a request the way
+    the Transifex API would.
+    """
+    def __init__(self, credentials=None):
+        """
+        @param credentials (optional)
+            list of (username, password) tuples which are accepted. By
+            default any credentials are accepted
+        """
+        self.credentials = None
+        if credentials is not None:
+            self.credentials = set(tuple(c) for c in credentials)
+        self.projects = {}
+        self.requests = []
+        self._failures = []
+        self._lock = threading.Lock()
+
+    def fail(self, status_code=503, times=1, retry_after=None):
+        """
+        Answer the next requests with an error instead of handling them
+
+        @param status_code (optional)
+            the status code to answer with, defaults to 503
+        @param times (optional)
+            the number of requests to fail, defaults to 1
+        @param retry_after (optional)
+            the value of the Retry-After header of the errors
+        """
+        headers = {}
+        if retry_after is not None:
+            headers['retry-after'] = str(retry_after)
+        with self._lock:
+            self._failures.extend([(status_code, headers)] * times)
+
+    def add_project(self, slug, source_language_code='en', **kwargs):
+        """
+        Create a project directly in the server state
+        """
+        with self._lock:
+            project = {
+                'slug': slug, 'name': slug,
+                'source_language_code': source_language_code,
+                'resources': {},
+            }
+            project.update(kwargs)
+            self.projects[slug] = project
+            return project
+
+    def add_resource(self, project_slug, slug, content='', translations=None,
+                     **kwargs):
+        """
+        Create a resource directly in the server state
+
+        @param translations (optional)
+            dictionary mapping language codes to the translation content
+        """
+        with self._lock:
+            project = self.projects[project_slug]
+            resource = self._new_resource(project, slug, slug, content)
+            resource.update(kwargs)
+            resource['translations'].update(translations or {})
+            return resource
+
+    def handle(self, method, url, auth=None, params=None, data=None,
+               headers=None):
+        """
+        Answer a request
+
+        @param method
+            the uppercase HTTP method
+        @param url
+            the full url of the request
+        @param auth (optional)
+            tuple of (username, password)
+        @param params (optional)
+            dictionary of query parameters
+        @param data (optional)
+            the request body
+        @param headers (optional)
+            dictionary of request headers with lowercase names
+
+        @returns tuple of (status code, headers, content). The content is
+            either a string or a value to encode as JSON
+        """
+        params = params or {}
+        headers = headers or {}
+        with self._lock:
+            self.requests.append((method, url))
+            if self._failures:
+                status_code, error_headers = self._failures.pop(0)
+                return status_code, dict(error_headers), 'Service Unavailable'
+            if self.credentials is not None and \
+                    tuple(auth or ()) not in self.credentials:
+                return 401, {}, 'Authorization Required'
+
+            path = urlparse.urlparse(url).path
+            path = path[path.find('/api/2/') + len('/api/2/'):]
+            for name, pattern in _routes:
+                match = pattern.match(path)
+                if match is None:
+                    continue
+                handler = getattr(
+                    self, '_%s_%s' % (name, method.lower()), None
+                )
+                if handler is None:
+                    return 405, {}, 'Method Not Allowed'
+                body = None
+                if data:
+                    try:
+                        body = json.loads(data)
+                    except ValueError:
+                        return 400, {}, 'Invalid JSON'
+                return handler(
+                    body=body, params=params, headers=headers,
+                    **match.groupdict()
+                )
+            return 404, {}, 'Not Found'
+
+    def _new_resource(self, project, slug, name, content,
+                      i18n_type='PO'):
+        resource = {
+            'slug': slug, 'name': name, 'i18n_type': i18n_type,
+            'source_language_code': project['source_language_code'],
+            'categories': None, 'priority': '0', 'content': content,
+            'translations': {},
+            'last_update': time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        project['resources'][slug] = resource
+        return resource
+
+    def _get(self, project, resource=None):
+        project = self.projects.get(project)
+        if project is None or resource is None:
+            return project, None
+        return project, project['resources'].get(resource)
+
+    def _projects_get(self, **kwargs):
+        return 200, {}, [
+            {'slug': p['slug'], 'name': p['name']}
+            for p in sorted(self.projects.values(), key=lambda p: p['slug'])
+        ]
+
+    def _projects_post(self, body, **kwargs):
+        body = body or {}
+        for key in ('slug', 'name', 'source_language_code'):
+            if not body.get(key):
+                return 400, {}, '%r is required' % key
+        if not body.get('private') and not body.get('repository_url'):
+            return 400, {}, 'repository_url is required for public ' \
+                            'repositories'
+        if body['slug'] in self.projects:
+            return 400, {}, 'Project with this Slug already exists.'
+        self.projects[body['slug']] = {
+            'slug': body['slug'], 'name': body['name'],
+            'source_language_code': body['source_language_code'],
+            'private': body.get('private', False),
+            'resources': {},
+        }
+        return 201, {}, 'Created'
+
+    def _project_get(self, project, **kwargs):
+        project, __ = self._get(project)
+        if project is None:
+            return 404, {}, 'Not Found'
+        return 200, {}, {
+            'slug': project['slug'], 'name': project['name'],
+            'source_language_code': project['source_language_code'],
+        }
+
+    def _resources_get(self, project, **kwargs):
+        project, __ = self._get(project)
+        if project is None:
+            return 404, {}, 'Not Found'
+        keys = ('slug', 'name', 'i18n_type', 'source_language_code',
+                'categories', 'priority')
+        return 200, {}, [
+            dict((key, resource[key]) for key in keys)
+            for __, resource in sorted(project['resources'].items())
+        ]
+
+    def _resources_post(self, project, body, **kwargs):
+        project, __ = self._get(project)
+        if project is None:
+            return 404, {}, 'Not Found'
+        body = body or {}
+        for key in ('slug', 'name', 'content', 'i18n_type'):
+            if key not in body:
+                return 400, {}, '%r is required' % key
+        if body['slug'] in project['resources']:
+            return 400, {}, 'Resource with this Slug already exists.'
+        self._new_resource(
+            project, body['slug'], body['name'], body['content'],
+            body['i18n_type']
+        )
+        return 201, {}, [_count_strings(body['content']), 0, 0]
+
+    def _resource_get(self, project, resource, params, **kwargs):
+        project, resource = self._get(project, resource)
+        if resource is None:
+            return 404, {}, 'Not Found'
+        details = {
+            'slug': resource['slug'], 'name': resource['name'],
+            'i18n_type': resource['i18n_type'],
+            'source_language_code': resource['source_language_code'],
+        }
+        if 'details' in params:
+            languages = [resource['source_language_code']] + sorted(
+                resource['translations']
+            )
+            details.update({
+                'mimetype': 'text/x-po',
+                'wordcount': len(resource['content'].split()),
+                'total_entities': _count_strings(resource['content']),
+                'last_update': resource['last_update'],
+                'available_languages': [
+                    {'code': code, 'name': code, 'code_aliases': ' '}
+                    for code in languages
+                ],
+            })
+        return 200, {}, details
+
+    def _resource_delete(self, project, resource, **kwargs):
+        project, resource = self._get(project, resource)
+        if resource is None:
+            return 404, {}, 'Not Found'
+        del project['resources'][resource['slug']]
+        return 204, {}, ''
+
+    def _content_put(self, project, resource, body, **kwargs):
+        project, resource = self._get(project, resource)
+        if resource is None:
+            return 404, {}, 'Not Found'
+        if not body or 'content' not in body:
+            return 400, {}, "'content' is required"
+        return 200, {}, self._update(resource, 'content', body['content'])
+
+    def _translation_put(self, project, resource, language, body, **kwargs):
+        project, resource = self._get(project, resource)
+        if resource is None:
+            return 404, {}, 'Not Found'
+        if not body or 'content' not in body:
+            return 400, {}, "'content' is required"
+        return 200, {}, self._update(
+            resource['translations'], language, body['content']
+        )
+
+    def _update(self, container, key, content):
+        before = _count_strings(container.get(key))
+        after = _count_strings(content)
+        container[key] = content
+        return {
+            'strings_added': max(after - before, 0),
+            'strings_updated': min(after, before),
+            'strings_delete': max(before - after, 0),
+        }
+
+    def _translation_get(self, project, resource, language, params, headers,
+                         **kwargs):
+        project, resource = self._get(project, resource)
+        if resource is None:
+            return 404, {}, 'Not Found'
+        if language == resource['source_language_code']:
+            content = resource['content']
+        elif language in resource['translations']:
+            content = resource['translations'][language]
+        else:
+            return 404, {}, 'Not Found'
+        if isinstance(content, unicode):
+            content = content.encode('utf-8')
+
+        etag = _etag(content)
+        if headers.get('if-none-match') == etag:
+            return 304, {'etag': etag}, ''
+        if 'file' in params:
+            return 200, {
+                'etag': etag, 'content-type': 'text/x-po; charset=UTF-8',
+                'content-length': str(len(content)),
+            }, content
+        return 200, {'etag': etag}, {
+            'content': content.decode('utf-8'), 'mimetype': 'text/x-po'
+        }
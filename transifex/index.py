@@ -0,0 +1,239 @@
+"""
+Index of the translation files in a local locale tree
+"""
+import hashlib
+import json
+import os
+import time
+from stat import S_ISDIR, S_ISLNK
+from collections import namedtuple
+from transifex.util import replace_file, slugify
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+
+IndexEntry = namedtuple(
+    'IndexEntry', 'path resource language mtime size digest'
+)
+
+ScanResult = namedtuple('ScanResult', 'added modified removed')
+
+
+def map_locale_path(path):
+    """
+    Map a path within a locale tree to the resource slug and language code
+    it holds. `<language>/LC_MESSAGES/<domain>.po` and `<language>/<file>.po`
+    layouts are understood. The resource slug is derived from the filename
+    the same way `TransifexAPI.new_resource` does.
+
+    @param path
+        the path relative to the root of the locale tree
+
+    @returns tuple of (resource slug, language code). The language code is
+        None if it can't be determined
+    """
+    parts = path.split(os.sep)
+    language = None
+    if 'LC_MESSAGES' in parts[:-1]:
+        position = parts.index('LC_MESSAGES')
+        if position > 0:
+            language = parts[position - 1]
+    elif len(parts) > 1:
+        language = parts[-2]
+    return slugify(parts[-1]), language
+
+
+class LocaleIndex(object):
+    """
+    Keeps track of the translation files in a locale tree, which resource and
+    language each one maps to and the hash of its content.
+
+    `scan` only rehashes files whose size or modification time changed since
+    the previous scan, so rescanning an unchanged tree costs one `stat` per
+    file.
+    """
+    VERSION = 1
+
+    def __init__(self, root, index_path=None, extensions=('.po',),
+                 mapper=map_locale_path):
+        """
+        @param root
+            the root directory of the locale tree
+        @param index_path (optional)
+            the file the index is persisted to between runs. By default the
+            index is only kept in memory
+        @param extensions (optional)
+            the extensions of the files to index, defaults to ('.po',)
+        @param mapper (optional)
+            callable which takes a path relative to `root` and returns a
+            tuple of (resource slug, language code), defaults to
+            `map_locale_path`
+        """
+        self.root = root
+        self.index_path = index_path
+        self.extensions = tuple(extensions)
+        self.mapper = mapper
+        self._entries = {}
+        self._scanned_at = None
+        if index_path is not None:
+            self.load()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(sorted(self._entries.values()))
+
+    def __contains__(self, path):
+        return path in self._entries
+
+    def get(self, path):
+        """
+        @param path
+            the path relative to the root of the locale tree
+
+        @returns `IndexEntry` or None
+        """
+        return self._entries.get(path)
+
+    def load(self):
+        """
+        Load the index from `index_path`. A missing or unreadable index file
+        leaves the index empty
+        """
+        try:
+            handle = open(self.index_path, 'r')
+        except IOError:
+            return
+        try:
+            data = json.load(handle)
+        except ValueError:
+            return
+        finally:
+            handle.close()
+        if data.get('version') != self.VERSION or \
+                data.get('root') != self.root:
+            return
+        self._scanned_at = data['scanned_at']
+        make = IndexEntry._make
+        self._entries = dict(
+            (path, make([path] + values))
+            for path, values in data['entries'].items()
+        )
+
+    def save(self):
+        """
+        Write the index to `index_path`
+        """
+        data = {
+            'version': self.VERSION, 'root': self.root,
+            'scanned_at': self._scanned_at,
+            'entries': dict(
+                (path, entry[1:]) for path, entry in self._entries.items()
+            ),
+        }
+        tmp_path = '%s.tmp' % self.index_path
+        handle = open(tmp_path, 'w')
+        try:
+            handle.write(json.dumps(data, separators=(',', ':')))
+        finally:
+            handle.close()
+        replace_file(tmp_path, self.index_path)
+
+    def scan(self):
+        """
+        Walk the locale tree and update the index. The index is saved to
+        `index_path` if anything changed.
+
+        @returns `ScanResult` with the sorted lists of paths which were
+            added, modified and removed since the previous scan
+        """
+        started_at = time.time()
+        previous = self._entries
+        # files modified in the same clock tick as the previous scan may
+        # have changed again without their mtime changing
+        racy_after = self._scanned_at
+        entries = {}
+        added = []
+        modified = []
+
+        for path, st_mtime, st_size in self._walk():
+            entry = previous.get(path)
+            if entry is not None and entry.mtime == st_mtime and \
+                    entry.size == st_size and \
+                    (racy_after is None or st_mtime < racy_after):
+                entries[path] = entry
+                continue
+            digest = self._hash(path)
+            if entry is None:
+                resource, language = self.mapper(path)
+                added.append(path)
+            else:
+                resource, language = entry.resource, entry.language
+                if entry.digest != digest:
+                    modified.append(path)
+            entries[path] = IndexEntry(
+                path, resource, language, st_mtime, st_size, digest
+            )
+
+        removed = [path for path in previous if path not in entries]
+        changed = bool(removed) or any(
+            entries[path] is not previous.get(path) for path in entries
+        )
+        self._entries = entries
+        self._scanned_at = started_at
+        if changed and self.index_path is not None:
+            self.save()
+
+        added.sort()
+        modified.sort()
+        removed.sort()
+        return ScanResult(added, modified, removed)
+
+    def _hash(self, path):
+        sha = hashlib.sha1()
+        handle = open(os.path.join(self.root, path), 'rb')
+        try:
+            while True:
+                chunk = handle.read(64 * 1024)
+                if not chunk:
+                    break
+                sha.update(chunk)
+        finally:
+            handle.close()
+        return sha.hexdigest()
+
+    def _walk(self):
+        """
+        Yield (relative path, mtime, size) for every indexed file
+        """
+        extensions = self.extensions
+        root = self.root
+        prefix_length = len(os.path.join(root, ''))
+        pending = [root]
+        while pending:
+            directory = pending.pop()
+            if scandir is not None:
+                for item in scandir(directory):
+                    if item.is_dir(follow_symlinks=False):
+                        pending.append(item.path)
+                    elif item.name.endswith(extensions):
+                        st = item.stat()
+                        yield item.path[prefix_length:], st.st_mtime, \
+                            st.st_size
+            else:
+                for name in os.listdir(directory):
+                    path = os.path.join(directory, name)
+                    st = os.lstat(path)
+                    if S_ISDIR(st.st_mode):
+                        pending.append(path)
+                    elif name.endswith(extensions):
+                        if S_ISLNK(st.st_mode):
+                            st = os.stat(path)
+                        yield path[prefix_length:], st.st_mtime, st.st_size
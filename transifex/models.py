@@ -0,0 +1,161 @@
+"""
+Compact models of the resources and languages returned by the Transifex API
+"""
+import json
+
+try:
+    from sys import intern
+except ImportError:
+    pass
+
+
+def _intern(value):
+    """
+    Intern slugs and language codes, which repeat across resources and
+    projects
+    """
+    if value is None:
+        return None
+    try:
+        return intern(str(value))
+    except (TypeError, UnicodeError):
+        return value
+
+
+class _Model(object):
+    __slots__ = ()
+
+    def __init__(self, **kwargs):
+        for name in self.__slots__:
+            setattr(self, name, kwargs.pop(name, None))
+        if kwargs:
+            raise TypeError(
+                'unexpected keyword arguments %s' % ', '.join(sorted(kwargs))
+            )
+
+    def __eq__(self, other):
+        if type(self) is not type(other):
+            return NotImplemented
+        return all(
+            getattr(self, name) == getattr(other, name)
+            for name in self.__slots__
+        )
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __repr__(self):
+        return '<%s %s>' % (type(self).__name__, ' '.join(
+            '%s=%r' % (name, getattr(self, name))
+            for name in self.__slots__ if getattr(self, name) is not None
+        ))
+
+
+class Language(_Model):
+    """
+    A language a resource is available in
+    """
+    __slots__ = ('code', 'name', 'code_aliases')
+
+
+class Resource(_Model):
+    """
+    A resource of a project. The `wordcount`, `total_entities`,
+    `last_update` and `languages` attributes are only filled in from the
+    details of the resource, see `TransifexAPI.project_stats`
+    """
+    __slots__ = (
+        'slug', 'name', 'i18n_type', 'source_language_code', 'categories',
+        'priority', 'wordcount', 'total_entities', 'last_update', 'languages',
+    )
+
+    @property
+    def language_codes(self):
+        """
+        The codes of the languages of the resource
+        """
+        return [language.code for language in self.languages or ()]
+
+
+class ProjectStats(_Model):
+    """
+    The resources of a project with their details
+    """
+    __slots__ = ('slug', 'resources')
+
+    def get(self, resource_slug):
+        """
+        @returns the `Resource` with the given slug, or None
+        """
+        for resource in self.resources:
+            if resource.slug == resource_slug:
+                return resource
+        return None
+
+    @property
+    def wordcount(self):
+        return sum(resource.wordcount or 0 for resource in self.resources)
+
+    @property
+    def total_entities(self):
+        return sum(
+            resource.total_entities or 0 for resource in self.resources
+        )
+
+    @property
+    def language_codes(self):
+        """
+        The sorted codes of the languages any resource is available in
+        """
+        codes = set()
+        for resource in self.resources:
+            codes.update(resource.language_codes)
+        return sorted(codes)
+
+
+# Languages are shared by every resource which has them
+_languages = {}
+
+def _language_from_dict(data):
+    key = (data.get('code'), data.get('name'), data.get('code_aliases'))
+    language = _languages.get(key)
+    if language is None:
+        language = _languages.setdefault(key, Language(
+            code=_intern(key[0]), name=key[1], code_aliases=key[2]
+        ))
+    return language
+
+def _resource_from_dict(data):
+    resource = Resource()
+    for name, value in data.items():
+        if name == 'available_languages':
+            resource.languages = tuple(value)
+        elif name in ('slug', 'source_language_code', 'i18n_type'):
+            setattr(resource, name, _intern(value))
+        elif name in Resource.__slots__:
+            setattr(resource, name, value)
+    return resource
+
+def _details_object_hook(data):
+    if 'code' in data:
+        return _language_from_dict(data)
+    return _resource_from_dict(data)
+
+def parse_resources(content):
+    """
+    Parse the response of the resources listing of a project
+
+    @returns list of `Resource`
+    """
+    return json.loads(content, object_hook=_resource_from_dict)
+
+def parse_resource_details(content):
+    """
+    Parse the response of the details of a resource
+
+    @returns `Resource` with its details and languages
+    """
+    return json.loads(content, object_hook=_details_object_hook)
@@ -0,0 +1,231 @@
+"""
+Work out what a push or pull of a locale tree would do, without doing it
+"""
+import calendar
+import time
+from collections import namedtuple
+
+
+CREATE = 'create'
+UPDATE = 'update'
+UPLOAD = 'upload'
+DOWNLOAD = 'download'
+SKIP = 'skip'
+
+# One step of a `SyncPlan`. `action` is one of CREATE (`new_resource`),
+# UPDATE (`update_source_translation`), UPLOAD (`new_translation`), DOWNLOAD
+# (`get_translation`) or SKIP, with the reason in `reason`
+PlannedAction = namedtuple(
+    'PlannedAction', 'action resource language path bytes requests reason'
+)
+
+
+class SyncPlan(object):
+    """
+    The steps a sync would take, with the number of requests and bytes they
+    are estimated to cost
+    """
+    def __init__(self, project_slug, actions, listing_requests):
+        self.project_slug = project_slug
+        self.actions = actions
+        self.listing_requests = listing_requests
+
+    def __iter__(self):
+        return iter(self.actions)
+
+    def __len__(self):
+        return len(self.actions)
+
+    def by_action(self, action):
+        """
+        @returns list of the `PlannedAction`s with the given action
+        """
+        return [
+            planned for planned in self.actions if planned.action == action
+        ]
+
+    @property
+    def requests(self):
+        """
+        The number of requests the sync would make
+        """
+        return sum(planned.requests for planned in self.actions)
+
+    @property
+    def bytes(self):
+        """
+        The estimated number of bytes the sync would transfer
+        """
+        return sum(planned.bytes for planned in self.actions)
+
+    def summary(self):
+        """
+        @returns dictionary with the number of steps of each action, and the
+            estimated `requests` and `bytes`
+        """
+        summary = dict(
+            (action, 0) for action in (CREATE, UPDATE, UPLOAD, DOWNLOAD, SKIP)
+        )
+        for planned in self.actions:
+            summary[planned.action] += 1
+        summary['requests'] = self.requests
+        summary['bytes'] = self.bytes
+        return summary
+
+
+def _parse_timestamp(value):
+    try:
+        return calendar.timegm(time.strptime(value, '%Y-%m-%d %H:%M:%S'))
+    except (TypeError, ValueError):
+        return None
+
+
+class SyncPlanner(object):
+    """
+    Plans a push and/or pull between a `transifex.index.LocaleIndex` and a
+    project. Only the resources of the project and their details are
+    requested, nothing is changed on the server.
+    """
+    def __init__(self, api, bytes_per_entity=100):
+        """
+        @param api
+            the `TransifexAPI` of the server
+        @param bytes_per_entity (optional)
+            the estimated size of one string in a translation, used to
+            estimate downloads with no local copy, defaults to 100
+        """
+        self.api = api
+        self.bytes_per_entity = bytes_per_entity
+
+    def plan(self, project_slug, index, push=True, pull=True, changed=None,
+             source_language=None, path_template=None):
+        """
+        @param project_slug
+            the project slug
+        @param index
+            the scanned `LocaleIndex` of the local files
+        @param push (optional)
+            plan uploading local files, defaults to `True`
+        @param pull (optional)
+            plan downloading translations, defaults to `True`
+        @param changed (optional)
+            the paths which changed since the last push, eg the added and
+            modified paths of `LocaleIndex.scan`. By default every local file
+            is treated as changed
+        @param source_language (optional)
+            the language of the local source files of resources which don't
+            exist on the server yet, defaults to the source language of the
+            existing resources
+        @param path_template (optional)
+            the path new downloads are saved to, relative to the root of the
+            index. Formatted with `resource` and `language`
+
+        @returns `SyncPlan`. Paths are relative to the root of the index
+
+        @raises `TransifexAPIException`
+        """
+        stats = self.api.project_stats(project_slug)
+        remote = dict(
+            (resource.slug, resource) for resource in stats.resources
+        )
+        if source_language is None:
+            languages = set(
+                resource.source_language_code for resource in stats.resources
+            )
+            if len(languages) == 1:
+                source_language = languages.pop()
+        if changed is not None:
+            changed = set(changed)
+
+        local = {}
+        for entry in index:
+            local.setdefault((entry.resource, entry.language), entry)
+
+        actions = []
+        uploading = set()
+        if push:
+            actions.extend(self._plan_push(
+                index, remote, changed, source_language, uploading
+            ))
+        if pull:
+            actions.extend(self._plan_pull(
+                remote, local, uploading, path_template
+            ))
+        return SyncPlan(project_slug, actions, 1 + len(stats.resources))
+
+    def _plan_push(self, index, remote, changed, source_language, uploading):
+        # resources which will be created by this push
+        created = set()
+        sources = set()
+        entries = list(index)
+        for entry in entries:
+            resource = remote.get(entry.resource)
+            if resource is None and entry.language == source_language and \
+                    entry.resource not in created:
+                created.add(entry.resource)
+                sources.add(entry.path)
+
+        for entry in entries:
+            resource = remote.get(entry.resource)
+            reason = None
+            if entry.path in sources:
+                action = CREATE
+            elif resource is None:
+                if entry.resource not in created:
+                    action, reason = SKIP, 'resource missing on server'
+                elif entry.language == source_language:
+                    action, reason = SKIP, 'duplicate source file'
+                else:
+                    action = UPLOAD
+            elif changed is not None and entry.path not in changed:
+                action, reason = SKIP, 'unchanged'
+            elif entry.language == resource.source_language_code:
+                action = UPDATE
+            else:
+                action = UPLOAD
+
+            if action == SKIP:
+                yield PlannedAction(
+                    SKIP, entry.resource, entry.language, entry.path, 0, 0,
+                    reason
+                )
+            else:
+                uploading.add(entry.path)
+                yield PlannedAction(
+                    action, entry.resource, entry.language, entry.path,
+                    entry.size, 1, None
+                )
+
+    def _plan_pull(self, remote, local, uploading, path_template):
+        for slug in sorted(remote):
+            resource = remote[slug]
+            updated_at = _parse_timestamp(resource.last_update)
+            for language in resource.language_codes:
+                if language == resource.source_language_code:
+                    continue
+                entry = local.get((slug, language))
+                if entry is None:
+                    path = None
+                    if path_template is not None:
+                        path = path_template % {
+                            'resource': slug, 'language': language,
+                        }
+                    yield PlannedAction(
+                        DOWNLOAD, slug, language, path,
+                        (resource.total_entities or 0) *
+                        self.bytes_per_entity, 1, None
+                    )
+                elif entry.path in uploading:
+                    yield PlannedAction(
+                        SKIP, slug, language, entry.path, 0, 0,
+                        'local changes are pushed'
+                    )
+                elif updated_at is not None and entry.mtime >= updated_at:
+                    yield PlannedAction(
+                        SKIP, slug, language, entry.path, 0, 0, 'up to date'
+                    )
+                else:
+                    yield PlannedAction(
+                        DOWNLOAD, slug, language, entry.path, entry.size, 1,
+                        None
+                    )
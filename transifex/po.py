@@ -0,0 +1,127 @@
+"""
+A minimal reader of gettext PO files
+"""
+import re
+from collections import namedtuple
+
+
+PoEntry = namedtuple(
+    'PoEntry', 'context msgid msgid_plural msgstr plurals fuzzy'
+)
+
+_keyword_re = re.compile(
+    r'^(msgctxt|msgid_plural|msgid|msgstr(?:\[(\d+)\])?)\s+"(.*)"\s*$'
+)
+_continuation_re = re.compile(r'^"(.*)"\s*$')
+_escape_re = re.compile(r'\\(.)')
+_escapes = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\'}
+
+
+def _unescape(value):
+    return _escape_re.sub(
+        lambda match: _escapes.get(match.group(1), match.group(1)), value
+    )
+
+
+class _Builder(object):
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.context = None
+        self.msgid = None
+        self.msgid_plural = None
+        self.msgstr = None
+        self.plurals = {}
+        self.fuzzy = False
+        self.has_msgstr = False
+
+    def entry(self):
+        plurals = None
+        if self.plurals:
+            plurals = tuple(
+                self.plurals[index] for index in sorted(self.plurals)
+            )
+        msgstr = self.msgstr
+        if msgstr is None and plurals:
+            msgstr = plurals[0]
+        return PoEntry(
+            self.context, self.msgid, self.msgid_plural, msgstr or u'',
+            plurals, self.fuzzy
+        )
+
+
+def parse_po(lines, encoding='utf-8'):
+    """
+    Read the entries of a PO file. The header entry and obsolete entries are
+    skipped.
+
+    @param lines
+        iterable of the lines of the file, eg an open file
+    @param encoding (optional)
+        the encoding of the file, defaults to 'utf-8'
+
+    @returns iterator of `PoEntry` tuples of
+        (context, msgid, msgid_plural, msgstr, plurals, fuzzy), where
+        `plurals` is a tuple of the plural forms or None
+    """
+    builder = _Builder()
+    # the name and index of the string which continuation lines extend
+    current = None
+    for line in lines:
+        if isinstance(line, str):
+            line = line.decode(encoding)
+        line = line.strip()
+        if not line:
+            continue
+
+        if line.startswith('#'):
+            if builder.has_msgstr:
+                if builder.msgid:
+                    yield builder.entry()
+                builder.reset()
+                current = None
+            if line.startswith('#,'):
+                flags = [flag.strip() for flag in line[2:].split(',')]
+                if 'fuzzy' in flags:
+                    builder.fuzzy = True
+            continue
+
+        match = _keyword_re.match(line)
+        if match is not None:
+            keyword, index, value = match.groups()
+            value = _unescape(value)
+            if keyword in ('msgctxt', 'msgid') and builder.has_msgstr:
+                if builder.msgid:
+                    yield builder.entry()
+                builder.reset()
+            if keyword == 'msgctxt':
+                builder.context = value
+                current = ('context', None)
+            elif keyword == 'msgid':
+                builder.msgid = value
+                current = ('msgid', None)
+            elif keyword == 'msgid_plural':
+                builder.msgid_plural = value
+                current = ('msgid_plural', None)
+            elif index is not None:
+                builder.plurals[int(index)] = value
+                builder.has_msgstr = True
+                current = ('plurals', int(index))
+            else:
+                builder.msgstr = value
+                builder.has_msgstr = True
+                current = ('msgstr', None)
+            continue
+
+        match = _continuation_re.match(line)
+        if match is not None and current is not None:
+            value = _unescape(match.group(1))
+            name, index = current
+            if name == 'plurals':
+                builder.plurals[index] += value
+            else:
+                setattr(builder, name, getattr(builder, name) + value)
+
+    if builder.has_msgstr and builder.msgid:
+        yield builder.entry()
@@ -0,0 +1,439 @@
+"""
+An opt-in profiler which shows where the time of a run of `TransifexAPI`
+calls goes: endpoint methods, network requests, JSON encoding, file I/O and
+the `transifex.util` helpers
+"""
+import functools
+import json
+import sys
+import threading
+import time
+import types
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+ENDPOINT = 'endpoint'
+NETWORK = 'network'
+JSON = 'json'
+FILE = 'file'
+UTIL = 'util'
+CATEGORIES = (ENDPOINT, NETWORK, JSON, FILE, UTIL)
+
+# the `transifex.util` helpers which are timed. `map_concurrently` only
+# waits for its workers, whose calls are timed on their own
+UTIL_HELPERS = (
+    'makedirs', 'force_unicode', 'slugify', 'slugify_many', 'is_valid_slug',
+)
+
+# modules whose calls aren't timed on their own: the transports and the
+# in-process fake server are part of the network time
+_skipped_modules = (
+    'transifex.fake', 'transifex.profiling', 'transifex.transports',
+)
+
+_active_lock = threading.Lock()
+_active = [None]
+
+
+def _max_rss():
+    """
+    The peak resident set size of the process in bytes, or None where it
+    isn't available
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Mac OS X reports bytes, other systems kilobytes
+    if sys.platform == 'darwin':
+        return peak
+    return peak * 1024
+
+
+class _Frame(object):
+    __slots__ = ('name', 'started_at', 'children')
+
+    def __init__(self, name, started_at):
+        self.name = name
+        self.started_at = started_at
+        self.children = 0.0
+
+
+class _ModuleProxy(object):
+    """
+    Stands in for a module, with some of its functions replaced
+    """
+    def __init__(self, module, replacements):
+        self.__dict__.update(replacements)
+        self._module = module
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+
+class _ProfiledFile(object):
+    """
+    File like object which times the reads and writes of a file
+    """
+    def __init__(self, handle, profiler):
+        self._handle = handle
+        self._profiler = profiler
+
+    def __getattr__(self, name):
+        return getattr(self._handle, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._handle.close()
+
+    def __iter__(self):
+        read = self._profiler._timed(FILE, 'file.read', self._handle.readline)
+        return iter(read, '')
+
+    def read(self, *args):
+        return self._profiler._call(
+            FILE, 'file.read', self._handle.read, args
+        )
+
+    def readline(self, *args):
+        return self._profiler._call(
+            FILE, 'file.read', self._handle.readline, args
+        )
+
+    def readlines(self, *args):
+        return self._profiler._call(
+            FILE, 'file.read', self._handle.readlines, args
+        )
+
+    def write(self, data):
+        return self._profiler._call(
+            FILE, 'file.write', self._handle.write, (data,)
+        )
+
+
+class Profiler(object):
+    """
+    Records the time spent in each `TransifexAPI` endpoint method, in
+    network requests, in `json.dumps` and `json.loads`, in file reads and
+    writes and in the `transifex.util` helpers, while it is running.
+
+    Times are recorded per thread, so the `self` time of a function doesn't
+    include the functions it calls, and a category's time is the sum of the
+    self times of its functions. The calls of worker threads are recorded
+    too, so with concurrent calls the categories can add up to more than the
+    wall time.
+
+    The memory used is recorded too. With `tracemalloc` available (Python
+    3.4 and newer) that is the peak of the memory allocated during the run
+    and the lines which allocated most. Otherwise it is the peak resident
+    set size of the process, and how much it grew during the run, from
+    `resource.getrusage`.
+
+    Only one profiler can run at a time. The calls are timed by replacing
+    the functions in the `transifex` modules, which adds some overhead to
+    each of them.
+
+        with Profiler() as profiler:
+            api.ensure_resources('project', pofiles)
+        profiler.save('profile.json')
+    """
+    def __init__(self, trace_memory=True, clock=time.time):
+        """
+        @param trace_memory (optional)
+            record the memory used, defaults to `True`
+        @param clock (optional)
+            callable returning the current time in seconds
+        """
+        self.trace_memory = trace_memory
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {}
+        self._patches = []
+        self._started_at = None
+        self._stopped_at = None
+        self._memory = None
+        self._started_tracing = False
+        self._max_rss_at_start = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        """
+        Start recording
+        """
+        with _active_lock:
+            if _active[0] is not None:
+                raise RuntimeError('A profiler is already running')
+            _active[0] = self
+        self._stats = {}
+        self._memory = None
+        if self.trace_memory:
+            if tracemalloc is None:
+                self._max_rss_at_start = _max_rss()
+            elif not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+        installed = False
+        try:
+            self._install()
+            installed = True
+        finally:
+            if not installed:
+                self._uninstall()
+                self._stop_tracing()
+                self._release()
+        self._started_at = self._clock()
+        self._stopped_at = None
+
+    def stop(self):
+        """
+        Stop recording and restore the profiled functions
+        """
+        self._stopped_at = self._clock()
+        self._uninstall()
+        if self.trace_memory and tracemalloc is not None:
+            current, peak = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics('lineno')[:10]
+            self._memory = {
+                'source': 'tracemalloc', 'current': current, 'peak': peak,
+                'top': [
+                    {'location': '%s:%s' % (
+                        stat.traceback[0].filename, stat.traceback[0].lineno
+                    ), 'size': stat.size, 'count': stat.count}
+                    for stat in top
+                ],
+            }
+            self._stop_tracing()
+        elif self.trace_memory and self._max_rss_at_start is not None:
+            peak = _max_rss()
+            self._memory = {
+                'source': 'maxrss', 'peak': peak,
+                'growth': peak - self._max_rss_at_start,
+            }
+        self._release()
+
+    def _stop_tracing(self):
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _release(self):
+        # only the running profiler frees the way for the next one
+        with _active_lock:
+            if _active[0] is self:
+                _active[0] = None
+
+    def report(self):
+        """
+        @returns dictionary with the `wall_time` of the run, the time spent
+            in each of the `categories`, the `calls`, `total` and `self` time
+            of each of the `functions`, and the `memory` used or None
+        """
+        stopped_at = self._stopped_at
+        if stopped_at is None:
+            stopped_at = self._clock()
+        categories = dict((category, 0.0) for category in CATEGORIES)
+        functions = {}
+        with self._lock:
+            for name, (category, calls, total, own) in self._stats.items():
+                categories[category] += own
+                functions[name] = {
+                    'category': category, 'calls': calls, 'total': total,
+                    'self': own,
+                }
+        return {
+            'wall_time': stopped_at - (self._started_at or stopped_at),
+            'categories': categories,
+            'functions': functions,
+            'memory': self._memory,
+        }
+
+    def save(self, path):
+        """
+        Write the report to a JSON file
+        """
+        handle = open(path, 'w')
+        try:
+            handle.write(json.dumps(self.report(), indent=2, sort_keys=True))
+        finally:
+            handle.close()
+
+    def _install(self):
+        from transifex import util
+        from transifex.api import TransifexAPI
+
+        for name, value in list(TransifexAPI.__dict__.items()):
+            if not isinstance(value, types.FunctionType):
+                continue
+            if name == '_send':
+                self._patch(TransifexAPI, name, self._timed(
+                    NETWORK, 'TransifexAPI._send', value
+                ))
+            elif not name.startswith('_'):
+                self._patch(TransifexAPI, name, self._timed(
+                    ENDPOINT, 'TransifexAPI.%s' % (name), value
+                ))
+
+        helpers = dict(
+            (getattr(util, name), self._timed(UTIL, 'util.%s' % name,
+                                              getattr(util, name)))
+            for name in UTIL_HELPERS
+        )
+        json_proxy = _ModuleProxy(json, {
+            'dumps': self._timed(JSON, 'json.dumps', json.dumps),
+            'loads': self._timed(JSON, 'json.loads', json.loads),
+        })
+        profiled_open = self._open
+
+        for module_name, module in list(sys.modules.items()):
+            if module is None or module_name in _skipped_modules or \
+                    module_name.split('.')[0] != 'transifex':
+                continue
+            for name, value in list(vars(module).items()):
+                if value is json:
+                    self._patch(module, name, json_proxy)
+                elif callable(value) and value in helpers:
+                    self._patch(module, name, helpers[value])
+            if module_name != 'transifex':
+                self._patch(module, 'open', profiled_open)
+
+    def _patch(self, owner, name, value):
+        if name in vars(owner):
+            self._patches.append((owner, name, vars(owner)[name]))
+        else:
+            self._patches.append((owner, name, None))
+        setattr(owner, name, value)
+
+    def _uninstall(self):
+        while self._patches:
+            owner, name, original = self._patches.pop()
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+
+    def _open(self, *args, **kwargs):
+        handle = self._call(FILE, 'file.open', open, args, kwargs)
+        return _ProfiledFile(handle, self)
+
+    def _timed(self, category, name, func):
+        call = self._call
+
+        @functools.wraps(func)
+        def timed(*args, **kwargs):
+            return call(category, name, func, args, kwargs)
+        return timed
+
+    def _call(self, category, name, func, args, kwargs=None):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        frame = _Frame(name, self._clock())
+        stack.append(frame)
+        try:
+            return func(*args, **(kwargs or {}))
+        finally:
+            elapsed = self._clock() - frame.started_at
+            stack.pop()
+            if stack:
+                stack[-1].children += elapsed
+            own = elapsed - frame.children
+            with self._lock:
+                stats = self._stats.get(name)
+                if stats is None:
+                    self._stats[name] = (category, 1, elapsed, own)
+                else:
+                    self._stats[name] = (
+                        category, stats[1] + 1, stats[2] + elapsed,
+                        stats[3] + own
+                    )
+
+
+def load_report(path):
+    """
+    Read a report written by `Profiler.save`
+    """
+    handle = open(path, 'r')
+    try:
+        return json.loads(handle.read())
+    finally:
+        handle.close()
+
+
+def compare_reports(before, after):
+    """
+    Compare two reports, eg of the same run before and after a change
+
+    @returns dictionary with the change in `wall_time`, in the time of each
+        of the `categories`, in the `calls` and `self` time of each of the
+        `functions`, and in the memory `peak` (None unless both reports
+        measured it the same way)
+    """
+    functions = {}
+    for name in set(before['functions']) | set(after['functions']):
+        old = before['functions'].get(name, {'calls': 0, 'self': 0.0})
+        new = after['functions'].get(name, {'calls': 0, 'self': 0.0})
+        functions[name] = {
+            'calls': new['calls'] - old['calls'],
+            'self': new['self'] - old['self'],
+        }
+    peak = None
+    if before.get('memory') and after.get('memory') and \
+            before['memory'].get('source') == after['memory'].get('source'):
+        peak = after['memory']['peak'] - before['memory']['peak']
+    return {
+        'wall_time': after['wall_time'] - before['wall_time'],
+        'categories': dict(
+            (category, after['categories'].get(category, 0.0) -
+             before['categories'].get(category, 0.0))
+            for category in CATEGORIES
+        ),
+        'functions': functions,
+        'peak': peak,
+    }
+
+
+def format_report(report, limit=20):
+    """
+    @returns the report as text: the time of each category, and the
+        functions with the most self time
+    """
+    lines = ['wall time %.3fs' % (report['wall_time'])]
+    for category in CATEGORIES:
+        lines.append('  %-10s %10.3fs' % (
+            category, report['categories'].get(category, 0.0)
+        ))
+    functions = sorted(
+        report['functions'].items(), key=lambda item: -item[1]['self']
+    )
+    lines.append('%-40s %8s %10s %10s' % (
+        'function', 'calls', 'total', 'self'
+    ))
+    for name, stats in functions[:limit]:
+        lines.append('%-40s %8d %9.3fs %9.3fs' % (
+            name, stats['calls'], stats['total'], stats['self']
+        ))
+    memory = report.get('memory')
+    if memory:
+        lines.append('memory peak %d bytes (%s)' % (
+            memory['peak'], memory.get('source')
+        ))
+        if 'growth' in memory:
+            lines.append('memory growth %d bytes' % (memory['growth']))
+    return '\n'.join(lines)
@@ -0,0 +1,287 @@
+"""
+Progress reporting for uploads and downloads
+"""
+import threading
+import time
+
+
+class TransferProgress(object):
+    """
+    The progress of one upload or download: the bytes transferred so far, the
+    transfer rate and the estimated time left.
+
+    `callback` is called with the `TransferProgress` at most once every
+    `interval` seconds while bytes are transferred, and once when the
+    transfer finishes.
+    """
+    def __init__(self, name, total=None, callback=None, interval=0.5,
+                 tracker=None, clock=time.time):
+        """
+        @param name
+            the name of the transfer, eg 'project/resource/language'
+        @param total (optional)
+            the size of the transfer in bytes, if known
+        @param callback (optional)
+            callable called with the `TransferProgress`
+        @param interval (optional)
+            the minimum number of seconds between calls to `callback`,
+            defaults to 0.5
+        @param tracker (optional)
+            the `ProgressTracker` the transfer is part of
+        @param clock (optional)
+            callable returning the current time in seconds
+        """
+        self.name = name
+        self.total = total
+        self.callback = callback
+        self.interval = interval
+        self.tracker = tracker
+        self.transferred = 0
+        self._clock = clock
+        self.started_at = self.updated_at = clock()
+        self.finished_at = None
+        self._report_at = self.started_at + interval
+
+    def __repr__(self):
+        return '<TransferProgress %s %d/%s>' % (
+            self.name, self.transferred,
+            '?' if self.total is None else self.total
+        )
+
+    def update(self, count):
+        """
+        Record that `count` more bytes were transferred
+        """
+        now = self._clock()
+        self.transferred += count
+        self.updated_at = now
+        if self.tracker is not None:
+            self.tracker._update(count, now)
+        if now >= self._report_at:
+            self._report_at = now + self.interval
+            if self.callback is not None:
+                self.callback(self)
+
+    def finish(self):
+        """
+        Record that the transfer is over
+        """
+        if self.finished_at is not None:
+            return
+        self.finished_at = self._clock()
+        if self.tracker is not None:
+            self.tracker._finish(self)
+        if self.callback is not None:
+            self.callback(self)
+
+    @property
+    def finished(self):
+        return self.finished_at is not None
+
+    @property
+    def elapsed(self):
+        """
+        The number of seconds since the transfer started
+        """
+        end = self.finished_at
+        if end is None:
+            end = self._clock()
+        return end - self.started_at
+
+    @property
+    def rate(self):
+        """
+        The average number of bytes transferred per second
+        """
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.0
+        return float(self.transferred) / elapsed
+
+    @property
+    def eta(self):
+        """
+        The estimated number of seconds left, or None if the size of the
+        transfer or its rate are unknown
+        """
+        if self.finished_at is not None:
+            return 0.0
+        rate = self.rate
+        if self.total is None or not rate:
+            return None
+        return max(self.total - self.transferred, 0) / rate
+
+
+class ProgressTracker(object):
+    """
+    The combined progress of many transfers, eg of a bulk operation. Pass
+    the tracker as the `progress` of each transfer.
+
+    `callback` is called with the tracker at most once every `interval`
+    seconds while bytes are transferred, and whenever a transfer finishes.
+    `stalled` lists the transfers which haven't made progress for a while.
+    """
+    def __init__(self, callback=None, interval=0.5, clock=time.time):
+        """
+        @param callback (optional)
+            callable called with the `ProgressTracker`
+        @param interval (optional)
+            the minimum number of seconds between calls to `callback`,
+            defaults to 0.5
+        @param clock (optional)
+            callable returning the current time in seconds
+        """
+        self.callback = callback
+        self.interval = interval
+        self.transferred = 0
+        self.total = 0
+        self.started = 0
+        self.completed = 0
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._active = set()
+        self.started_at = clock()
+        self._report_at = self.started_at + interval
+
+    def transfer(self, name, total=None):
+        """
+        Start tracking a transfer
+
+        @returns `TransferProgress`
+        """
+        progress = TransferProgress(
+            name, total, tracker=self, clock=self._clock
+        )
+        with self._lock:
+            self.started += 1
+            self.total += total or 0
+            self._active.add(progress)
+        return progress
+
+    @property
+    def active(self):
+        """
+        The transfers which haven't finished, sorted by name
+        """
+        with self._lock:
+            return sorted(self._active, key=lambda progress: progress.name)
+
+    @property
+    def rate(self):
+        """
+        The average number of bytes transferred per second since the tracker
+        was created
+        """
+        elapsed = self._clock() - self.started_at
+        if elapsed <= 0:
+            return 0.0
+        return float(self.transferred) / elapsed
+
+    @property
+    def eta(self):
+        """
+        The estimated number of seconds left for the transfers of known size,
+        or None if the rate is unknown
+        """
+        rate = self.rate
+        if not rate:
+            return None
+        return max(self.total - self.transferred, 0) / rate
+
+    def stalled(self, seconds):
+        """
+        @returns list of the unfinished transfers which haven't transferred
+            anything for `seconds` seconds
+        """
+        now = self._clock()
+        return [
+            progress for progress in self.active
+            if now - progress.updated_at >= seconds
+        ]
+
+    def _update(self, count, now):
+        with self._lock:
+            self.transferred += count
+            report = now >= self._report_at
+            if report:
+                self._report_at = now + self.interval
+        if report and self.callback is not None:
+            self.callback(self)
+
+    def _finish(self, progress):
+        with self._lock:
+            self._active.discard(progress)
+            self.completed += 1
+            if progress.total is None:
+                self.total += progress.transferred
+        if self.callback is not None:
+            self.callback(self)
+
+
+class ProgressReader(object):
+    """
+    File like object which reads a byte string and reports the bytes read
+    to a `TransferProgress`. Its length is known so it is uploaded with a
+    Content-Length. Bytes read again after seeking back aren't counted twice.
+    """
+    def __init__(self, data, progress):
+        self._data = data
+        self._position = 0
+        self._reported = 0
+        self.progress = progress
+
+    def __len__(self):
+        return len(self._data)
+
+    def read(self, size=-1):
+        start = self._position
+        if size is None or size < 0:
+            end = len(self._data)
+        else:
+            end = min(start + size, len(self._data))
+        self._position = end
+        if end > self._reported:
+            self.progress.update(end - self._reported)
+            self._reported = end
+        if end == len(self._data):
+            self.progress.finish()
+        return self._data[start:end]
+
+    def seek(self, offset, whence=0):
+        if whence == 1:
+            offset += self._position
+        elif whence == 2:
+            offset += len(self._data)
+        self._position = max(offset, 0)
+
+    def tell(self):
+        return self._position
+
+
+def start_transfer(progress, name, total=None):
+    """
+    @param progress
+        a `ProgressTracker`, or a callback for a `TransferProgress`
+    @param name
+        the name of the transfer
+    @param total (optional)
+        the size of the transfer in bytes, if known
+
+    @returns `TransferProgress`
+    """
+    if isinstance(progress, ProgressTracker):
+        return progress.transfer(name, total)
+    return TransferProgress(name, total, callback=progress)
+
+
+def iter_progress(chunks, progress):
+    """
+    Report the size of each chunk to a `TransferProgress` as it passes
+    through, and finish the transfer after the last one
+    """
+    try:
+        for chunk in chunks:
+            progress.update(len(chunk))
+            yield chunk
+    finally:
+        progress.finish()
@@ -0,0 +1,200 @@
+"""
+A local SQLite store of translations for fast offline lookups
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from transifex.po import parse_po
+
+
+_schema = """
+CREATE TABLE IF NOT EXISTS sources (
+    project TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    language TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    ingested_at REAL NOT NULL,
+    PRIMARY KEY (project, resource, language)
+);
+CREATE TABLE IF NOT EXISTS translations (
+    project TEXT NOT NULL,
+    resource TEXT NOT NULL,
+    language TEXT NOT NULL,
+    context TEXT NOT NULL,
+    msgid TEXT NOT NULL,
+    msgstr TEXT NOT NULL,
+    plurals TEXT,
+    fuzzy INTEGER NOT NULL,
+    PRIMARY KEY (project, resource, language, context, msgid)
+);
+"""
+
+
+class TranslationStore(object):
+    """
+    Keeps the strings of downloaded translations in an indexed SQLite
+    database, keyed by (project, resource, language, context, msgid).
+
+    `ingest` loads a downloaded PO file, replacing what was stored for its
+    project, resource and language, and does nothing if the file hasn't
+    changed since it was last ingested. `lookup` finds a single translated
+    string without reading any PO file.
+    """
+    def __init__(self, path=':memory:'):
+        """
+        @param path (optional)
+            the path of the database file, defaults to an in-memory
+            database
+        """
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            if path != ':memory:':
+                self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.executescript(_schema)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def ingest(self, project_slug, resource_slug, language_code,
+               path_to_pofile):
+        """
+        Load the strings of a translation into the store
+
+        @param project_slug
+            the project slug
+        @param resource_slug
+            the resource slug
+        @param language_code
+            the language code of the translation
+        @param path_to_pofile
+            the path to the pofile to load
+
+        @returns Boolean
+            False if the pofile hasn't changed since it was last ingested
+
+        @raises `IOError`
+        """
+        handle = open(path_to_pofile, 'rb')
+        try:
+            content = handle.read()
+        finally:
+            handle.close()
+        digest = hashlib.sha1(content).hexdigest()
+        key = (project_slug, resource_slug, language_code)
+
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT digest FROM sources '
+                'WHERE project = ? AND resource = ? AND language = ?', key
+            ).fetchone()
+            if row is not None and row[0] == digest:
+                return False
+
+            rows = []
+            for entry in parse_po(content.splitlines()):
+                plurals = None
+                if entry.plurals is not None:
+                    plurals = json.dumps(entry.plurals)
+                rows.append(key + (
+                    entry.context or u'', entry.msgid, entry.msgstr, plurals,
+                    int(entry.fuzzy)
+                ))
+            with self._connection:
+                self._connection.execute(
+                    'DELETE FROM translations '
+                    'WHERE project = ? AND resource = ? AND language = ?', key
+                )
+                self._connection.executemany(
+                    'INSERT OR REPLACE INTO translations (project, resource, '
+                    'language, context, msgid, msgstr, plurals, fuzzy) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows
+                )
+                self._connection.execute(
+                    'INSERT OR REPLACE INTO sources (project, resource, '
+                    'language, digest, ingested_at) VALUES (?, ?, ?, ?, ?)',
+                    key + (digest, time.time())
+                )
+        return True
+
+    def refresh(self, api, project_slug, resource_slug, language_code,
+                path_to_pofile):
+        """
+        Download a translation with `api.get_translation` and ingest it
+
+        @returns Boolean
+            False if the translation hasn't changed since it was last
+            ingested
+
+        @raises `TransifexAPIException`
+        @raises `IOError`
+        """
+        api.get_translation(
+            project_slug, resource_slug, language_code, path_to_pofile
+        )
+        return self.ingest(
+            project_slug, resource_slug, language_code, path_to_pofile
+        )
+
+    def lookup(self, project_slug, resource_slug, language_code, msgid,
+               context=None, include_fuzzy=False):
+        """
+        Find the translation of a string
+
+        @param context (optional)
+            the msgctxt of the string
+        @param include_fuzzy (optional)
+            return fuzzy translations too, defaults to `False`
+
+        @returns the translated string, or None if there is no translation
+        """
+        row = self._find(
+            'msgstr, fuzzy', project_slug, resource_slug, language_code,
+            msgid, context
+        )
+        if row is None or not row[0] or (row[1] and not include_fuzzy):
+            return None
+        return row[0]
+
+    def lookup_plural(self, project_slug, resource_slug, language_code, msgid,
+                      context=None, include_fuzzy=False):
+        """
+        Find the plural forms of the translation of a string
+
+        @returns list of the translated plural forms, or None if there is no
+            translation
+        """
+        row = self._find(
+            'plurals, fuzzy', project_slug, resource_slug, language_code,
+            msgid, context
+        )
+        if row is None or row[0] is None or (row[1] and not include_fuzzy):
+            return None
+        return json.loads(row[0])
+
+    def languages(self, project_slug, resource_slug):
+        """
+        @returns the sorted codes of the languages stored for a resource
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT language FROM sources '
+                'WHERE project = ? AND resource = ? ORDER BY language',
+                (project_slug, resource_slug)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _find(self, columns, project_slug, resource_slug, language_code,
+              msgid, context):
+        with self._lock:
+            return self._connection.execute(
+                'SELECT %s FROM translations WHERE project = ? AND '
+                'resource = ? AND language = ? AND context = ? AND msgid = ?'
+                % columns,
+                (project_slug, resource_slug, language_code, context or u'',
+                 msgid)
+            ).fetchone()
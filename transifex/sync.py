@@ -0,0 +1,279 @@
+"""
+Download the translations of many projects over a shared pool of workers
+"""
+import os
+import threading
+import Queue
+from collections import deque, namedtuple
+from transifex.exceptions import TransifexAPIException
+from transifex.util import makedirs
+
+
+# Progress of a sync. `kind` is one of the `SyncScheduler` event kinds,
+# `error` is the exception raised by the step or None, and `done` and `total`
+# count the finished and known steps of the project
+SyncEvent = namedtuple(
+    'SyncEvent', 'project kind resource language path error done total'
+)
+
+
+class _FairQueue(object):
+    """
+    Queue of tasks grouped by project. Tasks of higher priority projects are
+    handed out first, and projects of the same priority take turns so a
+    project with many tasks can't hold up the others.
+    """
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._tasks = {}
+        self._rings = {}
+        self._closed = False
+
+    def put(self, project, task):
+        with self._condition:
+            tasks = self._tasks.get(project)
+            if tasks is None:
+                tasks = self._tasks[project] = deque()
+                self._rings.setdefault(project.priority, deque()).append(
+                    project
+                )
+            tasks.append(task)
+            self._condition.notify()
+
+    def get(self):
+        """
+        Wait for the next task
+
+        @returns tuple of (project, task), or None once the queue is closed
+        """
+        with self._condition:
+            while not self._closed and not self._rings:
+                self._condition.wait()
+            if self._closed:
+                return None
+            priority = max(self._rings)
+            ring = self._rings[priority]
+            project = ring.popleft()
+            tasks = self._tasks[project]
+            task = tasks.popleft()
+            if tasks:
+                ring.append(project)
+            else:
+                del self._tasks[project]
+                if not ring:
+                    del self._rings[priority]
+            return project, task
+
+    def close(self):
+        """
+        Drop the queued tasks and wake up every waiting worker
+        """
+        with self._condition:
+            self._closed = True
+            self._tasks.clear()
+            self._rings.clear()
+            self._condition.notify_all()
+
+
+class _Project(object):
+    def __init__(self, slug, priority, resources, languages):
+        self.slug = slug
+        self.priority = priority
+        self.resources = resources
+        self.languages = languages
+        self.done = 0
+        self.total = 0
+
+
+class SyncScheduler(object):
+    """
+    Downloads every translation of many projects with a shared pool of
+    worker threads.
+
+    Each project is synced in steps: listing its resources, listing the
+    languages of each resource and downloading each translation. The steps
+    of all projects share the workers: higher priority projects go first and
+    projects of equal priority take turns, so small projects finish quickly
+    even while a big one is still syncing.
+
+        scheduler = SyncScheduler(api, '/var/translations')
+        scheduler.add_project('big-project')
+        scheduler.add_project('urgent-project', priority=10)
+        for event in scheduler.run():
+            print event
+    """
+    RESOURCES = 'resources'
+    LANGUAGES = 'languages'
+    TRANSLATION = 'translation'
+    PROJECT = 'project'
+
+    def __init__(self, api, destination, workers=8,
+                 path_template='%(project)s/%(resource)s/%(language)s.po',
+                 store=None):
+        """
+        @param api
+            the `TransifexAPI` to sync with
+        @param destination
+            the directory the translations are saved in
+        @param workers (optional)
+            the number of worker threads, defaults to 8
+        @param path_template (optional)
+            the path each translation is saved to, relative to
+            `destination`. Formatted with `project`, `resource` and
+            `language`
+        @param store (optional)
+            a `transifex.store.TranslationStore` each downloaded translation
+            is ingested into
+        """
+        self.api = api
+        self.destination = destination
+        self.workers = workers
+        self.path_template = path_template
+        self.store = store
+        self._projects = []
+        self._queue = None
+        self._events = None
+        self._lock = threading.Lock()
+        self._outstanding = 0
+
+    def add_project(self, project_slug, priority=0, resources=None,
+                    languages=None):
+        """
+        Add a project to sync
+
+        @param project_slug
+            the project slug
+        @param priority (optional)
+            projects with a higher priority are synced first, defaults to 0
+        @param resources (optional)
+            the slugs of the resources to sync, defaults to all of them
+        @param languages (optional)
+            the codes of the languages to sync, defaults to all of them
+        """
+        if resources is not None:
+            resources = frozenset(resources)
+        if languages is not None:
+            languages = frozenset(languages)
+        self._projects.append(
+            _Project(project_slug, priority, resources, languages)
+        )
+
+    def run(self):
+        """
+        Sync all the added projects. Failed steps are reported and don't
+        stop the rest of the sync.
+
+        @returns iterator of `SyncEvent` which yields as steps complete
+        """
+        if not self._projects:
+            return
+        self._queue = _FairQueue()
+        self._events = Queue.Queue()
+        self._outstanding = 0
+        for project in self._projects:
+            project.done = project.total = 0
+        for project in self._projects:
+            self._put(project, (self._list_resources,))
+
+        threads = []
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work)
+            thread.daemon = True
+            thread.start()
+            threads.append(thread)
+
+        try:
+            while True:
+                event = self._events.get()
+                if event is None:
+                    break
+                yield event
+        finally:
+            self._queue.close()
+            for thread in threads:
+                thread.join()
+
+    def _put(self, project, task):
+        with self._lock:
+            self._outstanding += 1
+            project.total += 1
+        self._queue.put(project, task)
+
+    def _work(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            project, task = item
+            func, args = task[0], task[1:]
+            try:
+                func(project, *args)
+            finally:
+                self._finish(project)
+
+    def _finish(self, project):
+        with self._lock:
+            project.done += 1
+            project_done = project.done == project.total
+            self._outstanding -= 1
+            finished = self._outstanding == 0
+        if project_done:
+            self._emit(project, self.PROJECT)
+        if finished:
+            self._events.put(None)
+
+    def _emit(self, project, kind, resource=None, language=None, path=None,
+              error=None):
+        if isinstance(error, TransifexAPIException):
+            error.discard_response()
+        self._events.put(SyncEvent(
+            project.slug, kind, resource, language, path, error,
+            project.done, project.total
+        ))
+
+    def _list_resources(self, project):
+        try:
+            resources = self.api.list_resources(project.slug)
+        except Exception as e:
+            self._emit(project, self.RESOURCES, error=e)
+            return
+        for resource in resources:
+            slug = resource['slug']
+            if project.resources is None or slug in project.resources:
+                self._put(project, (self._list_languages, slug))
+        self._emit(project, self.RESOURCES)
+
+    def _list_languages(self, project, resource_slug):
+        try:
+            languages = self.api.list_languages(project.slug, resource_slug)
+        except Exception as e:
+            self._emit(project, self.LANGUAGES, resource_slug, error=e)
+            return
+        for language in languages:
+            if project.languages is None or language in project.languages:
+                self._put(project, (self._download, resource_slug, language))
+        self._emit(project, self.LANGUAGES, resource_slug)
+
+    def _download(self, project, resource_slug, language_code):
+        path = os.path.join(self.destination, self.path_template % {
+            'project': project.slug, 'resource': resource_slug,
+            'language': language_code,
+        })
+        try:
+            makedirs(os.path.dirname(path))
+            self.api.get_translation(
+                project.slug, resource_slug, language_code, path
+            )
+            if self.store is not None:
+                self.store.ingest(
+                    project.slug, resource_slug, language_code, path
+                )
+        except Exception as e:
+            self._emit(
+                project, self.TRANSLATION, resource_slug, language_code, path,
+                error=e
+            )
+            return
+        self._emit(
+            project, self.TRANSLATION, resource_slug, language_code, path
+        )
@@ -0,0 +1,224 @@
+"""
+Transports which carry the requests of `TransifexAPI` to the server
+"""
+import inspect
+import json
+import urllib
+import requests
+
+try:
+    import urllib3
+except ImportError:
+    try:
+        from requests.packages import urllib3
+    except ImportError:
+        urllib3 = None
+
+
+def _find_stream_kwargs():
+    """
+    The arguments which ask this version of requests not to read a response
+    body until it is accessed. `stream` is new in requests 1.2, before it
+    was `prefetch`. Other versions always read the whole body
+    """
+    try:
+        arguments = inspect.getargspec(requests.Session.request)[0]
+    except TypeError:
+        arguments = ()
+    if 'stream' in arguments:
+        return {'stream': True}
+    if 'prefetch' in arguments:
+        return {'prefetch': False}
+    return {}
+
+_stream_kwargs = _find_stream_kwargs()
+
+
+class Transport(object):
+    """
+    Makes the HTTP requests of a `TransifexAPI`.
+
+    `request` returns an object with the `status_code`, `headers`, `content`
+    and `iter_content` of `requests` responses. Network failures must be
+    raised as one of the exception types in `errors`, which the circuit
+    breaker counts as failures.
+    """
+    errors = ()
+
+    def request(self, method, url, auth=None, params=None, data=None,
+                headers=None, stream=False):
+        """
+        @param method
+            the lowercase HTTP method, eg 'get' or 'post'
+        @param url
+            the url to request
+        @param auth (optional)
+            tuple of (username, password) for basic authentication
+        @param params (optional)
+            dictionary of query parameters
+        @param data (optional)
+            the request body, a string or a file like object
+        @param headers (optional)
+            dictionary of request headers
+        @param stream (optional)
+            don't read the response body until it is accessed, defaults to
+            `False`
+
+        @returns the response
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Release the resources held by the transport
+        """
+        pass
+
+
+class Response(object):
+    """
+    A response with the parts of the `requests` response interface used by
+    `TransifexAPI`
+    """
+    def __init__(self, status_code, headers=None, content=None, raw=None):
+        """
+        @param status_code
+            the HTTP status code
+        @param headers (optional)
+            dictionary of the response headers with lowercase names
+        @param content (optional)
+            the response body
+        @param raw (optional)
+            file like object to read the response body from, instead of
+            `content`
+        """
+        self.status_code = status_code
+        self.headers = headers if headers is not None else {}
+        self.raw = raw
+        self._content = content
+
+    @property
+    def content(self):
+        if self._content is None and self.raw is not None:
+            self._content = self.raw.read()
+        return self._content if self._content is not None else ''
+
+    def iter_content(self, chunk_size=1):
+        if self._content is not None or self.raw is None:
+            content = self.content
+            for start in range(0, len(content), chunk_size):
+                yield content[start:start + chunk_size]
+            return
+        while True:
+            chunk = self.raw.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+    def close(self):
+        if self.raw is not None and hasattr(self.raw, 'release_conn'):
+            self.raw.release_conn()
+
+
+class RequestsTransport(Transport):
+    """
+    Makes requests with the `requests` library. By default every request is
+    made with the module level functions like `requests.get`. Pass a
+    `requests.Session` to reuse connections between requests.
+    """
+    errors = (requests.exceptions.RequestException,)
+
+    def __init__(self, session=None):
+        """
+        @param session (optional)
+            the `requests.Session` to make the requests with
+        """
+        self.session = session
+
+    def request(self, method, url, **kwargs):
+        # only pass the arguments given, older versions of requests don't
+        # know about `stream`
+        if kwargs.pop('stream', False):
+            kwargs.update(_stream_kwargs)
+        if self.session is not None:
+            return getattr(self.session, method)(url, **kwargs)
+        return getattr(requests, method)(url, **kwargs)
+
+    def close(self):
+        if self.session is not None:
+            self.session.close()
+
+
+class Urllib3Transport(Transport):
+    """
+    Makes requests directly with a `urllib3` connection pool, which avoids
+    most of the per request work of `requests`
+    """
+    def __init__(self, pool_manager=None, **pool_kwargs):
+        """
+        @param pool_manager (optional)
+            the `urllib3.PoolManager` to make the requests with, by default
+            one is created with `pool_kwargs`
+        """
+        if urllib3 is None:
+            raise ImportError('Urllib3Transport requires urllib3')
+        if pool_manager is None:
+            pool_manager = urllib3.PoolManager(**pool_kwargs)
+        self.pool_manager = pool_manager
+        self.errors = (urllib3.exceptions.HTTPError,)
+
+    def request(self, method, url, auth=None, params=None, data=None,
+                headers=None, stream=False):
+        headers = dict(headers or {})
+        if auth is not None:
+            headers.update(
+                urllib3.util.make_headers(basic_auth='%s:%s' % auth)
+            )
+        if params:
+            url = '%s?%s' % (url, urllib.urlencode(params))
+        raw = self.pool_manager.urlopen(
+            method.upper(), url, body=data, headers=headers,
+            preload_content=not stream,
+        )
+        response_headers = dict(
+            (name.lower(), value) for name, value in raw.headers.items()
+        )
+        if stream:
+            return Response(raw.status, response_headers, raw=raw)
+        return Response(raw.status, response_headers, raw.data)
+
+    def close(self):
+        self.pool_manager.clear()
+
+
+class InProcessTransport(Transport):
+    """
+    Sends requests to a `transifex.fake.FakeTransifex` in the same process,
+    without any sockets
+    """
+    def __init__(self, server=None):
+        """
+        @param server (optional)
+            the `FakeTransifex` to send requests to, by default a new empty
+            one
+        """
+        if server is None:
+            from transifex.fake import FakeTransifex
+            server = FakeTransifex()
+        self.server = server
+
+    def request(self, method, url, auth=None, params=None, data=None,
+                headers=None, stream=False):
+        if data is not None and hasattr(data, 'read'):
+            data = data.read()
+        status_code, response_headers, content = self.server.handle(
+            method.upper(), url, auth=auth, params=params or {}, data=data,
+            headers=dict(
+                (name.lower(), value)
+                for name, value in (headers or {}).items()
+            ),
+        )
+        if not isinstance(content, basestring):
+            content = json.dumps(content)
+            response_headers.setdefault('content-type', 'application/json')
+        return Response(status_code, response_headers, content)
@@ -1,26 +1,203 @@
+import errno
+import os
+import Queue
 import re
+import threading
+import unicodedata
+from collections import namedtuple
 
+try:
+    from functools import lru_cache
+except ImportError:
+    lru_cache = None
+
+
+SLUG_CACHE_SIZE = 16384
+
+_strip_re = re.compile(r'[^\w\s-]')
+_hyphenate_re = re.compile(r'[-\s]+')
+
+SlugResult = namedtuple('SlugResult', 'value slug valid')
+
+
+def makedirs(path):
+    """
+    Create a directory and its parents, if they don't already exist
+    """
+    try:
+        os.makedirs(path)
+    except OSError as e:
+        if e.errno != errno.EEXIST:
+            raise
+
+def replace_file(src, dst):
+    """
+    Rename a file over another one. On POSIX the rename replaces `dst`
+    atomically, so readers see either the old or the new file
+    """
+    try:
+        os.rename(src, dst)
+    except OSError:
+        # Windows will not rename over an existing file
+        if not os.path.exists(dst):
+            raise
+        os.remove(dst)
+        os.rename(src, dst)
+
+def content_length(response):
+    """
+    The size of the body of a response, if the server sent it uncompressed
+    """
+    if 'content-encoding' not in response.headers and \
+            'content-length' in response.headers:
+        return int(response.headers['content-length'])
+    return None
 
 def force_unicode(s, encoding='utf-8'):
     if isinstance(s, unicode):
         return s
-    
+
     if hasattr(s, '__unicode__'):
         s = unicode(s)
     else:
         s = unicode(str(s), encoding)
-                
+
     return s
 
+if lru_cache is None:
+    def lru_cache(maxsize=128):
+        """
+        Memoise a function of hashable arguments, keeping the results of the
+        `maxsize` most recently used calls. A minimal stand in for
+        `functools.lru_cache` on Pythons which don't have it.
+        """
+        def decorator(func):
+            cache = {}
+            # circular doubly linked list of [previous, next, args, result]
+            # links, from the least to the most recently used
+            root = []
+            root[:] = [root, root, None, None]
+            lock = threading.Lock()
+
+            def wrapper(*args):
+                with lock:
+                    link = cache.get(args)
+                    if link is not None:
+                        previous, following, __, result = link
+                        previous[1] = following
+                        following[0] = previous
+                        last = root[0]
+                        last[1] = root[0] = link
+                        link[0] = last
+                        link[1] = root
+                        return result
+                result = func(*args)
+                with lock:
+                    if args not in cache:
+                        last = root[0]
+                        link = [last, root, args, result]
+                        last[1] = root[0] = cache[args] = link
+                        if len(cache) > maxsize:
+                            oldest = root[1]
+                            root[1] = oldest[1]
+                            oldest[1][0] = root
+                            del cache[oldest[2]]
+                return result
+
+            def cache_clear():
+                with lock:
+                    cache.clear()
+                    root[:] = [root, root, None, None]
+
+            wrapper.cache_clear = cache_clear
+            wrapper.__doc__ = func.__doc__
+            wrapper.__name__ = func.__name__
+            return wrapper
+        return decorator
+
+def _slugify(value):
+    value = force_unicode(value)
+    value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore')
+    value = unicode(_strip_re.sub('', value).strip().lower())
+    return _hyphenate_re.sub('-', value)
+
+_cached_slugify = lru_cache(maxsize=SLUG_CACHE_SIZE)(_slugify)
+
 def slugify(value):
     """
     Normalizes string, converts to lowercase, removes non-alpha characters,
     and converts spaces to hyphens.
-    
+
     Taken from https://code.djangoproject.com/browser/django/trunk/django/template/defaultfilters.py
     """
-    import unicodedata
-    value = force_unicode(value)
-    value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore')
-    value = unicode(re.sub('[^\w\s-]', '', value).strip().lower())
-    return re.sub('[-\s]+', '-', value)
\ No newline at end of file
+    if isinstance(value, basestring):
+        return _cached_slugify(value)
+    return _slugify(value)
+
+def is_valid_slug(value):
+    """
+    Check if the value is already a slug, ie `slugify` leaves it unchanged
+    """
+    return value == slugify(value)
+
+def slugify_many(values):
+    """
+    Slugify a batch of values, eg the filenames of a bulk import
+
+    @param values
+        iterable of the values to slugify
+
+    @returns list of `SlugResult` tuples of (value, slug, valid) in the order
+        of `values`, where `valid` is True if the value is already a slug
+    """
+    seen = {}
+    results = []
+    for value in values:
+        result = seen.get(value)
+        if result is None:
+            slug = slugify(value)
+            result = seen[value] = SlugResult(value, slug, value == slug)
+        results.append(result)
+    return results
+
+def map_concurrently(func, items, workers):
+    """
+    Call a function with each item using a pool of threads
+
+    @param func
+        the function to call with each item
+    @param items
+        iterable of the items
+    @param workers
+        the maximum number of threads
+
+    @returns list of (result, exception) tuples in the order of `items`.
+        `exception` is None unless the call raised one
+    """
+    items = list(items)
+    results = [None] * len(items)
+    pending = Queue.Queue()
+    for position, item in enumerate(items):
+        pending.put((position, item))
+
+    def work():
+        while True:
+            try:
+                position, item = pending.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                results[position] = (func(item), None)
+            except Exception as e:
+                results[position] = (None, e)
+
+    threads = [
+        threading.Thread(target=work)
+        for i in range(min(workers, len(items)))
+    ]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
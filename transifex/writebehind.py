@@ -0,0 +1,199 @@
+"""
+A write-behind queue which merges repeated uploads of the same translation
+"""
+import threading
+import time
+from collections import namedtuple
+from transifex.exceptions import TransifexAPIException
+
+
+# An upload which failed. `writes` is the number of merged writes it was
+# uploading
+UploadError = namedtuple('UploadError', 'key path writes exception')
+
+
+class _PendingUpload(object):
+    __slots__ = ('key', 'method', 'args', 'path', 'due', 'writes')
+
+    def __init__(self, key, method, args, path, due):
+        self.key = key
+        self.method = method
+        self.args = args
+        self.path = path
+        self.due = due
+        self.writes = 1
+
+
+class UploadQueue(object):
+    """
+    Queues calls to `new_translation` and `update_source_translation` and
+    makes them in the background.
+
+    Writes to the same target (the source of a resource, or one of its
+    translations) within `window` seconds of the first are merged, so only
+    the file given with the last of them is uploaded. The file is read when
+    it is uploaded. Uploads are made by up to `workers` threads, and never
+    more than one at a time for the same target.
+
+    Failed uploads are collected in `errors`. `flush` waits until every
+    queued write has been uploaded, `close` flushes the queue and stops the
+    workers. Use the queue as a context manager to close it on exit.
+    """
+    def __init__(self, api, window=5.0, workers=2, clock=time.time):
+        """
+        @param api
+            the `TransifexAPI` to upload with
+        @param window (optional)
+            the number of seconds after a first write during which further
+            writes to the same target are merged, defaults to 5
+        @param workers (optional)
+            the maximum number of uploads made at once, defaults to 2
+        @param clock (optional)
+            callable returning the current time in seconds
+        """
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+        self.api = api
+        self.window = window
+        self.errors = []
+        self.writes = 0
+        self.uploads = 0
+        self._clock = clock
+        self._condition = threading.Condition()
+        self._pending = {}
+        self._in_flight = set()
+        self._closed = False
+        self._threads = []
+        for i in range(workers):
+            thread = threading.Thread(target=self._work)
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        """
+        The number of targets waiting to be uploaded
+        """
+        with self._condition:
+            return len(self._pending)
+
+    def new_translation(self, project_slug, resource_slug, language_code,
+                        path_to_pofile):
+        """
+        Queue a `TransifexAPI.new_translation` call
+        """
+        self._put(
+            ('translation', project_slug, resource_slug, language_code),
+            'new_translation',
+            (project_slug, resource_slug, language_code), path_to_pofile
+        )
+
+    def update_source_translation(self, project_slug, resource_slug,
+                                  path_to_pofile):
+        """
+        Queue a `TransifexAPI.update_source_translation` call
+        """
+        self._put(
+            ('source', project_slug, resource_slug),
+            'update_source_translation', (project_slug, resource_slug),
+            path_to_pofile
+        )
+
+    def flush(self):
+        """
+        Upload every queued write now and wait until they are done
+        """
+        with self._condition:
+            while self._pending or self._in_flight:
+                # writes queued while flushing are uploaded straight away
+                now = self._clock()
+                for pending in self._pending.values():
+                    pending.due = min(pending.due, now)
+                self._condition.notify_all()
+                self._condition.wait()
+
+    def close(self):
+        """
+        Flush the queue and stop the workers. No more writes can be queued
+        """
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+        self.flush()
+        with self._condition:
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+    def _put(self, key, method, args, path):
+        with self._condition:
+            if self._closed:
+                raise RuntimeError('The upload queue is closed')
+            self.writes += 1
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = _PendingUpload(
+                    key, method, args, path, self._clock() + self.window
+                )
+                self._condition.notify_all()
+            else:
+                pending.path = path
+                pending.writes += 1
+
+    def _next_upload(self):
+        """
+        Wait for a queued write which is due and whose target isn't being
+        uploaded, and take it off the queue. Returns None once the queue is
+        closed and empty
+        """
+        while True:
+            now = self._clock()
+            due = None
+            for pending in self._pending.values():
+                if pending.key in self._in_flight:
+                    continue
+                if due is None or pending.due < due.due:
+                    due = pending
+            if due is not None and due.due <= now:
+                del self._pending[due.key]
+                self._in_flight.add(due.key)
+                return due
+            if self._closed and not self._pending:
+                return None
+            if due is None:
+                self._condition.wait()
+            else:
+                self._condition.wait(due.due - now)
+
+    def _work(self):
+        while True:
+            with self._condition:
+                pending = self._next_upload()
+            if pending is None:
+                return
+
+            error = None
+            try:
+                getattr(self.api, pending.method)(
+                    *(pending.args + (pending.path,))
+                )
+            except Exception as e:
+                if isinstance(e, TransifexAPIException):
+                    e.discard_response()
+                error = UploadError(
+                    pending.key, pending.path, pending.writes, e
+                )
+
+            with self._condition:
+                self._in_flight.discard(pending.key)
+                self.uploads += 1
+                if error is not None:
+                    self.errors.append(error)
+                self._condition.notify_all()